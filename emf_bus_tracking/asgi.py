@@ -13,4 +13,13 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "emf_bus_tracking.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from tracking import websocket
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "websocket":
+        await websocket.position_socket(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
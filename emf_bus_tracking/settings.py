@@ -110,7 +110,87 @@ CELERY_BEAT_SCHEDULE = {
     "gtfs-rt": {
         "task": "tracking.gtfs_rt_tasks.generate_gtfs_rt",
         "schedule": 10,
-    }
+    },
+    "position-retention": {
+        "task": "tracking.retention_tasks.prune_vehicle_positions",
+        "schedule": 60 * 60,
+    },
+}
+
+# Seconds after which an unchanged GTFS-RT feed is rewritten with a fresh header timestamp
+GTFS_RT_KEEPALIVE = 60
+
+# Seconds clients and caches may reuse each published feed for, matching how often it can change
+FEED_MAX_AGE = {
+    "gtfs.zip": 300,
+    "gtfs.json": 300,
+    "gtfs-rt.pb": 10,
+    "gtfs-rt.json": 10,
+}
+
+# Seconds incoming positions are gathered for before the GTFS-RT feed is rebuilt with them. The feed is also
+# rebuilt every 10 seconds for alerts and schedule changes.
+GTFS_RT_DEBOUNCE = 1
+
+# Streamed GTFS-RT updates: seconds between each web process checking the published feed for a rebuild,
+# seconds between keepalives to idle clients, and how many updates a slow client can fall behind before
+# it's disconnected
+GTFS_RT_STREAM = {
+    "interval": 1,
+    "keepalive": 15,
+    "queue": 64,
+}
+
+# Positions streamed over WebSockets are held in memory and stored together after this many seconds,
+# or sooner once this many are waiting. Trackers can't send more until there's room again.
+POSITION_BUFFER = {
+    "interval": 1,
+    "size": 500,
+}
+
+# Filtering of fixes as they're received. Each process keeps its own state of each vehicle in memory, so
+# with several web workers a vehicle whose fixes go to different workers is filtered against each worker's
+# last fix of it: its heartbeat can be stored once per worker, and speeds are checked between fixes that
+# reached the same worker.
+POSITION_FILTER = {
+    # Fixes within this many metres of the last stored fix are dropped as jitter from a stationary vehicle...
+    "stationary_distance": 15,
+    # ...unless this many seconds have passed since it, so parked vehicles stay in the realtime feed
+    "heartbeat": 5 * 60,
+    # Fixes implying a speed above this many metres per second are dropped, or None to keep them
+    "max_speed": 40,
+    # Consecutive fixes dropped for their speed before the vehicle is taken to really have moved
+    "max_rejections": 3,
+    # Kalman smoothing as {"noise": GPS error in metres, "acceleration": typical acceleration in m/s²},
+    # or None to store positions as received
+    "smoothing": None,
+}
+
+# Seconds without schedule edits before a requested GTFS schedule rebuild runs
+GTFS_SCHEDULE_DEBOUNCE = 30
+
+POSITION_RETENTION = {
+    # Seconds of history kept with every fix
+    "full_resolution": 24 * 60 * 60,
+    # Older history is thinned to one fix per vehicle per this many seconds
+    "downsample_interval": 60,
+    # Seconds of already downsampled history gone over again for fixes that arrived late
+    "late_fixes": 24 * 60 * 60,
+    # Seconds after which history is deleted entirely, or None to keep it forever
+    "max_age": None,
+}
+
+# Bearer token Prometheus scrapes the metrics endpoint with, or None to only allow staff logged in to the admin
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Douglas-Peucker tolerances in metres for shape geometry
+SHAPE_DETAIL = {
+    # Points that don't matter at this tolerance are dropped when a shape is imported
+    "import": 0.5,
+    # Detail published in shapes.txt
+    "gtfs": 2,
+    # Detail used when snapping vehicle positions to shapes
+    "snapping": 1,
 }
 
 GTFS_CONFIG = {
@@ -15,10 +15,16 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
 from django.conf import settings
 from django.conf.urls.static import static
+import tracking.views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("api/", include("tracking.urls")),
+] + [
+    # Published feeds are served by their own views ahead of the media files they're stored as
+    path(f"{settings.MEDIA_URL.lstrip('/')}{name}", tracking.views.serve_feed, {"name": name})
+    for name in settings.FEED_MAX_AGE
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -3,4 +3,4 @@
 python3 manage.py collectstatic --noinput || exit 1
 python3 manage.py migrate || exit 1
 
-exec gunicorn -w 4 -b [::]:8000 --forwarded-allow-ips \* --access-logfile - --log-level=info --timeout=90 emf_bus_tracking.wsgi:application
\ No newline at end of file
+exec gunicorn -w 4 -b [::]:8000 --forwarded-allow-ips \* --access-logfile - --log-level=info -k uvicorn_worker.UvicornWorker --timeout=90 emf_bus_tracking.asgi:application
\ No newline at end of file
@@ -1,14 +1,14 @@
-import xml.etree.ElementTree
-
 from django.contrib import admin
 from adminsortable2.admin import SortableAdminMixin, SortableInlineAdminMixin, SortableAdminBase
 from django.core.checks import messages
 from django.core.exceptions import ValidationError
-from django.db import transaction
 from django.shortcuts import redirect
 from django.template.response import TemplateResponse
 from django.urls import path
+from django.utils import timezone
+from . import gtfs_tasks
 from . import models
+from . import shape_import
 
 
 @admin.register(models.Stop)
@@ -25,9 +25,28 @@ class VehicleAdmin(admin.ModelAdmin):
     inlines = [VehiclePositionAdmin]
 
 
+@admin.register(models.TrackerKey)
+class TrackerKeyAdmin(admin.ModelAdmin):
+    list_display = ("name", "vehicle", "active")
+
+
 @admin.register(models.Route)
 class RouteAdmin(SortableAdminMixin, admin.ModelAdmin):
-    pass
+    # Reordering writes the order field directly, which neither bumps updated_at nor requests a new schedule
+    def _update_order(self, updated_items, extra_model_filters):
+        updated = super()._update_order(updated_items, extra_model_filters)
+        self.routes_reordered([item[0] for item in updated_items])
+        return updated
+
+    def _move_item(self, startorder, endorder, extra_model_filters):
+        moved = super()._move_item(startorder, endorder, extra_model_filters)
+        self.routes_reordered(list(moved))
+        return moved
+
+    def routes_reordered(self, route_ids):
+        if route_ids:
+            models.Route.objects.filter(pk__in=route_ids).update(updated_at=timezone.now())
+            gtfs_tasks.request_gtfs_schedule()
 
 
 class JourneyPointAdmin(SortableInlineAdminMixin, admin.TabularInline):
@@ -49,6 +68,10 @@ class ShapeAdmin(SortableAdminBase, admin.ModelAdmin):
 
     inlines = [ShapePointAdmin]
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        form.instance.update_geometry()
+
     def get_urls(self):
         urls = super().get_urls()
         urls = [
@@ -74,52 +97,8 @@ class ShapeAdmin(SortableAdminBase, admin.ModelAdmin):
         if not request.FILES.get("kml_file"):
             raise ValidationError("No file uploaded")
 
-        file = request.FILES["kml_file"]
-        try:
-            d = xml.etree.ElementTree.fromstring(file.read())
-        except xml.etree.ElementTree.ParseError:
-            raise ValidationError("Invalid XML")
-
-        namespaces = {
-            "kml": "http://www.opengis.net/kml/2.2"
-        }
-
-        placemarks = d.findall("kml:Document/kml:Placemark", namespaces=namespaces)
-        if not placemarks:
-            raise ValidationError("No Placemarks found")
-
-        name = None
-        line_string = None
-        for placemark in placemarks:
-            name = placemark.find("kml:name", namespaces=namespaces)
-            line_string = placemark.find("kml:LineString", namespaces=namespaces)
-            if line_string is not None:
-                break
-
-        if line_string is None:
-            raise ValidationError("No LineString found")
-
-        coordinates = line_string.find("kml:coordinates", namespaces=namespaces)
-        coordinates = coordinates.text.strip().split("\n")
-
-        if not coordinates:
-            raise ValidationError("No coordinates found")
-
-        with transaction.atomic():
-            shape = models.Shape.objects.create(name=name.text.strip() if name is not None else "Unnamed")
-            for i, coordinate in enumerate(coordinates):
-                parts = coordinate.split(',')
-                if len(parts) != 3:
-                    raise ValidationError("Invalid coordinate")
-                long, lat, _ = parts
-                lat = float(lat)
-                long = float(long)
-                models.ShapePoint.objects.create(
-                    shape=shape,
-                    latitude=lat,
-                    longitude=long,
-                    order=i,
-                )
+        shapes = shape_import.import_shapes(request.FILES["kml_file"])
+        self.message_user(request, f"Imported {len(shapes)} shape(s)")
 
 
 class ServiceAlertPeriodAdmin(admin.TabularInline):
@@ -0,0 +1,319 @@
+import datetime
+import gc
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from . import feed_storage
+from . import geo
+from . import gtfs_rt_tasks
+from . import gtfs_tasks
+from . import ingest
+from . import metrics
+from . import models
+from . import position_filter
+from . import shapes
+from . import trip_matching
+from . import trip_updates
+
+BATCH_SIZE = 1000
+# Centre and extent in degrees of the synthetic network
+ORIGIN = (52.04, -2.38)
+EXTENT = 0.1
+# Scheduled minutes between stops and layover between a vehicle's journeys
+STOP_INTERVAL = 2
+LAYOVER = 5
+# Seconds between historical fixes of each vehicle
+FIX_INTERVAL = 10
+
+DEFAULT_SIZES = {
+    "stops": 200,
+    "routes": 10,
+    "journeys": 500,
+    "points": 20,
+    "shape_density": 10,
+    "vehicles": 20,
+    "history": 360,
+    "alerts": 10,
+    "days": 2,
+}
+
+
+class Stage:
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = []
+        self.queries = 0
+        self.peak_memory = None
+        self.output_bytes = None
+
+    def as_json(self) -> dict:
+        return {
+            "runs": len(self.seconds),
+            "min_seconds": min(self.seconds) if self.seconds else None,
+            "median_seconds": statistics.median(self.seconds) if self.seconds else None,
+            "queries": self.queries,
+            "peak_memory_bytes": self.peak_memory,
+            "output_bytes": self.output_bytes,
+        }
+
+
+class Benchmark:
+    def __init__(self, sizes: dict, repeat: int = 3, seed: int = 0):
+        self.sizes = {**DEFAULT_SIZES, **sizes}
+        self.repeat = repeat
+        self.random = random.Random(seed)
+        self.stages = {}
+        self.trace_memory = False
+
+    # Tracing allocations slows Python code down several times, so runs that measure peak memory
+    # aren't timed
+    def measure(self, name: str, func, *args, **kwargs):
+        stage = self.stages.setdefault(name, Stage(name))
+        gc.collect()
+        if self.trace_memory:
+            tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                result = func(*args, **kwargs)
+                seconds = time.perf_counter() - start
+            if self.trace_memory:
+                stage.peak_memory = max(stage.peak_memory or 0, tracemalloc.get_traced_memory()[1])
+            else:
+                stage.seconds.append(seconds)
+        finally:
+            if self.trace_memory:
+                tracemalloc.stop()
+
+        stage.queries = len(queries)
+        if isinstance(result, (bytes, str)):
+            stage.output_bytes = len(result)
+        elif isinstance(result, tuple) and all(isinstance(r, (bytes, str)) for r in result):
+            stage.output_bytes = sum(len(r) for r in result)
+        return result
+
+    # Generates the network, measures every stage and rolls everything back
+    def run(self, now=None) -> dict:
+        now = now or timezone.now()
+        try:
+            with transaction.atomic():
+                # Keeps the instrumented code's own metrics in memory until the end, out of the measurements
+                with metrics.measure("benchmark"):
+                    counts = self.generate(now)
+                    self.measure_schedule()
+                    self.measure_realtime(now)
+                transaction.set_rollback(True)
+        finally:
+            clear_caches()
+
+        return {
+            "generated_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "sizes": self.sizes,
+            "counts": counts,
+            "stages": {name: stage.as_json() for name, stage in self.stages.items()},
+        }
+
+    def generate(self, now) -> dict:
+        stops = self.generate_stops()
+        routes = self.generate_routes(stops)
+        vehicles = models.Vehicle.objects.bulk_create([
+            models.Vehicle(name=f"Vehicle {i}", registration_plate=f"BM{i:05d}")
+            for i in range(self.sizes["vehicles"])
+        ])
+        locations = self.generate_journeys(now, routes, vehicles)
+        self.generate_alerts(now, routes, stops)
+        self.measure("store_positions", ingest.store_positions, self.generate_fixes(now, vehicles, locations))
+
+        return {
+            model.__name__: model.objects.count() for model in (
+                models.Stop, models.Route, models.Shape, models.ShapePoint, models.Journey,
+                models.JourneyPoint, models.Vehicle, models.VehiclePosition, models.ServiceAlert,
+            )
+        }
+
+    def generate_stops(self) -> list:
+        return models.Stop.objects.bulk_create([
+            models.Stop(
+                code=f"BM{i:05d}",
+                name=f"Stop {i}",
+                latitude=ORIGIN[0] + self.random.uniform(-EXTENT, EXTENT),
+                longitude=ORIGIN[1] + self.random.uniform(-EXTENT, EXTENT),
+            ) for i in range(self.sizes["stops"])
+        ], batch_size=BATCH_SIZE)
+
+    # Returns, for each route, its stops and shape in each direction
+    def generate_routes(self, stops) -> list:
+        routes = []
+        for i in range(self.sizes["routes"]):
+            route = models.Route.objects.bulk_create([
+                models.Route(name=f"Route {i}", type=models.Route.TYPE_BUS, order=i)
+            ])[0]
+            if self.sizes["points"] <= len(stops):
+                route_stops = self.random.sample(stops, self.sizes["points"])
+            else:
+                route_stops = self.random.choices(stops, k=self.sizes["points"])
+            route_stops.sort(key=lambda s: s.longitude)
+
+            directions = {}
+            for direction, direction_stops in (
+                    (models.Journey.DIRECTION_OUTBOUND, route_stops),
+                    (models.Journey.DIRECTION_INBOUND, route_stops[::-1]),
+            ):
+                directions[direction] = (direction_stops, self.generate_shape(f"Route {i} {direction}", direction_stops))
+            routes.append((route, directions))
+
+        return routes
+
+    def generate_shape(self, name: str, stops) -> models.Shape:
+        latitudes = []
+        longitudes = []
+        density = self.sizes["shape_density"]
+        for a, b in zip(stops, stops[1:]):
+            for j in range(density):
+                latitudes.append(a.latitude + (b.latitude - a.latitude) * j / density + self.random.gauss(0, 1e-5))
+                longitudes.append(a.longitude + (b.longitude - a.longitude) * j / density + self.random.gauss(0, 1e-5))
+        latitudes.append(stops[-1].latitude)
+        longitudes.append(stops[-1].longitude)
+
+        distances = geo.cumulative_distances(latitudes, longitudes)
+        significance = geo.douglas_peucker_significance(latitudes, longitudes)
+        shape = models.Shape.objects.bulk_create([models.Shape(name=name)])[0]
+        models.ShapePoint.objects.bulk_create([
+            models.ShapePoint(
+                shape=shape,
+                latitude=latitudes[i],
+                longitude=longitudes[i],
+                order=i,
+                dist_traveled=float(distances[i]),
+                significance=float(significance[i]) if significance[i] != float("inf") else None,
+            ) for i in range(len(latitudes))
+        ], batch_size=BATCH_SIZE)
+        return shape
+
+    # Each vehicle works its share of each day's journeys back to back, arranged so that today's are
+    # under way now. Returns where each vehicle is scheduled to be now.
+    def generate_journeys(self, now, routes, vehicles) -> dict:
+        duration = datetime.timedelta(minutes=STOP_INTERVAL * (self.sizes["points"] - 1))
+        turnaround = duration + datetime.timedelta(minutes=LAYOVER)
+        per_vehicle = max(1, -(-self.sizes["journeys"] // max(len(vehicles), 1)))
+        locations = {}
+
+        for day in range(self.sizes["days"]):
+            offset = datetime.timedelta(days=day - self.sizes["days"] + 1)
+            journeys = []
+            points = []
+            previous = {}
+            for i in range(self.sizes["journeys"]):
+                vehicle = vehicles[i % len(vehicles)] if vehicles else None
+                k = i // len(vehicles) if vehicles else i
+                start = timezone.localtime(now + offset - per_vehicle // 2 * turnaround + k * turnaround)
+                route, directions = routes[i % len(routes)]
+                direction = models.Journey.DIRECTION_OUTBOUND if k % 2 else models.Journey.DIRECTION_INBOUND
+                route_stops, shape = directions[direction]
+
+                journey = models.Journey(
+                    code=f"BM{i:06d}",
+                    route=route,
+                    direction=direction,
+                    date=start.date(),
+                    vehicle=vehicle,
+                    forms_from=previous.get(vehicle),
+                    shape=shape,
+                )
+                journeys.append(journey)
+                previous[vehicle] = journey
+
+                for order, stop in enumerate(route_stops):
+                    scheduled = start + datetime.timedelta(minutes=STOP_INTERVAL * order)
+                    points.append(models.JourneyPoint(
+                        journey=journey,
+                        stop=stop,
+                        arrival_time=scheduled.time() if order else None,
+                        departure_time=scheduled.time() if order < len(route_stops) - 1 else None,
+                        order=order,
+                    ))
+                    if vehicle and abs(scheduled - now) < datetime.timedelta(minutes=STOP_INTERVAL / 2):
+                        locations[vehicle.id] = (stop.latitude, stop.longitude)
+
+            models.Journey.objects.bulk_create(journeys, batch_size=BATCH_SIZE)
+            models.JourneyPoint.objects.bulk_create(points, batch_size=BATCH_SIZE)
+
+        return locations
+
+    def generate_alerts(self, now, routes, stops):
+        alerts = models.ServiceAlert.objects.bulk_create([
+            models.ServiceAlert(header=f"Alert {i}", description="Benchmark alert")
+            for i in range(self.sizes["alerts"])
+        ])
+        models.ServiceAlertPeriod.objects.bulk_create([
+            models.ServiceAlertPeriod(service_alert=alert, start=now - datetime.timedelta(hours=1))
+            for alert in alerts
+        ])
+        models.ServiceAlertSelector.objects.bulk_create([
+            models.ServiceAlertSelector(
+                service_alert=alert,
+                route=self.random.choice(routes)[0] if routes else None,
+                stop=self.random.choice(stops) if stops else None,
+            ) for alert in alerts
+        ])
+
+    def generate_fixes(self, now, vehicles, locations) -> list:
+        fixes = []
+        for vehicle in vehicles:
+            latitude, longitude = locations.get(vehicle.id, ORIGIN)
+            for i in range(self.sizes["history"]):
+                fixes.append((
+                    vehicle.id,
+                    now - datetime.timedelta(seconds=FIX_INTERVAL * i),
+                    latitude + self.random.gauss(0, 1e-4),
+                    longitude + self.random.gauss(0, 1e-4),
+                ))
+        return fixes
+
+    def measure_schedule(self):
+        for i in range(self.repeat + 1):
+            self.trace_memory = i == 0
+            snapshot = gtfs_tasks.TimetableSnapshot()
+            self.measure("schedule:snapshot", lambda: (snapshot.journeys, snapshot.points))
+            for name, writer, _ in gtfs_tasks.get_schedule_files(snapshot, "benchmark"):
+                self.measure(f"schedule:{name}", gtfs_tasks.render_schedule_file, writer)
+            self.measure("schedule:gtfs.json", lambda: json.dumps(gtfs_tasks.build_routes_json()))
+            self.measure("schedule:resolve_blocks", gtfs_tasks.resolve_blocks, snapshot.journeys)
+
+    def measure_realtime(self, now):
+        for i in range(self.repeat + 1):
+            self.trace_memory = i == 0
+            clear_caches()
+            self.measure("realtime:fingerprint", gtfs_rt_tasks.get_feed_fingerprint, now)
+            matcher = self.measure("realtime:trip_matcher", trip_matching.get_trip_matcher, now)
+            schedules = self.measure("realtime:journey_schedules", trip_updates.get_journey_schedules, matcher)
+            live_positions = self.measure("realtime:live_positions", gtfs_rt_tasks.get_live_positions, now, matcher)
+
+            alerts = self.measure("realtime:alerts", gtfs_rt_tasks.get_alerts, now)
+            vehicle_positions = self.measure(
+                "realtime:vehicle_positions", gtfs_rt_tasks.get_vehicle_positions, live_positions
+            )
+            updates = self.measure("realtime:trip_updates", gtfs_rt_tasks.get_trip_updates, live_positions, schedules)
+            feed = gtfs_rt_tasks.Feed(int(now.timestamp()), alerts, vehicle_positions, updates)
+            output, output_json = self.measure("realtime:encode", gtfs_rt_tasks.encode_feed, feed)
+            for encoding, (_, compress, _) in feed_storage.ENCODINGS.items():
+                self.measure(f"realtime:compress_{encoding}", compress, output + output_json)
+
+            clear_caches()
+            self.measure("realtime:build_feed_cold", gtfs_rt_tasks.build_feed, now)
+            self.measure("realtime:build_feed_warm", gtfs_rt_tasks.build_feed, now)
+
+        self.trace_memory = False
+
+
+def clear_caches():
+    position_filter._vehicles.clear()
+    shapes._geometry_cache.clear()
+    trip_matching._matcher_cache.update(key=None, matcher=None)
+    trip_updates._schedule_cache.update(matcher=None, schedules=None)
@@ -0,0 +1,82 @@
+import gzip
+import hashlib
+import time
+from django.core.files.storage import default_storage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Precompressed copies of published feeds, by content encoding, as (file suffix, compressor, decompressor)
+ENCODINGS = {
+    "gzip": (".gz", lambda content: gzip.compress(content, compresslevel=9, mtime=0), gzip.decompress),
+}
+if brotli:
+    ENCODINGS["br"] = (".br", brotli.compress, brotli.decompress)
+
+# Seconds between checks for a newer copy of a feed file being served
+RELOAD_INTERVAL = 1
+
+_feed_cache = {}
+
+
+# Writes a feed file along with a precompressed copy for each encoding, returning the bytes written
+def write_feed_file(name: str, content: bytes) -> int:
+    written = 0
+    for suffix, compress, _ in ENCODINGS.values():
+        compressed = compress(content)
+        with default_storage.open(name + suffix, "wb") as f:
+            f.write(compressed)
+        written += len(compressed)
+
+    # The plain file goes last so a reader that sees it changed also finds the new compressed copies
+    with default_storage.open(name, "wb") as f:
+        f.write(content)
+    return written + len(content)
+
+
+class CachedFeed:
+    def __init__(self, name: str, modified_at, content: bytes):
+        self.name = name
+        self.modified_at = modified_at
+        self.checked_at = time.monotonic()
+        self.version = hashlib.sha256(content).hexdigest()[:32]
+        self.variants = {None: content}
+
+        for encoding, (suffix, _, decompress) in ENCODINGS.items():
+            try:
+                with default_storage.open(name + suffix, "rb") as f:
+                    compressed = f.read()
+            except FileNotFoundError:
+                continue
+            # A copy from another write of the feed is left out rather than served with this one's tags
+            try:
+                if decompress(compressed) == content:
+                    self.variants[encoding] = compressed
+            except Exception:
+                continue
+
+    def etag(self, encoding) -> str:
+        return f'"{self.version}-{encoding}"' if encoding else f'"{self.version}"'
+
+
+# The latest copy of a feed file, held in memory and only re-read from storage when it changes
+def get_feed(name: str):
+    feed = _feed_cache.get(name)
+    if feed and time.monotonic() - feed.checked_at < RELOAD_INTERVAL:
+        return feed
+
+    try:
+        modified_at = default_storage.get_modified_time(name)
+    except FileNotFoundError:
+        _feed_cache.pop(name, None)
+        return None
+
+    if feed and feed.modified_at == modified_at:
+        feed.checked_at = time.monotonic()
+        return feed
+
+    with default_storage.open(name, "rb") as f:
+        feed = _feed_cache[name] = CachedFeed(name, modified_at, f.read())
+    return feed
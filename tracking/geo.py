@@ -0,0 +1,156 @@
+import numpy as np
+
+EARTH_RADIUS = 6371008.8
+# Upper bound on points x segments handled at once when projecting
+PROJECTION_CHUNK = 1_000_000
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def cumulative_distances(latitudes, longitudes):
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    distances = np.zeros(len(latitudes), dtype=np.float64)
+    if len(latitudes) > 1:
+        np.cumsum(haversine(latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:]), out=distances[1:])
+    return distances
+
+
+# Snaps each point to the nearest segment of a polyline, returning the distance along the line,
+# the snapped latitude and longitude, and how far in metres each point was from the line
+def project_onto_line(latitudes, longitudes, line_latitudes, line_longitudes, line_distances):
+    latitudes = np.atleast_1d(np.asarray(latitudes, dtype=np.float64))
+    longitudes = np.atleast_1d(np.asarray(longitudes, dtype=np.float64))
+
+    if len(line_latitudes) < 2:
+        along = np.zeros(len(latitudes))
+        snapped_latitudes = np.full(len(latitudes), line_latitudes[0])
+        snapped_longitudes = np.full(len(latitudes), line_longitudes[0])
+        return along, snapped_latitudes, snapped_longitudes, haversine(
+            latitudes, longitudes, snapped_latitudes, snapped_longitudes
+        )
+
+    segments = LineSegments(line_latitudes, line_longitudes)
+    segment = np.empty(len(latitudes), dtype=np.intp)
+    fraction = np.empty(len(latitudes), dtype=np.float64)
+    chunk = max(1, PROJECTION_CHUNK // segments.count)
+    for i in range(0, len(latitudes), chunk):
+        t, offset_squared = segments.project(latitudes[i:i + chunk], longitudes[i:i + chunk])
+        nearest = np.argmin(offset_squared, axis=1)
+        segment[i:i + chunk] = nearest
+        fraction[i:i + chunk] = t[np.arange(len(nearest)), nearest]
+
+    line_latitudes = np.asarray(line_latitudes, dtype=np.float64)
+    line_longitudes = np.asarray(line_longitudes, dtype=np.float64)
+    line_distances = np.asarray(line_distances, dtype=np.float64)
+    along = line_distances[segment] + fraction * (line_distances[segment + 1] - line_distances[segment])
+    snapped_latitudes = line_latitudes[segment] + fraction * (line_latitudes[segment + 1] - line_latitudes[segment])
+    snapped_longitudes = line_longitudes[segment] + fraction * (
+            line_longitudes[segment + 1] - line_longitudes[segment]
+    )
+
+    return along, snapped_latitudes, snapped_longitudes, haversine(
+        latitudes, longitudes, snapped_latitudes, snapped_longitudes
+    )
+
+
+# Like project_onto_line, but for the ordered stops of a journey: each stop is snapped to the nearest
+# part of the line that is not before the previous stop, so loops and out-and-back shapes resolve
+# correctly. Returns the distance along the line of each stop.
+def project_sequence_onto_line(latitudes, longitudes, line_latitudes, line_longitudes, line_distances):
+    latitudes = np.atleast_1d(np.asarray(latitudes, dtype=np.float64))
+    longitudes = np.atleast_1d(np.asarray(longitudes, dtype=np.float64))
+    if len(line_latitudes) < 2:
+        return np.zeros(len(latitudes))
+
+    line_distances = np.asarray(line_distances, dtype=np.float64)
+    t, offset_squared = LineSegments(line_latitudes, line_longitudes).project(latitudes, longitudes)
+    along = line_distances[:-1] + t * np.diff(line_distances)
+
+    distances = np.empty(len(latitudes), dtype=np.float64)
+    previous = 0.0
+    for i in range(len(latitudes)):
+        candidates = np.where(along[i] >= previous, offset_squared[i], np.inf)
+        nearest = int(np.argmin(candidates))
+        if np.isfinite(candidates[nearest]):
+            previous = along[i, nearest]
+        distances[i] = previous
+
+    return distances
+
+
+class LineSegments:
+    def __init__(self, line_latitudes, line_longitudes):
+        # Local equirectangular projection, accurate enough over the extent of a route
+        self.scale = np.cos(np.radians(np.mean(line_latitudes)))
+        line_x, line_y = self.to_plane(line_latitudes, line_longitudes)
+        self.start_x, self.start_y = line_x[:-1], line_y[:-1]
+        self.delta_x, self.delta_y = np.diff(line_x), np.diff(line_y)
+        self.length_squared = self.delta_x ** 2 + self.delta_y ** 2
+        self.length_squared[self.length_squared == 0] = np.inf
+
+    @property
+    def count(self) -> int:
+        return len(self.start_x)
+
+    def to_plane(self, latitudes, longitudes):
+        return (
+            np.radians(np.asarray(longitudes, dtype=np.float64)) * self.scale * EARTH_RADIUS,
+            np.radians(np.asarray(latitudes, dtype=np.float64)) * EARTH_RADIUS,
+        )
+
+    # Returns, for every point and segment, the fraction along the segment of the nearest point on it
+    # and the squared distance to that point
+    def project(self, latitudes, longitudes):
+        point_x, point_y = self.to_plane(latitudes, longitudes)
+        px = point_x[:, None]
+        py = point_y[:, None]
+        t = np.clip(
+            ((px - self.start_x) * self.delta_x + (py - self.start_y) * self.delta_y) / self.length_squared, 0, 1
+        )
+        offset_squared = (self.start_x + t * self.delta_x - px) ** 2 + (self.start_y + t * self.delta_y - py) ** 2
+        return t, offset_squared
+
+
+# Douglas-Peucker significance of each point of a polyline: the largest tolerance in metres at which
+# the point survives simplification. The first and last points are always kept and get infinity.
+# Simplifying at any tolerance keeps exactly the points whose significance is above it.
+def douglas_peucker_significance(latitudes, longitudes):
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    significance = np.zeros(len(latitudes), dtype=np.float64)
+    if len(latitudes) == 0:
+        return significance
+
+    significance[0] = significance[-1] = np.inf
+    if len(latitudes) < 3:
+        return significance
+
+    x, y = LineSegments(latitudes, longitudes).to_plane(latitudes, longitudes)
+    stack = [(0, len(latitudes) - 1, np.inf)]
+    while stack:
+        first, last, parent = stack.pop()
+        if last - first < 2:
+            continue
+
+        px, py = x[first + 1:last], y[first + 1:last]
+        dx, dy = x[last] - x[first], y[last] - y[first]
+        length_squared = dx ** 2 + dy ** 2
+        if length_squared == 0:
+            distances = np.hypot(px - x[first], py - y[first])
+        else:
+            t = np.clip(((px - x[first]) * dx + (py - y[first]) * dy) / length_squared, 0, 1)
+            distances = np.hypot(px - (x[first] + t * dx), py - (y[first] + t * dy))
+
+        split = first + 1 + int(np.argmax(distances))
+        # A point can't outlive the point whose split exposed it
+        value = min(float(distances[split - first - 1]), parent)
+        significance[split] = value
+        stack.append((first, split, value))
+        stack.append((split, last, value))
+
+    return significance
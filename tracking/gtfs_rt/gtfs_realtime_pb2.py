@@ -1,12 +1,22 @@
 # -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
 # source: gtfs-realtime.proto
-# Protobuf Python Version: 4.25.0
+# Protobuf Python Version: 7.35.1
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
 from google.protobuf import symbol_database as _symbol_database
 from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'gtfs-realtime.proto'
+)
 # @@protoc_insertion_point(imports)
 
 _sym_db = _symbol_database.Default()
@@ -19,10 +29,10 @@ DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13gtfs-realtime.
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'gtfs_realtime_pb2', _globals)
-if _descriptor._USE_C_DESCRIPTORS == False:
-  _globals['DESCRIPTOR']._options = None
+if not _descriptor._USE_C_DESCRIPTORS:
+  _globals['DESCRIPTOR']._loaded_options = None
   _globals['DESCRIPTOR']._serialized_options = b'\n\033com.google.transit.realtime'
-  _globals['_TRIPDESCRIPTOR_SCHEDULERELATIONSHIP'].values_by_name["REPLACEMENT"]._options = None
+  _globals['_TRIPDESCRIPTOR_SCHEDULERELATIONSHIP'].values_by_name["REPLACEMENT"]._loaded_options = None
   _globals['_TRIPDESCRIPTOR_SCHEDULERELATIONSHIP'].values_by_name["REPLACEMENT"]._serialized_options = b'\010\001'
   _globals['_FEEDMESSAGE']._serialized_start=41
   _globals['_FEEDMESSAGE']._serialized_end=162
@@ -11,24 +11,30 @@ arrival times.
 This protocol is published at:
 https://github.com/google/transit/tree/master/gtfs-realtime
 """
-import builtins
-import collections.abc
-import google.protobuf.descriptor
-import google.protobuf.internal.containers
-import google.protobuf.internal.enum_type_wrapper
-import google.protobuf.message
+
+from collections import abc as _abc
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from google.protobuf.internal import containers as _containers
+from google.protobuf.internal import enum_type_wrapper as _enum_type_wrapper
+import builtins as _builtins
 import sys
-import typing
+import typing as _typing
+
+if sys.version_info >= (3, 11):
+    from typing import TypeAlias as _TypeAlias, Never as _Never
+else:
+    from typing_extensions import TypeAlias as _TypeAlias, Never as _Never
 
-if sys.version_info >= (3, 10):
-    import typing as typing_extensions
+if sys.version_info >= (3, 13):
+    from warnings import deprecated as _deprecated
 else:
-    import typing_extensions
+    from typing_extensions import deprecated as _deprecated
 
-DESCRIPTOR: google.protobuf.descriptor.FileDescriptor
+DESCRIPTOR: _descriptor.FileDescriptor
 
-@typing_extensions.final
-class FeedMessage(google.protobuf.message.Message):
+@_typing.final
+class FeedMessage(_message.Message):
     """The contents of a feed message.
     A feed is a continuous stream of feed messages. Each message in the stream is
     obtained as a response to an appropriate HTTP GET request.
@@ -40,39 +46,44 @@ class FeedMessage(google.protobuf.message.Message):
     semantic cardinality.
     """
 
-    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    DESCRIPTOR: _descriptor.Descriptor
 
-    HEADER_FIELD_NUMBER: builtins.int
-    ENTITY_FIELD_NUMBER: builtins.int
-    @property
-    def header(self) -> global___FeedHeader:
+    HEADER_FIELD_NUMBER: _builtins.int
+    ENTITY_FIELD_NUMBER: _builtins.int
+    @_builtins.property
+    def header(self) -> Global___FeedHeader:
         """Metadata about this feed and feed message."""
-    @property
-    def entity(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___FeedEntity]:
+
+    @_builtins.property
+    def entity(self) -> _containers.RepeatedCompositeFieldContainer[Global___FeedEntity]:
         """Contents of the feed."""
+
     def __init__(
         self,
         *,
-        header: global___FeedHeader | None = ...,
-        entity: collections.abc.Iterable[global___FeedEntity] | None = ...,
+        header: Global___FeedHeader | None = ...,
+        entity: _abc.Iterable[Global___FeedEntity] | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal["header", b"header"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["entity", b"entity", "header", b"header"]) -> None: ...
+    _HasFieldArgType: _TypeAlias = _typing.Literal["header", b"header"]  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["entity", b"entity", "header", b"header"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
 
-global___FeedMessage = FeedMessage
+Global___FeedMessage: _TypeAlias = FeedMessage  # noqa: Y015
 
-@typing_extensions.final
-class FeedHeader(google.protobuf.message.Message):
+@_typing.final
+class FeedHeader(_message.Message):
     """Metadata about a feed, included in feed messages."""
 
-    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    DESCRIPTOR: _descriptor.Descriptor
 
     class _Incrementality:
-        ValueType = typing.NewType("ValueType", builtins.int)
-        V: typing_extensions.TypeAlias = ValueType
+        ValueType = _typing.NewType("ValueType", _builtins.int)
+        V: _TypeAlias = ValueType  # noqa: Y015
 
-    class _IncrementalityEnumTypeWrapper(google.protobuf.internal.enum_type_wrapper._EnumTypeWrapper[FeedHeader._Incrementality.ValueType], builtins.type):
-        DESCRIPTOR: google.protobuf.descriptor.EnumDescriptor
+    class _IncrementalityEnumTypeWrapper(_enum_type_wrapper._EnumTypeWrapper[FeedHeader._Incrementality.ValueType], _builtins.type):
+        DESCRIPTOR: _descriptor.EnumDescriptor
         FULL_DATASET: FeedHeader._Incrementality.ValueType  # 0
         DIFFERENTIAL: FeedHeader._Incrementality.ValueType  # 1
 
@@ -87,15 +98,15 @@ class FeedHeader(google.protobuf.message.Message):
     FULL_DATASET: FeedHeader.Incrementality.ValueType  # 0
     DIFFERENTIAL: FeedHeader.Incrementality.ValueType  # 1
 
-    GTFS_REALTIME_VERSION_FIELD_NUMBER: builtins.int
-    INCREMENTALITY_FIELD_NUMBER: builtins.int
-    TIMESTAMP_FIELD_NUMBER: builtins.int
-    gtfs_realtime_version: builtins.str
+    GTFS_REALTIME_VERSION_FIELD_NUMBER: _builtins.int
+    INCREMENTALITY_FIELD_NUMBER: _builtins.int
+    TIMESTAMP_FIELD_NUMBER: _builtins.int
+    gtfs_realtime_version: _builtins.str
     """Version of the feed specification.
     The current version is 2.0.  Valid versions are "2.0", "1.0".
     """
-    incrementality: global___FeedHeader.Incrementality.ValueType
-    timestamp: builtins.int
+    incrementality: Global___FeedHeader.Incrementality.ValueType
+    timestamp: _builtins.int
     """This timestamp identifies the moment when the content of this feed has been
     created (in server time). In POSIX time (i.e., number of seconds since
     January 1st 1970 00:00:00 UTC).
@@ -103,28 +114,31 @@ class FeedHeader(google.protobuf.message.Message):
     def __init__(
         self,
         *,
-        gtfs_realtime_version: builtins.str | None = ...,
-        incrementality: global___FeedHeader.Incrementality.ValueType | None = ...,
-        timestamp: builtins.int | None = ...,
+        gtfs_realtime_version: _builtins.str | None = ...,
+        incrementality: Global___FeedHeader.Incrementality.ValueType | None = ...,
+        timestamp: _builtins.int | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal["gtfs_realtime_version", b"gtfs_realtime_version", "incrementality", b"incrementality", "timestamp", b"timestamp"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["gtfs_realtime_version", b"gtfs_realtime_version", "incrementality", b"incrementality", "timestamp", b"timestamp"]) -> None: ...
+    _HasFieldArgType: _TypeAlias = _typing.Literal["gtfs_realtime_version", b"gtfs_realtime_version", "incrementality", b"incrementality", "timestamp", b"timestamp"]  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["gtfs_realtime_version", b"gtfs_realtime_version", "incrementality", b"incrementality", "timestamp", b"timestamp"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
 
-global___FeedHeader = FeedHeader
+Global___FeedHeader: _TypeAlias = FeedHeader  # noqa: Y015
 
-@typing_extensions.final
-class FeedEntity(google.protobuf.message.Message):
+@_typing.final
+class FeedEntity(_message.Message):
     """A definition (or update) of an entity in the transit feed."""
 
-    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    DESCRIPTOR: _descriptor.Descriptor
 
-    ID_FIELD_NUMBER: builtins.int
-    IS_DELETED_FIELD_NUMBER: builtins.int
-    TRIP_UPDATE_FIELD_NUMBER: builtins.int
-    VEHICLE_FIELD_NUMBER: builtins.int
-    ALERT_FIELD_NUMBER: builtins.int
-    SHAPE_FIELD_NUMBER: builtins.int
-    id: builtins.str
+    ID_FIELD_NUMBER: _builtins.int
+    IS_DELETED_FIELD_NUMBER: _builtins.int
+    TRIP_UPDATE_FIELD_NUMBER: _builtins.int
+    VEHICLE_FIELD_NUMBER: _builtins.int
+    ALERT_FIELD_NUMBER: _builtins.int
+    SHAPE_FIELD_NUMBER: _builtins.int
+    id: _builtins.str
     """The ids are used only to provide incrementality support. The id should be
     unique within a FeedMessage. Consequent FeedMessages may contain
     FeedEntities with the same id. In case of a DIFFERENTIAL update the new
@@ -134,39 +148,44 @@ class FeedEntity(google.protobuf.message.Message):
     feed must be specified by explicit selectors (see EntitySelector below for
     more info).
     """
-    is_deleted: builtins.bool
+    is_deleted: _builtins.bool
     """Whether this entity is to be deleted. Relevant only for incremental
     fetches.
     """
-    @property
-    def trip_update(self) -> global___TripUpdate:
+    @_builtins.property
+    def trip_update(self) -> Global___TripUpdate:
         """Data about the entity itself. Exactly one of the following fields must be
         present (unless the entity is being deleted).
         """
-    @property
-    def vehicle(self) -> global___VehiclePosition: ...
-    @property
-    def alert(self) -> global___Alert: ...
-    @property
-    def shape(self) -> global___Shape:
+
+    @_builtins.property
+    def vehicle(self) -> Global___VehiclePosition: ...
+    @_builtins.property
+    def alert(self) -> Global___Alert: ...
+    @_builtins.property
+    def shape(self) -> Global___Shape:
         """NOTE: This field is still experimental, and subject to change. It may be formally adopted in the future."""
+
     def __init__(
         self,
         *,
-        id: builtins.str | None = ...,
-        is_deleted: builtins.bool | None = ...,
-        trip_update: global___TripUpdate | None = ...,
-        vehicle: global___VehiclePosition | None = ...,
-        alert: global___Alert | None = ...,
-        shape: global___Shape | None = ...,
+        id: _builtins.str | None = ...,
+        is_deleted: _builtins.bool | None = ...,
+        trip_update: Global___TripUpdate | None = ...,
+        vehicle: Global___VehiclePosition | None = ...,
+        alert: Global___Alert | None = ...,
+        shape: Global___Shape | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal["alert", b"alert", "id", b"id", "is_deleted", b"is_deleted", "shape", b"shape", "trip_update", b"trip_update", "vehicle", b"vehicle"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["alert", b"alert", "id", b"id", "is_deleted", b"is_deleted", "shape", b"shape", "trip_update", b"trip_update", "vehicle", b"vehicle"]) -> None: ...
+    _HasFieldArgType: _TypeAlias = _typing.Literal["alert", b"alert", "id", b"id", "is_deleted", b"is_deleted", "shape", b"shape", "trip_update", b"trip_update", "vehicle", b"vehicle"]  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["alert", b"alert", "id", b"id", "is_deleted", b"is_deleted", "shape", b"shape", "trip_update", b"trip_update", "vehicle", b"vehicle"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
 
-global___FeedEntity = FeedEntity
+Global___FeedEntity: _TypeAlias = FeedEntity  # noqa: Y015
 
-@typing_extensions.final
-class TripUpdate(google.protobuf.message.Message):
+@_typing.final
+class TripUpdate(_message.Message):
     """
     Entities used in the feed.
 
@@ -198,10 +217,10 @@ class TripUpdate(google.protobuf.message.Message):
     updates - this is one case where this would be practically useful.
     """
 
-    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    DESCRIPTOR: _descriptor.Descriptor
 
-    @typing_extensions.final
-    class StopTimeEvent(google.protobuf.message.Message):
+    @_typing.final
+    class StopTimeEvent(_message.Message):
         """Timing information for a single predicted event (either arrival or
         departure).
         Timing consists of delay and/or estimated time, and uncertainty.
@@ -219,22 +238,22 @@ class TripUpdate(google.protobuf.message.Message):
         computer timing control.
         """
 
-        DESCRIPTOR: google.protobuf.descriptor.Descriptor
+        DESCRIPTOR: _descriptor.Descriptor
 
-        DELAY_FIELD_NUMBER: builtins.int
-        TIME_FIELD_NUMBER: builtins.int
-        UNCERTAINTY_FIELD_NUMBER: builtins.int
-        delay: builtins.int
+        DELAY_FIELD_NUMBER: _builtins.int
+        TIME_FIELD_NUMBER: _builtins.int
+        UNCERTAINTY_FIELD_NUMBER: _builtins.int
+        delay: _builtins.int
         """Delay (in seconds) can be positive (meaning that the vehicle is late) or
         negative (meaning that the vehicle is ahead of schedule). Delay of 0
         means that the vehicle is exactly on time.
         """
-        time: builtins.int
+        time: _builtins.int
         """Event as absolute time.
         In Unix time (i.e., number of seconds since January 1st 1970 00:00:00
         UTC).
         """
-        uncertainty: builtins.int
+        uncertainty: _builtins.int
         """If uncertainty is omitted, it is interpreted as unknown.
         If the prediction is unknown or too uncertain, the delay (or time) field
         should be empty. In such case, the uncertainty field is ignored.
@@ -243,15 +262,18 @@ class TripUpdate(google.protobuf.message.Message):
         def __init__(
             self,
             *,
-            delay: builtins.int | None = ...,
-            time: builtins.int | None = ...,
-            uncertainty: builtins.int | None = ...,
+            delay: _builtins.int | None = ...,
+            time: _builtins.int | None = ...,
+            uncertainty: _builtins.int | None = ...,
         ) -> None: ...
-        def HasField(self, field_name: typing_extensions.Literal["delay", b"delay", "time", b"time", "uncertainty", b"uncertainty"]) -> builtins.bool: ...
-        def ClearField(self, field_name: typing_extensions.Literal["delay", b"delay", "time", b"time", "uncertainty", b"uncertainty"]) -> None: ...
-
-    @typing_extensions.final
-    class StopTimeUpdate(google.protobuf.message.Message):
+        _HasFieldArgType: _TypeAlias = _typing.Literal["delay", b"delay", "time", b"time", "uncertainty", b"uncertainty"]  # noqa: Y015
+        def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+        _ClearFieldArgType: _TypeAlias = _typing.Literal["delay", b"delay", "time", b"time", "uncertainty", b"uncertainty"]  # noqa: Y015
+        def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+        def WhichOneof(self, oneof_group: _Never) -> None: ...
+
+    @_typing.final
+    class StopTimeUpdate(_message.Message):
         """Realtime update for arrival and/or departure events for a given stop on a
         trip. Updates can be supplied for both past and future events.
         The producer is allowed, although not required, to drop past events.
@@ -260,14 +282,14 @@ class TripUpdate(google.protobuf.message.Message):
         See the documentation in TripDescriptor for more information.
         """
 
-        DESCRIPTOR: google.protobuf.descriptor.Descriptor
+        DESCRIPTOR: _descriptor.Descriptor
 
         class _ScheduleRelationship:
-            ValueType = typing.NewType("ValueType", builtins.int)
-            V: typing_extensions.TypeAlias = ValueType
+            ValueType = _typing.NewType("ValueType", _builtins.int)
+            V: _TypeAlias = ValueType  # noqa: Y015
 
-        class _ScheduleRelationshipEnumTypeWrapper(google.protobuf.internal.enum_type_wrapper._EnumTypeWrapper[TripUpdate.StopTimeUpdate._ScheduleRelationship.ValueType], builtins.type):
-            DESCRIPTOR: google.protobuf.descriptor.EnumDescriptor
+        class _ScheduleRelationshipEnumTypeWrapper(_enum_type_wrapper._EnumTypeWrapper[TripUpdate.StopTimeUpdate._ScheduleRelationship.ValueType], _builtins.type):
+            DESCRIPTOR: _descriptor.EnumDescriptor
             SCHEDULED: TripUpdate.StopTimeUpdate._ScheduleRelationship.ValueType  # 0
             """The vehicle is proceeding in accordance with its static schedule of
             stops, although not necessarily according to the times of the schedule.
@@ -329,16 +351,16 @@ class TripUpdate(google.protobuf.message.Message):
         formally adopted in the future.
         """
 
-        @typing_extensions.final
-        class StopTimeProperties(google.protobuf.message.Message):
+        @_typing.final
+        class StopTimeProperties(_message.Message):
             """Provides the updated values for the stop time.
             NOTE: This message is still experimental, and subject to change. It may be formally adopted in the future.
             """
 
-            DESCRIPTOR: google.protobuf.descriptor.Descriptor
+            DESCRIPTOR: _descriptor.Descriptor
 
-            ASSIGNED_STOP_ID_FIELD_NUMBER: builtins.int
-            assigned_stop_id: builtins.str
+            ASSIGNED_STOP_ID_FIELD_NUMBER: _builtins.int
+            assigned_stop_id: _builtins.str
             """Supports real-time stop assignments. Refers to a stop_id defined in the GTFS stops.txt.
             The new assigned_stop_id should not result in a significantly different trip experience for the end user than
             the stop_id defined in GTFS stop_times.txt. In other words, the end user should not view this new stop_id as an
@@ -356,66 +378,73 @@ class TripUpdate(google.protobuf.message.Message):
             def __init__(
                 self,
                 *,
-                assigned_stop_id: builtins.str | None = ...,
+                assigned_stop_id: _builtins.str | None = ...,
             ) -> None: ...
-            def HasField(self, field_name: typing_extensions.Literal["assigned_stop_id", b"assigned_stop_id"]) -> builtins.bool: ...
-            def ClearField(self, field_name: typing_extensions.Literal["assigned_stop_id", b"assigned_stop_id"]) -> None: ...
-
-        STOP_SEQUENCE_FIELD_NUMBER: builtins.int
-        STOP_ID_FIELD_NUMBER: builtins.int
-        ARRIVAL_FIELD_NUMBER: builtins.int
-        DEPARTURE_FIELD_NUMBER: builtins.int
-        DEPARTURE_OCCUPANCY_STATUS_FIELD_NUMBER: builtins.int
-        SCHEDULE_RELATIONSHIP_FIELD_NUMBER: builtins.int
-        STOP_TIME_PROPERTIES_FIELD_NUMBER: builtins.int
-        stop_sequence: builtins.int
+            _HasFieldArgType: _TypeAlias = _typing.Literal["assigned_stop_id", b"assigned_stop_id"]  # noqa: Y015
+            def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+            _ClearFieldArgType: _TypeAlias = _typing.Literal["assigned_stop_id", b"assigned_stop_id"]  # noqa: Y015
+            def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+            def WhichOneof(self, oneof_group: _Never) -> None: ...
+
+        STOP_SEQUENCE_FIELD_NUMBER: _builtins.int
+        STOP_ID_FIELD_NUMBER: _builtins.int
+        ARRIVAL_FIELD_NUMBER: _builtins.int
+        DEPARTURE_FIELD_NUMBER: _builtins.int
+        DEPARTURE_OCCUPANCY_STATUS_FIELD_NUMBER: _builtins.int
+        SCHEDULE_RELATIONSHIP_FIELD_NUMBER: _builtins.int
+        STOP_TIME_PROPERTIES_FIELD_NUMBER: _builtins.int
+        stop_sequence: _builtins.int
         """Must be the same as in stop_times.txt in the corresponding GTFS feed."""
-        stop_id: builtins.str
+        stop_id: _builtins.str
         """Must be the same as in stops.txt in the corresponding GTFS feed."""
-        @property
-        def arrival(self) -> global___TripUpdate.StopTimeEvent: ...
-        @property
-        def departure(self) -> global___TripUpdate.StopTimeEvent: ...
-        departure_occupancy_status: global___VehiclePosition.OccupancyStatus.ValueType
+        departure_occupancy_status: Global___VehiclePosition.OccupancyStatus.ValueType
         """Expected occupancy after departure from the given stop.
         Should be provided only for future stops.
         In order to provide departure_occupancy_status without either arrival or
         departure StopTimeEvents, ScheduleRelationship should be set to NO_DATA.
         """
-        schedule_relationship: global___TripUpdate.StopTimeUpdate.ScheduleRelationship.ValueType
-        @property
-        def stop_time_properties(self) -> global___TripUpdate.StopTimeUpdate.StopTimeProperties:
+        schedule_relationship: Global___TripUpdate.StopTimeUpdate.ScheduleRelationship.ValueType
+        @_builtins.property
+        def arrival(self) -> Global___TripUpdate.StopTimeEvent: ...
+        @_builtins.property
+        def departure(self) -> Global___TripUpdate.StopTimeEvent: ...
+        @_builtins.property
+        def stop_time_properties(self) -> Global___TripUpdate.StopTimeUpdate.StopTimeProperties:
             """Realtime updates for certain properties defined within GTFS stop_times.txt
             NOTE: This field is still experimental, and subject to change. It may be formally adopted in the future.
             """
+
         def __init__(
             self,
             *,
-            stop_sequence: builtins.int | None = ...,
-            stop_id: builtins.str | None = ...,
-            arrival: global___TripUpdate.StopTimeEvent | None = ...,
-            departure: global___TripUpdate.StopTimeEvent | None = ...,
-            departure_occupancy_status: global___VehiclePosition.OccupancyStatus.ValueType | None = ...,
-            schedule_relationship: global___TripUpdate.StopTimeUpdate.ScheduleRelationship.ValueType | None = ...,
-            stop_time_properties: global___TripUpdate.StopTimeUpdate.StopTimeProperties | None = ...,
+            stop_sequence: _builtins.int | None = ...,
+            stop_id: _builtins.str | None = ...,
+            arrival: Global___TripUpdate.StopTimeEvent | None = ...,
+            departure: Global___TripUpdate.StopTimeEvent | None = ...,
+            departure_occupancy_status: Global___VehiclePosition.OccupancyStatus.ValueType | None = ...,
+            schedule_relationship: Global___TripUpdate.StopTimeUpdate.ScheduleRelationship.ValueType | None = ...,
+            stop_time_properties: Global___TripUpdate.StopTimeUpdate.StopTimeProperties | None = ...,
         ) -> None: ...
-        def HasField(self, field_name: typing_extensions.Literal["arrival", b"arrival", "departure", b"departure", "departure_occupancy_status", b"departure_occupancy_status", "schedule_relationship", b"schedule_relationship", "stop_id", b"stop_id", "stop_sequence", b"stop_sequence", "stop_time_properties", b"stop_time_properties"]) -> builtins.bool: ...
-        def ClearField(self, field_name: typing_extensions.Literal["arrival", b"arrival", "departure", b"departure", "departure_occupancy_status", b"departure_occupancy_status", "schedule_relationship", b"schedule_relationship", "stop_id", b"stop_id", "stop_sequence", b"stop_sequence", "stop_time_properties", b"stop_time_properties"]) -> None: ...
-
-    @typing_extensions.final
-    class TripProperties(google.protobuf.message.Message):
+        _HasFieldArgType: _TypeAlias = _typing.Literal["arrival", b"arrival", "departure", b"departure", "departure_occupancy_status", b"departure_occupancy_status", "schedule_relationship", b"schedule_relationship", "stop_id", b"stop_id", "stop_sequence", b"stop_sequence", "stop_time_properties", b"stop_time_properties"]  # noqa: Y015
+        def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+        _ClearFieldArgType: _TypeAlias = _typing.Literal["arrival", b"arrival", "departure", b"departure", "departure_occupancy_status", b"departure_occupancy_status", "schedule_relationship", b"schedule_relationship", "stop_id", b"stop_id", "stop_sequence", b"stop_sequence", "stop_time_properties", b"stop_time_properties"]  # noqa: Y015
+        def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+        def WhichOneof(self, oneof_group: _Never) -> None: ...
+
+    @_typing.final
+    class TripProperties(_message.Message):
         """Defines updated properties of the trip, such as a new shape_id when there is a detour. Or defines the
         trip_id, start_date, and start_time of a DUPLICATED trip. 
         NOTE: This message is still experimental, and subject to change. It may be formally adopted in the future.
         """
 
-        DESCRIPTOR: google.protobuf.descriptor.Descriptor
+        DESCRIPTOR: _descriptor.Descriptor
 
-        TRIP_ID_FIELD_NUMBER: builtins.int
-        START_DATE_FIELD_NUMBER: builtins.int
-        START_TIME_FIELD_NUMBER: builtins.int
-        SHAPE_ID_FIELD_NUMBER: builtins.int
-        trip_id: builtins.str
+        TRIP_ID_FIELD_NUMBER: _builtins.int
+        START_DATE_FIELD_NUMBER: _builtins.int
+        START_TIME_FIELD_NUMBER: _builtins.int
+        SHAPE_ID_FIELD_NUMBER: _builtins.int
+        trip_id: _builtins.str
         """Defines the identifier of a new trip that is a duplicate of an existing trip defined in (CSV) GTFS trips.txt
         but will start at a different service date and/or time (defined using the TripProperties.start_date and
         TripProperties.start_time fields). See definition of trips.trip_id in (CSV) GTFS. Its value must be different
@@ -423,12 +452,12 @@ class TripUpdate(google.protobuf.message.Message):
         be populated and will be ignored by consumers.
         NOTE: This field is still experimental, and subject to change. It may be formally adopted in the future.
         """
-        start_date: builtins.str
+        start_date: _builtins.str
         """Service date on which the DUPLICATED trip will be run, in YYYYMMDD format. Required if
         schedule_relationship=DUPLICATED, otherwise this field must not be populated and will be ignored by consumers.
         NOTE: This field is still experimental, and subject to change. It may be formally adopted in the future.
         """
-        start_time: builtins.str
+        start_time: _builtins.str
         """Defines the departure start time of the trip when it’s duplicated. See definition of stop_times.departure_time
         in (CSV) GTFS. Scheduled arrival and departure times for the duplicated trip are calculated based on the offset
         between the original trip departure_time and this field. For example, if a GTFS trip has stop A with a
@@ -442,7 +471,7 @@ class TripUpdate(google.protobuf.message.Message):
         populated and will be ignored by consumers.
         NOTE: This field is still experimental, and subject to change. It may be formally adopted in the future.
         """
-        shape_id: builtins.str
+        shape_id: _builtins.str
         """Specifies the shape of the vehicle travel path when the trip shape differs from the shape specified in
         (CSV) GTFS or to specify it in real-time when it's not provided by (CSV) GTFS, such as a vehicle that takes differing
         paths based on rider demand. See definition of trips.shape_id in (CSV) GTFS. If a shape is neither defined in (CSV) GTFS
@@ -455,32 +484,63 @@ class TripUpdate(google.protobuf.message.Message):
         def __init__(
             self,
             *,
-            trip_id: builtins.str | None = ...,
-            start_date: builtins.str | None = ...,
-            start_time: builtins.str | None = ...,
-            shape_id: builtins.str | None = ...,
+            trip_id: _builtins.str | None = ...,
+            start_date: _builtins.str | None = ...,
+            start_time: _builtins.str | None = ...,
+            shape_id: _builtins.str | None = ...,
         ) -> None: ...
-        def HasField(self, field_name: typing_extensions.Literal["shape_id", b"shape_id", "start_date", b"start_date", "start_time", b"start_time", "trip_id", b"trip_id"]) -> builtins.bool: ...
-        def ClearField(self, field_name: typing_extensions.Literal["shape_id", b"shape_id", "start_date", b"start_date", "start_time", b"start_time", "trip_id", b"trip_id"]) -> None: ...
-
-    TRIP_FIELD_NUMBER: builtins.int
-    VEHICLE_FIELD_NUMBER: builtins.int
-    STOP_TIME_UPDATE_FIELD_NUMBER: builtins.int
-    TIMESTAMP_FIELD_NUMBER: builtins.int
-    DELAY_FIELD_NUMBER: builtins.int
-    TRIP_PROPERTIES_FIELD_NUMBER: builtins.int
-    @property
-    def trip(self) -> global___TripDescriptor:
+        _HasFieldArgType: _TypeAlias = _typing.Literal["shape_id", b"shape_id", "start_date", b"start_date", "start_time", b"start_time", "trip_id", b"trip_id"]  # noqa: Y015
+        def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+        _ClearFieldArgType: _TypeAlias = _typing.Literal["shape_id", b"shape_id", "start_date", b"start_date", "start_time", b"start_time", "trip_id", b"trip_id"]  # noqa: Y015
+        def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+        def WhichOneof(self, oneof_group: _Never) -> None: ...
+
+    TRIP_FIELD_NUMBER: _builtins.int
+    VEHICLE_FIELD_NUMBER: _builtins.int
+    STOP_TIME_UPDATE_FIELD_NUMBER: _builtins.int
+    TIMESTAMP_FIELD_NUMBER: _builtins.int
+    DELAY_FIELD_NUMBER: _builtins.int
+    TRIP_PROPERTIES_FIELD_NUMBER: _builtins.int
+    timestamp: _builtins.int
+    """The most recent moment at which the vehicle's real-time progress was measured
+    to estimate StopTimes in the future. When StopTimes in the past are provided,
+    arrival/departure times may be earlier than this value. In POSIX
+    time (i.e., the number of seconds since January 1st 1970 00:00:00 UTC).
+    """
+    delay: _builtins.int
+    """The current schedule deviation for the trip.  Delay should only be
+    specified when the prediction is given relative to some existing schedule
+    in GTFS.
+
+    Delay (in seconds) can be positive (meaning that the vehicle is late) or
+    negative (meaning that the vehicle is ahead of schedule). Delay of 0
+    means that the vehicle is exactly on time.
+
+    Delay information in StopTimeUpdates take precedent of trip-level delay
+    information, such that trip-level delay is only propagated until the next
+    stop along the trip with a StopTimeUpdate delay value specified.
+
+    Feed providers are strongly encouraged to provide a TripUpdate.timestamp
+    value indicating when the delay value was last updated, in order to
+    evaluate the freshness of the data.
+
+    NOTE: This field is still experimental, and subject to change. It may be
+    formally adopted in the future.
+    """
+    @_builtins.property
+    def trip(self) -> Global___TripDescriptor:
         """The Trip that this message applies to. There can be at most one
         TripUpdate entity for each actual trip instance.
         If there is none, that means there is no prediction information available.
         It does *not* mean that the trip is progressing according to schedule.
         """
-    @property
-    def vehicle(self) -> global___VehicleDescriptor:
+
+    @_builtins.property
+    def vehicle(self) -> Global___VehicleDescriptor:
         """Additional information on the vehicle that is serving this trip."""
-    @property
-    def stop_time_update(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___TripUpdate.StopTimeUpdate]:
+
+    @_builtins.property
+    def stop_time_update(self) -> _containers.RepeatedCompositeFieldContainer[Global___TripUpdate.StopTimeUpdate]:
         """Updates to StopTimes for the trip (both future, i.e., predictions, and in
         some cases, past ones, i.e., those that already happened).
         The updates must be sorted by stop_sequence, and apply for all the
@@ -501,61 +561,39 @@ class TripUpdate(google.protobuf.message.Message):
         - stop_sequences 8,9 have delay of 1 min.
         - stop_sequences 10,... have unknown delay.
         """
-    timestamp: builtins.int
-    """The most recent moment at which the vehicle's real-time progress was measured
-    to estimate StopTimes in the future. When StopTimes in the past are provided,
-    arrival/departure times may be earlier than this value. In POSIX
-    time (i.e., the number of seconds since January 1st 1970 00:00:00 UTC).
-    """
-    delay: builtins.int
-    """The current schedule deviation for the trip.  Delay should only be
-    specified when the prediction is given relative to some existing schedule
-    in GTFS.
-
-    Delay (in seconds) can be positive (meaning that the vehicle is late) or
-    negative (meaning that the vehicle is ahead of schedule). Delay of 0
-    means that the vehicle is exactly on time.
-
-    Delay information in StopTimeUpdates take precedent of trip-level delay
-    information, such that trip-level delay is only propagated until the next
-    stop along the trip with a StopTimeUpdate delay value specified.
-
-    Feed providers are strongly encouraged to provide a TripUpdate.timestamp
-    value indicating when the delay value was last updated, in order to
-    evaluate the freshness of the data.
 
-    NOTE: This field is still experimental, and subject to change. It may be
-    formally adopted in the future.
-    """
-    @property
-    def trip_properties(self) -> global___TripUpdate.TripProperties: ...
+    @_builtins.property
+    def trip_properties(self) -> Global___TripUpdate.TripProperties: ...
     def __init__(
         self,
         *,
-        trip: global___TripDescriptor | None = ...,
-        vehicle: global___VehicleDescriptor | None = ...,
-        stop_time_update: collections.abc.Iterable[global___TripUpdate.StopTimeUpdate] | None = ...,
-        timestamp: builtins.int | None = ...,
-        delay: builtins.int | None = ...,
-        trip_properties: global___TripUpdate.TripProperties | None = ...,
+        trip: Global___TripDescriptor | None = ...,
+        vehicle: Global___VehicleDescriptor | None = ...,
+        stop_time_update: _abc.Iterable[Global___TripUpdate.StopTimeUpdate] | None = ...,
+        timestamp: _builtins.int | None = ...,
+        delay: _builtins.int | None = ...,
+        trip_properties: Global___TripUpdate.TripProperties | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal["delay", b"delay", "timestamp", b"timestamp", "trip", b"trip", "trip_properties", b"trip_properties", "vehicle", b"vehicle"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["delay", b"delay", "stop_time_update", b"stop_time_update", "timestamp", b"timestamp", "trip", b"trip", "trip_properties", b"trip_properties", "vehicle", b"vehicle"]) -> None: ...
+    _HasFieldArgType: _TypeAlias = _typing.Literal["delay", b"delay", "timestamp", b"timestamp", "trip", b"trip", "trip_properties", b"trip_properties", "vehicle", b"vehicle"]  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["delay", b"delay", "stop_time_update", b"stop_time_update", "timestamp", b"timestamp", "trip", b"trip", "trip_properties", b"trip_properties", "vehicle", b"vehicle"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
 
-global___TripUpdate = TripUpdate
+Global___TripUpdate: _TypeAlias = TripUpdate  # noqa: Y015
 
-@typing_extensions.final
-class VehiclePosition(google.protobuf.message.Message):
+@_typing.final
+class VehiclePosition(_message.Message):
     """Realtime positioning information for a given vehicle."""
 
-    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    DESCRIPTOR: _descriptor.Descriptor
 
     class _VehicleStopStatus:
-        ValueType = typing.NewType("ValueType", builtins.int)
-        V: typing_extensions.TypeAlias = ValueType
+        ValueType = _typing.NewType("ValueType", _builtins.int)
+        V: _TypeAlias = ValueType  # noqa: Y015
 
-    class _VehicleStopStatusEnumTypeWrapper(google.protobuf.internal.enum_type_wrapper._EnumTypeWrapper[VehiclePosition._VehicleStopStatus.ValueType], builtins.type):
-        DESCRIPTOR: google.protobuf.descriptor.EnumDescriptor
+    class _VehicleStopStatusEnumTypeWrapper(_enum_type_wrapper._EnumTypeWrapper[VehiclePosition._VehicleStopStatus.ValueType], _builtins.type):
+        DESCRIPTOR: _descriptor.EnumDescriptor
         INCOMING_AT: VehiclePosition._VehicleStopStatus.ValueType  # 0
         """The vehicle is just about to arrive at the stop (on a stop
         display, the vehicle symbol typically flashes).
@@ -576,11 +614,11 @@ class VehiclePosition(google.protobuf.message.Message):
     """The vehicle has departed and is in transit to the next stop."""
 
     class _CongestionLevel:
-        ValueType = typing.NewType("ValueType", builtins.int)
-        V: typing_extensions.TypeAlias = ValueType
+        ValueType = _typing.NewType("ValueType", _builtins.int)
+        V: _TypeAlias = ValueType  # noqa: Y015
 
-    class _CongestionLevelEnumTypeWrapper(google.protobuf.internal.enum_type_wrapper._EnumTypeWrapper[VehiclePosition._CongestionLevel.ValueType], builtins.type):
-        DESCRIPTOR: google.protobuf.descriptor.EnumDescriptor
+    class _CongestionLevelEnumTypeWrapper(_enum_type_wrapper._EnumTypeWrapper[VehiclePosition._CongestionLevel.ValueType], _builtins.type):
+        DESCRIPTOR: _descriptor.EnumDescriptor
         UNKNOWN_CONGESTION_LEVEL: VehiclePosition._CongestionLevel.ValueType  # 0
         RUNNING_SMOOTHLY: VehiclePosition._CongestionLevel.ValueType  # 1
         STOP_AND_GO: VehiclePosition._CongestionLevel.ValueType  # 2
@@ -599,11 +637,11 @@ class VehiclePosition(google.protobuf.message.Message):
     """People leaving their cars."""
 
     class _OccupancyStatus:
-        ValueType = typing.NewType("ValueType", builtins.int)
-        V: typing_extensions.TypeAlias = ValueType
+        ValueType = _typing.NewType("ValueType", _builtins.int)
+        V: _TypeAlias = ValueType  # noqa: Y015
 
-    class _OccupancyStatusEnumTypeWrapper(google.protobuf.internal.enum_type_wrapper._EnumTypeWrapper[VehiclePosition._OccupancyStatus.ValueType], builtins.type):
-        DESCRIPTOR: google.protobuf.descriptor.EnumDescriptor
+    class _OccupancyStatusEnumTypeWrapper(_enum_type_wrapper._EnumTypeWrapper[VehiclePosition._OccupancyStatus.ValueType], _builtins.type):
+        DESCRIPTOR: _descriptor.EnumDescriptor
         EMPTY: VehiclePosition._OccupancyStatus.ValueType  # 0
         """The vehicle or carriage is considered empty by most measures, and has few or no
         passengers onboard, but is still accepting passengers.
@@ -685,37 +723,37 @@ class VehiclePosition(google.protobuf.message.Message):
     Useful for special vehicles or carriages (engine, maintenance carriage, etc…).
     """
 
-    @typing_extensions.final
-    class CarriageDetails(google.protobuf.message.Message):
+    @_typing.final
+    class CarriageDetails(_message.Message):
         """Carriage specific details, used for vehicles composed of several carriages
         This message/field is still experimental, and subject to change. It may be formally adopted in the future.
         """
 
-        DESCRIPTOR: google.protobuf.descriptor.Descriptor
+        DESCRIPTOR: _descriptor.Descriptor
 
-        ID_FIELD_NUMBER: builtins.int
-        LABEL_FIELD_NUMBER: builtins.int
-        OCCUPANCY_STATUS_FIELD_NUMBER: builtins.int
-        OCCUPANCY_PERCENTAGE_FIELD_NUMBER: builtins.int
-        CARRIAGE_SEQUENCE_FIELD_NUMBER: builtins.int
-        id: builtins.str
+        ID_FIELD_NUMBER: _builtins.int
+        LABEL_FIELD_NUMBER: _builtins.int
+        OCCUPANCY_STATUS_FIELD_NUMBER: _builtins.int
+        OCCUPANCY_PERCENTAGE_FIELD_NUMBER: _builtins.int
+        CARRIAGE_SEQUENCE_FIELD_NUMBER: _builtins.int
+        id: _builtins.str
         """Identification of the carriage. Should be unique per vehicle."""
-        label: builtins.str
+        label: _builtins.str
         """User visible label that may be shown to the passenger to help identify
         the carriage. Example: "7712", "Car ABC-32", etc...
         This message/field is still experimental, and subject to change. It may be formally adopted in the future.
         """
-        occupancy_status: global___VehiclePosition.OccupancyStatus.ValueType
+        occupancy_status: Global___VehiclePosition.OccupancyStatus.ValueType
         """Occupancy status for this given carriage, in this vehicle
         This message/field is still experimental, and subject to change. It may be formally adopted in the future.
         """
-        occupancy_percentage: builtins.int
+        occupancy_percentage: _builtins.int
         """Occupancy percentage for this given carriage, in this vehicle.
         Follows the same rules as "VehiclePosition.occupancy_percentage"
         -1 in case data is not available for this given carriage (as protobuf defaults to 0 otherwise)
         This message/field is still experimental, and subject to change. It may be formally adopted in the future.
         """
-        carriage_sequence: builtins.int
+        carriage_sequence: _builtins.int
         """Identifies the order of this carriage with respect to the other
         carriages in the vehicle's list of CarriageDetails.
         The first carriage in the direction of travel must have a value of 1.
@@ -731,62 +769,53 @@ class VehiclePosition(google.protobuf.message.Message):
         def __init__(
             self,
             *,
-            id: builtins.str | None = ...,
-            label: builtins.str | None = ...,
-            occupancy_status: global___VehiclePosition.OccupancyStatus.ValueType | None = ...,
-            occupancy_percentage: builtins.int | None = ...,
-            carriage_sequence: builtins.int | None = ...,
+            id: _builtins.str | None = ...,
+            label: _builtins.str | None = ...,
+            occupancy_status: Global___VehiclePosition.OccupancyStatus.ValueType | None = ...,
+            occupancy_percentage: _builtins.int | None = ...,
+            carriage_sequence: _builtins.int | None = ...,
         ) -> None: ...
-        def HasField(self, field_name: typing_extensions.Literal["carriage_sequence", b"carriage_sequence", "id", b"id", "label", b"label", "occupancy_percentage", b"occupancy_percentage", "occupancy_status", b"occupancy_status"]) -> builtins.bool: ...
-        def ClearField(self, field_name: typing_extensions.Literal["carriage_sequence", b"carriage_sequence", "id", b"id", "label", b"label", "occupancy_percentage", b"occupancy_percentage", "occupancy_status", b"occupancy_status"]) -> None: ...
-
-    TRIP_FIELD_NUMBER: builtins.int
-    VEHICLE_FIELD_NUMBER: builtins.int
-    POSITION_FIELD_NUMBER: builtins.int
-    CURRENT_STOP_SEQUENCE_FIELD_NUMBER: builtins.int
-    STOP_ID_FIELD_NUMBER: builtins.int
-    CURRENT_STATUS_FIELD_NUMBER: builtins.int
-    TIMESTAMP_FIELD_NUMBER: builtins.int
-    CONGESTION_LEVEL_FIELD_NUMBER: builtins.int
-    OCCUPANCY_STATUS_FIELD_NUMBER: builtins.int
-    OCCUPANCY_PERCENTAGE_FIELD_NUMBER: builtins.int
-    MULTI_CARRIAGE_DETAILS_FIELD_NUMBER: builtins.int
-    @property
-    def trip(self) -> global___TripDescriptor:
-        """The Trip that this vehicle is serving.
-        Can be empty or partial if the vehicle can not be identified with a given
-        trip instance.
-        """
-    @property
-    def vehicle(self) -> global___VehicleDescriptor:
-        """Additional information on the vehicle that is serving this trip."""
-    @property
-    def position(self) -> global___Position:
-        """Current position of this vehicle."""
-    current_stop_sequence: builtins.int
+        _HasFieldArgType: _TypeAlias = _typing.Literal["carriage_sequence", b"carriage_sequence", "id", b"id", "label", b"label", "occupancy_percentage", b"occupancy_percentage", "occupancy_status", b"occupancy_status"]  # noqa: Y015
+        def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+        _ClearFieldArgType: _TypeAlias = _typing.Literal["carriage_sequence", b"carriage_sequence", "id", b"id", "label", b"label", "occupancy_percentage", b"occupancy_percentage", "occupancy_status", b"occupancy_status"]  # noqa: Y015
+        def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+        def WhichOneof(self, oneof_group: _Never) -> None: ...
+
+    TRIP_FIELD_NUMBER: _builtins.int
+    VEHICLE_FIELD_NUMBER: _builtins.int
+    POSITION_FIELD_NUMBER: _builtins.int
+    CURRENT_STOP_SEQUENCE_FIELD_NUMBER: _builtins.int
+    STOP_ID_FIELD_NUMBER: _builtins.int
+    CURRENT_STATUS_FIELD_NUMBER: _builtins.int
+    TIMESTAMP_FIELD_NUMBER: _builtins.int
+    CONGESTION_LEVEL_FIELD_NUMBER: _builtins.int
+    OCCUPANCY_STATUS_FIELD_NUMBER: _builtins.int
+    OCCUPANCY_PERCENTAGE_FIELD_NUMBER: _builtins.int
+    MULTI_CARRIAGE_DETAILS_FIELD_NUMBER: _builtins.int
+    current_stop_sequence: _builtins.int
     """The stop sequence index of the current stop. The meaning of
     current_stop_sequence (i.e., the stop that it refers to) is determined by
     current_status.
     If current_status is missing IN_TRANSIT_TO is assumed.
     """
-    stop_id: builtins.str
+    stop_id: _builtins.str
     """Identifies the current stop. The value must be the same as in stops.txt in
     the corresponding GTFS feed.
     """
-    current_status: global___VehiclePosition.VehicleStopStatus.ValueType
+    current_status: Global___VehiclePosition.VehicleStopStatus.ValueType
     """The exact status of the vehicle with respect to the current stop.
     Ignored if current_stop_sequence is missing.
     """
-    timestamp: builtins.int
+    timestamp: _builtins.int
     """Moment at which the vehicle's position was measured. In POSIX time
     (i.e., number of seconds since January 1st 1970 00:00:00 UTC).
     """
-    congestion_level: global___VehiclePosition.CongestionLevel.ValueType
-    occupancy_status: global___VehiclePosition.OccupancyStatus.ValueType
+    congestion_level: Global___VehiclePosition.CongestionLevel.ValueType
+    occupancy_status: Global___VehiclePosition.OccupancyStatus.ValueType
     """If multi_carriage_status is populated with per-carriage OccupancyStatus,
     then this field should describe the entire vehicle with all carriages accepting passengers considered.
     """
-    occupancy_percentage: builtins.int
+    occupancy_percentage: _builtins.int
     """A percentage value indicating the degree of passenger occupancy in the vehicle.
     The values are represented as an integer without decimals. 0 means 0% and 100 means 100%.
     The value 100 should represent the total maximum occupancy the vehicle was designed for,
@@ -797,8 +826,23 @@ class VehiclePosition(google.protobuf.message.Message):
     then this field should describe the entire vehicle with all carriages accepting passengers considered.
     This field is still experimental, and subject to change. It may be formally adopted in the future.
     """
-    @property
-    def multi_carriage_details(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___VehiclePosition.CarriageDetails]:
+    @_builtins.property
+    def trip(self) -> Global___TripDescriptor:
+        """The Trip that this vehicle is serving.
+        Can be empty or partial if the vehicle can not be identified with a given
+        trip instance.
+        """
+
+    @_builtins.property
+    def vehicle(self) -> Global___VehicleDescriptor:
+        """Additional information on the vehicle that is serving this trip."""
+
+    @_builtins.property
+    def position(self) -> Global___Position:
+        """Current position of this vehicle."""
+
+    @_builtins.property
+    def multi_carriage_details(self) -> _containers.RepeatedCompositeFieldContainer[Global___VehiclePosition.CarriageDetails]:
         """Details of the multiple carriages of this given vehicle.
         The first occurrence represents the first carriage of the vehicle, 
         given the current direction of travel. 
@@ -809,38 +853,42 @@ class VehiclePosition(google.protobuf.message.Message):
         information to passengers about where to stand on a platform.
         This message/field is still experimental, and subject to change. It may be formally adopted in the future.
         """
+
     def __init__(
         self,
         *,
-        trip: global___TripDescriptor | None = ...,
-        vehicle: global___VehicleDescriptor | None = ...,
-        position: global___Position | None = ...,
-        current_stop_sequence: builtins.int | None = ...,
-        stop_id: builtins.str | None = ...,
-        current_status: global___VehiclePosition.VehicleStopStatus.ValueType | None = ...,
-        timestamp: builtins.int | None = ...,
-        congestion_level: global___VehiclePosition.CongestionLevel.ValueType | None = ...,
-        occupancy_status: global___VehiclePosition.OccupancyStatus.ValueType | None = ...,
-        occupancy_percentage: builtins.int | None = ...,
-        multi_carriage_details: collections.abc.Iterable[global___VehiclePosition.CarriageDetails] | None = ...,
+        trip: Global___TripDescriptor | None = ...,
+        vehicle: Global___VehicleDescriptor | None = ...,
+        position: Global___Position | None = ...,
+        current_stop_sequence: _builtins.int | None = ...,
+        stop_id: _builtins.str | None = ...,
+        current_status: Global___VehiclePosition.VehicleStopStatus.ValueType | None = ...,
+        timestamp: _builtins.int | None = ...,
+        congestion_level: Global___VehiclePosition.CongestionLevel.ValueType | None = ...,
+        occupancy_status: Global___VehiclePosition.OccupancyStatus.ValueType | None = ...,
+        occupancy_percentage: _builtins.int | None = ...,
+        multi_carriage_details: _abc.Iterable[Global___VehiclePosition.CarriageDetails] | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal["congestion_level", b"congestion_level", "current_status", b"current_status", "current_stop_sequence", b"current_stop_sequence", "occupancy_percentage", b"occupancy_percentage", "occupancy_status", b"occupancy_status", "position", b"position", "stop_id", b"stop_id", "timestamp", b"timestamp", "trip", b"trip", "vehicle", b"vehicle"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["congestion_level", b"congestion_level", "current_status", b"current_status", "current_stop_sequence", b"current_stop_sequence", "multi_carriage_details", b"multi_carriage_details", "occupancy_percentage", b"occupancy_percentage", "occupancy_status", b"occupancy_status", "position", b"position", "stop_id", b"stop_id", "timestamp", b"timestamp", "trip", b"trip", "vehicle", b"vehicle"]) -> None: ...
+    _HasFieldArgType: _TypeAlias = _typing.Literal["congestion_level", b"congestion_level", "current_status", b"current_status", "current_stop_sequence", b"current_stop_sequence", "occupancy_percentage", b"occupancy_percentage", "occupancy_status", b"occupancy_status", "position", b"position", "stop_id", b"stop_id", "timestamp", b"timestamp", "trip", b"trip", "vehicle", b"vehicle"]  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["congestion_level", b"congestion_level", "current_status", b"current_status", "current_stop_sequence", b"current_stop_sequence", "multi_carriage_details", b"multi_carriage_details", "occupancy_percentage", b"occupancy_percentage", "occupancy_status", b"occupancy_status", "position", b"position", "stop_id", b"stop_id", "timestamp", b"timestamp", "trip", b"trip", "vehicle", b"vehicle"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
 
-global___VehiclePosition = VehiclePosition
+Global___VehiclePosition: _TypeAlias = VehiclePosition  # noqa: Y015
 
-@typing_extensions.final
-class Alert(google.protobuf.message.Message):
+@_typing.final
+class Alert(_message.Message):
     """An alert, indicating some sort of incident in the public transit network."""
 
-    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    DESCRIPTOR: _descriptor.Descriptor
 
     class _Cause:
-        ValueType = typing.NewType("ValueType", builtins.int)
-        V: typing_extensions.TypeAlias = ValueType
+        ValueType = _typing.NewType("ValueType", _builtins.int)
+        V: _TypeAlias = ValueType  # noqa: Y015
 
-    class _CauseEnumTypeWrapper(google.protobuf.internal.enum_type_wrapper._EnumTypeWrapper[Alert._Cause.ValueType], builtins.type):
-        DESCRIPTOR: google.protobuf.descriptor.EnumDescriptor
+    class _CauseEnumTypeWrapper(_enum_type_wrapper._EnumTypeWrapper[Alert._Cause.ValueType], _builtins.type):
+        DESCRIPTOR: _descriptor.EnumDescriptor
         UNKNOWN_CAUSE: Alert._Cause.ValueType  # 1
         OTHER_CAUSE: Alert._Cause.ValueType  # 2
         """Not machine-representable."""
@@ -877,11 +925,11 @@ class Alert(google.protobuf.message.Message):
     MEDICAL_EMERGENCY: Alert.Cause.ValueType  # 12
 
     class _Effect:
-        ValueType = typing.NewType("ValueType", builtins.int)
-        V: typing_extensions.TypeAlias = ValueType
+        ValueType = _typing.NewType("ValueType", _builtins.int)
+        V: _TypeAlias = ValueType  # noqa: Y015
 
-    class _EffectEnumTypeWrapper(google.protobuf.internal.enum_type_wrapper._EnumTypeWrapper[Alert._Effect.ValueType], builtins.type):
-        DESCRIPTOR: google.protobuf.descriptor.EnumDescriptor
+    class _EffectEnumTypeWrapper(_enum_type_wrapper._EnumTypeWrapper[Alert._Effect.ValueType], _builtins.type):
+        DESCRIPTOR: _descriptor.EnumDescriptor
         NO_SERVICE: Alert._Effect.ValueType  # 1
         REDUCED_SERVICE: Alert._Effect.ValueType  # 2
         SIGNIFICANT_DELAYS: Alert._Effect.ValueType  # 3
@@ -918,11 +966,11 @@ class Alert(google.protobuf.message.Message):
     ACCESSIBILITY_ISSUE: Alert.Effect.ValueType  # 11
 
     class _SeverityLevel:
-        ValueType = typing.NewType("ValueType", builtins.int)
-        V: typing_extensions.TypeAlias = ValueType
+        ValueType = _typing.NewType("ValueType", _builtins.int)
+        V: _TypeAlias = ValueType  # noqa: Y015
 
-    class _SeverityLevelEnumTypeWrapper(google.protobuf.internal.enum_type_wrapper._EnumTypeWrapper[Alert._SeverityLevel.ValueType], builtins.type):
-        DESCRIPTOR: google.protobuf.descriptor.EnumDescriptor
+    class _SeverityLevelEnumTypeWrapper(_enum_type_wrapper._EnumTypeWrapper[Alert._SeverityLevel.ValueType], _builtins.type):
+        DESCRIPTOR: _descriptor.EnumDescriptor
         UNKNOWN_SEVERITY: Alert._SeverityLevel.ValueType  # 1
         INFO: Alert._SeverityLevel.ValueType  # 2
         WARNING: Alert._SeverityLevel.ValueType  # 3
@@ -936,96 +984,110 @@ class Alert(google.protobuf.message.Message):
     WARNING: Alert.SeverityLevel.ValueType  # 3
     SEVERE: Alert.SeverityLevel.ValueType  # 4
 
-    ACTIVE_PERIOD_FIELD_NUMBER: builtins.int
-    INFORMED_ENTITY_FIELD_NUMBER: builtins.int
-    CAUSE_FIELD_NUMBER: builtins.int
-    EFFECT_FIELD_NUMBER: builtins.int
-    URL_FIELD_NUMBER: builtins.int
-    HEADER_TEXT_FIELD_NUMBER: builtins.int
-    DESCRIPTION_TEXT_FIELD_NUMBER: builtins.int
-    TTS_HEADER_TEXT_FIELD_NUMBER: builtins.int
-    TTS_DESCRIPTION_TEXT_FIELD_NUMBER: builtins.int
-    SEVERITY_LEVEL_FIELD_NUMBER: builtins.int
-    IMAGE_FIELD_NUMBER: builtins.int
-    IMAGE_ALTERNATIVE_TEXT_FIELD_NUMBER: builtins.int
-    CAUSE_DETAIL_FIELD_NUMBER: builtins.int
-    EFFECT_DETAIL_FIELD_NUMBER: builtins.int
-    @property
-    def active_period(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___TimeRange]:
+    ACTIVE_PERIOD_FIELD_NUMBER: _builtins.int
+    INFORMED_ENTITY_FIELD_NUMBER: _builtins.int
+    CAUSE_FIELD_NUMBER: _builtins.int
+    EFFECT_FIELD_NUMBER: _builtins.int
+    URL_FIELD_NUMBER: _builtins.int
+    HEADER_TEXT_FIELD_NUMBER: _builtins.int
+    DESCRIPTION_TEXT_FIELD_NUMBER: _builtins.int
+    TTS_HEADER_TEXT_FIELD_NUMBER: _builtins.int
+    TTS_DESCRIPTION_TEXT_FIELD_NUMBER: _builtins.int
+    SEVERITY_LEVEL_FIELD_NUMBER: _builtins.int
+    IMAGE_FIELD_NUMBER: _builtins.int
+    IMAGE_ALTERNATIVE_TEXT_FIELD_NUMBER: _builtins.int
+    CAUSE_DETAIL_FIELD_NUMBER: _builtins.int
+    EFFECT_DETAIL_FIELD_NUMBER: _builtins.int
+    cause: Global___Alert.Cause.ValueType
+    effect: Global___Alert.Effect.ValueType
+    severity_level: Global___Alert.SeverityLevel.ValueType
+    @_builtins.property
+    def active_period(self) -> _containers.RepeatedCompositeFieldContainer[Global___TimeRange]:
         """Time when the alert should be shown to the user. If missing, the
         alert will be shown as long as it appears in the feed.
         If multiple ranges are given, the alert will be shown during all of them.
         """
-    @property
-    def informed_entity(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___EntitySelector]:
+
+    @_builtins.property
+    def informed_entity(self) -> _containers.RepeatedCompositeFieldContainer[Global___EntitySelector]:
         """Entities whose users we should notify of this alert."""
-    cause: global___Alert.Cause.ValueType
-    effect: global___Alert.Effect.ValueType
-    @property
-    def url(self) -> global___TranslatedString:
+
+    @_builtins.property
+    def url(self) -> Global___TranslatedString:
         """The URL which provides additional information about the alert."""
-    @property
-    def header_text(self) -> global___TranslatedString:
+
+    @_builtins.property
+    def header_text(self) -> Global___TranslatedString:
         """Alert header. Contains a short summary of the alert text as plain-text."""
-    @property
-    def description_text(self) -> global___TranslatedString:
+
+    @_builtins.property
+    def description_text(self) -> Global___TranslatedString:
         """Full description for the alert as plain-text. The information in the
         description should add to the information of the header.
         """
-    @property
-    def tts_header_text(self) -> global___TranslatedString:
+
+    @_builtins.property
+    def tts_header_text(self) -> Global___TranslatedString:
         """Text for alert header to be used in text-to-speech implementations. This field is the text-to-speech version of header_text."""
-    @property
-    def tts_description_text(self) -> global___TranslatedString:
+
+    @_builtins.property
+    def tts_description_text(self) -> Global___TranslatedString:
         """Text for full description for the alert to be used in text-to-speech implementations. This field is the text-to-speech version of description_text."""
-    severity_level: global___Alert.SeverityLevel.ValueType
-    @property
-    def image(self) -> global___TranslatedImage:
+
+    @_builtins.property
+    def image(self) -> Global___TranslatedImage:
         """TranslatedImage to be displayed along the alert text. Used to explain visually the alert effect of a detour, station closure, etc. The image must enhance the understanding of the alert. Any essential information communicated within the image must also be contained in the alert text.
         The following types of images are discouraged : image containing mainly text, marketing or branded images that add no additional information. 
         NOTE: This field is still experimental, and subject to change. It may be formally adopted in the future.
         """
-    @property
-    def image_alternative_text(self) -> global___TranslatedString:
+
+    @_builtins.property
+    def image_alternative_text(self) -> Global___TranslatedString:
         """Text describing the appearance of the linked image in the `image` field (e.g., in case the image can't be displayed
         or the user can't see the image for accessibility reasons). See the HTML spec for alt image text - https://html.spec.whatwg.org/#alt.
         NOTE: This field is still experimental, and subject to change. It may be formally adopted in the future.
         """
-    @property
-    def cause_detail(self) -> global___TranslatedString:
+
+    @_builtins.property
+    def cause_detail(self) -> Global___TranslatedString:
         """Description of the cause of the alert that allows for agency-specific language; more specific than the Cause. If cause_detail is included, then Cause must also be included.
         NOTE: This field is still experimental, and subject to change. It may be formally adopted in the future.
         """
-    @property
-    def effect_detail(self) -> global___TranslatedString:
+
+    @_builtins.property
+    def effect_detail(self) -> Global___TranslatedString:
         """Description of the effect of the alert that allows for agency-specific language; more specific than the Effect. If effect_detail is included, then Effect must also be included.
         NOTE: This field is still experimental, and subject to change. It may be formally adopted in the future.
         """
+
     def __init__(
         self,
         *,
-        active_period: collections.abc.Iterable[global___TimeRange] | None = ...,
-        informed_entity: collections.abc.Iterable[global___EntitySelector] | None = ...,
-        cause: global___Alert.Cause.ValueType | None = ...,
-        effect: global___Alert.Effect.ValueType | None = ...,
-        url: global___TranslatedString | None = ...,
-        header_text: global___TranslatedString | None = ...,
-        description_text: global___TranslatedString | None = ...,
-        tts_header_text: global___TranslatedString | None = ...,
-        tts_description_text: global___TranslatedString | None = ...,
-        severity_level: global___Alert.SeverityLevel.ValueType | None = ...,
-        image: global___TranslatedImage | None = ...,
-        image_alternative_text: global___TranslatedString | None = ...,
-        cause_detail: global___TranslatedString | None = ...,
-        effect_detail: global___TranslatedString | None = ...,
+        active_period: _abc.Iterable[Global___TimeRange] | None = ...,
+        informed_entity: _abc.Iterable[Global___EntitySelector] | None = ...,
+        cause: Global___Alert.Cause.ValueType | None = ...,
+        effect: Global___Alert.Effect.ValueType | None = ...,
+        url: Global___TranslatedString | None = ...,
+        header_text: Global___TranslatedString | None = ...,
+        description_text: Global___TranslatedString | None = ...,
+        tts_header_text: Global___TranslatedString | None = ...,
+        tts_description_text: Global___TranslatedString | None = ...,
+        severity_level: Global___Alert.SeverityLevel.ValueType | None = ...,
+        image: Global___TranslatedImage | None = ...,
+        image_alternative_text: Global___TranslatedString | None = ...,
+        cause_detail: Global___TranslatedString | None = ...,
+        effect_detail: Global___TranslatedString | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal["cause", b"cause", "cause_detail", b"cause_detail", "description_text", b"description_text", "effect", b"effect", "effect_detail", b"effect_detail", "header_text", b"header_text", "image", b"image", "image_alternative_text", b"image_alternative_text", "severity_level", b"severity_level", "tts_description_text", b"tts_description_text", "tts_header_text", b"tts_header_text", "url", b"url"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["active_period", b"active_period", "cause", b"cause", "cause_detail", b"cause_detail", "description_text", b"description_text", "effect", b"effect", "effect_detail", b"effect_detail", "header_text", b"header_text", "image", b"image", "image_alternative_text", b"image_alternative_text", "informed_entity", b"informed_entity", "severity_level", b"severity_level", "tts_description_text", b"tts_description_text", "tts_header_text", b"tts_header_text", "url", b"url"]) -> None: ...
+    _HasFieldArgType: _TypeAlias = _typing.Literal["cause", b"cause", "cause_detail", b"cause_detail", "description_text", b"description_text", "effect", b"effect", "effect_detail", b"effect_detail", "header_text", b"header_text", "image", b"image", "image_alternative_text", b"image_alternative_text", "severity_level", b"severity_level", "tts_description_text", b"tts_description_text", "tts_header_text", b"tts_header_text", "url", b"url"]  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["active_period", b"active_period", "cause", b"cause", "cause_detail", b"cause_detail", "description_text", b"description_text", "effect", b"effect", "effect_detail", b"effect_detail", "header_text", b"header_text", "image", b"image", "image_alternative_text", b"image_alternative_text", "informed_entity", b"informed_entity", "severity_level", b"severity_level", "tts_description_text", b"tts_description_text", "tts_header_text", b"tts_header_text", "url", b"url"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
 
-global___Alert = Alert
+Global___Alert: _TypeAlias = Alert  # noqa: Y015
 
-@typing_extensions.final
-class TimeRange(google.protobuf.message.Message):
+@_typing.final
+class TimeRange(_message.Message):
     """
     Low level data structures used above.
 
@@ -1033,16 +1095,16 @@ class TimeRange(google.protobuf.message.Message):
     greater than or equal to the start time and less than the end time.
     """
 
-    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    DESCRIPTOR: _descriptor.Descriptor
 
-    START_FIELD_NUMBER: builtins.int
-    END_FIELD_NUMBER: builtins.int
-    start: builtins.int
+    START_FIELD_NUMBER: _builtins.int
+    END_FIELD_NUMBER: _builtins.int
+    start: _builtins.int
     """Start time, in POSIX time (i.e., number of seconds since January 1st 1970
     00:00:00 UTC).
     If missing, the interval starts at minus infinity.
     """
-    end: builtins.int
+    end: _builtins.int
     """End time, in POSIX time (i.e., number of seconds since January 1st 1970
     00:00:00 UTC).
     If missing, the interval ends at plus infinity.
@@ -1050,56 +1112,62 @@ class TimeRange(google.protobuf.message.Message):
     def __init__(
         self,
         *,
-        start: builtins.int | None = ...,
-        end: builtins.int | None = ...,
+        start: _builtins.int | None = ...,
+        end: _builtins.int | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal["end", b"end", "start", b"start"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["end", b"end", "start", b"start"]) -> None: ...
+    _HasFieldArgType: _TypeAlias = _typing.Literal["end", b"end", "start", b"start"]  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["end", b"end", "start", b"start"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
 
-global___TimeRange = TimeRange
+Global___TimeRange: _TypeAlias = TimeRange  # noqa: Y015
 
-@typing_extensions.final
-class Position(google.protobuf.message.Message):
+@_typing.final
+class Position(_message.Message):
     """A position."""
 
-    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    DESCRIPTOR: _descriptor.Descriptor
 
-    LATITUDE_FIELD_NUMBER: builtins.int
-    LONGITUDE_FIELD_NUMBER: builtins.int
-    BEARING_FIELD_NUMBER: builtins.int
-    ODOMETER_FIELD_NUMBER: builtins.int
-    SPEED_FIELD_NUMBER: builtins.int
-    latitude: builtins.float
+    LATITUDE_FIELD_NUMBER: _builtins.int
+    LONGITUDE_FIELD_NUMBER: _builtins.int
+    BEARING_FIELD_NUMBER: _builtins.int
+    ODOMETER_FIELD_NUMBER: _builtins.int
+    SPEED_FIELD_NUMBER: _builtins.int
+    latitude: _builtins.float
     """Degrees North, in the WGS-84 coordinate system."""
-    longitude: builtins.float
+    longitude: _builtins.float
     """Degrees East, in the WGS-84 coordinate system."""
-    bearing: builtins.float
+    bearing: _builtins.float
     """Bearing, in degrees, clockwise from North, i.e., 0 is North and 90 is East.
     This can be the compass bearing, or the direction towards the next stop
     or intermediate location.
     This should not be direction deduced from the sequence of previous
     positions, which can be computed from previous data.
     """
-    odometer: builtins.float
+    odometer: _builtins.float
     """Odometer value, in meters."""
-    speed: builtins.float
+    speed: _builtins.float
     """Momentary speed measured by the vehicle, in meters per second."""
     def __init__(
         self,
         *,
-        latitude: builtins.float | None = ...,
-        longitude: builtins.float | None = ...,
-        bearing: builtins.float | None = ...,
-        odometer: builtins.float | None = ...,
-        speed: builtins.float | None = ...,
+        latitude: _builtins.float | None = ...,
+        longitude: _builtins.float | None = ...,
+        bearing: _builtins.float | None = ...,
+        odometer: _builtins.float | None = ...,
+        speed: _builtins.float | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal["bearing", b"bearing", "latitude", b"latitude", "longitude", b"longitude", "odometer", b"odometer", "speed", b"speed"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["bearing", b"bearing", "latitude", b"latitude", "longitude", b"longitude", "odometer", b"odometer", "speed", b"speed"]) -> None: ...
+    _HasFieldArgType: _TypeAlias = _typing.Literal["bearing", b"bearing", "latitude", b"latitude", "longitude", b"longitude", "odometer", b"odometer", "speed", b"speed"]  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["bearing", b"bearing", "latitude", b"latitude", "longitude", b"longitude", "odometer", b"odometer", "speed", b"speed"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
 
-global___Position = Position
+Global___Position: _TypeAlias = Position  # noqa: Y015
 
-@typing_extensions.final
-class TripDescriptor(google.protobuf.message.Message):
+@_typing.final
+class TripDescriptor(_message.Message):
     """A descriptor that identifies an instance of a GTFS trip, or all instances of
     a trip along a route.
     - To specify a single trip instance, the trip_id (and if necessary,
@@ -1111,14 +1179,14 @@ class TripDescriptor(google.protobuf.message.Message):
       addition, absolute arrival/departure times must be provided.
     """
 
-    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    DESCRIPTOR: _descriptor.Descriptor
 
     class _ScheduleRelationship:
-        ValueType = typing.NewType("ValueType", builtins.int)
-        V: typing_extensions.TypeAlias = ValueType
+        ValueType = _typing.NewType("ValueType", _builtins.int)
+        V: _TypeAlias = ValueType  # noqa: Y015
 
-    class _ScheduleRelationshipEnumTypeWrapper(google.protobuf.internal.enum_type_wrapper._EnumTypeWrapper[TripDescriptor._ScheduleRelationship.ValueType], builtins.type):
-        DESCRIPTOR: google.protobuf.descriptor.EnumDescriptor
+    class _ScheduleRelationshipEnumTypeWrapper(_enum_type_wrapper._EnumTypeWrapper[TripDescriptor._ScheduleRelationship.ValueType], _builtins.type):
+        DESCRIPTOR: _descriptor.EnumDescriptor
         SCHEDULED: TripDescriptor._ScheduleRelationship.ValueType  # 0
         """Trip that is running in accordance with its GTFS schedule, or is close
         enough to the scheduled trip to be associated with it.
@@ -1138,8 +1206,10 @@ class TripDescriptor(google.protobuf.message.Message):
         """
         CANCELED: TripDescriptor._ScheduleRelationship.ValueType  # 3
         """A trip that existed in the schedule but was removed."""
-        REPLACEMENT: TripDescriptor._ScheduleRelationship.ValueType  # 5
-        """Should not be used - for backwards-compatibility only."""
+        @_builtins.property
+        @_deprecated("""This enum value has been marked as deprecated using proto enum value options.""")
+        def REPLACEMENT(self) -> TripDescriptor._ScheduleRelationship.ValueType:   # 5
+            """Should not be used - for backwards-compatibility only."""
         DUPLICATED: TripDescriptor._ScheduleRelationship.ValueType  # 6
         """An extra trip that was added in addition to a running schedule, for example, to replace a broken vehicle or to
         respond to sudden passenger load. Used with TripUpdate.TripProperties.trip_id, TripUpdate.TripProperties.start_date,
@@ -1223,13 +1293,13 @@ class TripDescriptor(google.protobuf.message.Message):
     NOTE: This field is still experimental, and subject to change. It may be formally adopted in the future.
     """
 
-    TRIP_ID_FIELD_NUMBER: builtins.int
-    ROUTE_ID_FIELD_NUMBER: builtins.int
-    DIRECTION_ID_FIELD_NUMBER: builtins.int
-    START_TIME_FIELD_NUMBER: builtins.int
-    START_DATE_FIELD_NUMBER: builtins.int
-    SCHEDULE_RELATIONSHIP_FIELD_NUMBER: builtins.int
-    trip_id: builtins.str
+    TRIP_ID_FIELD_NUMBER: _builtins.int
+    ROUTE_ID_FIELD_NUMBER: _builtins.int
+    DIRECTION_ID_FIELD_NUMBER: _builtins.int
+    START_TIME_FIELD_NUMBER: _builtins.int
+    START_DATE_FIELD_NUMBER: _builtins.int
+    SCHEDULE_RELATIONSHIP_FIELD_NUMBER: _builtins.int
+    trip_id: _builtins.str
     """The trip_id from the GTFS feed that this selector refers to.
     For non frequency-based trips, this field is enough to uniquely identify
     the trip. For frequency-based trip, start_time and start_date might also be
@@ -1237,13 +1307,13 @@ class TripDescriptor(google.protobuf.message.Message):
     static GTFS to be duplicated. When schedule_relationship is DUPLICATED within a VehiclePosition, the trip_id
     identifies the new duplicate trip and must contain the value for the corresponding TripUpdate.TripProperties.trip_id.
     """
-    route_id: builtins.str
+    route_id: _builtins.str
     """The route_id from the GTFS that this selector refers to."""
-    direction_id: builtins.int
+    direction_id: _builtins.int
     """The direction_id from the GTFS feed trips.txt file, indicating the
     direction of travel for trips this selector refers to.
     """
-    start_time: builtins.str
+    start_time: _builtins.str
     """The initially scheduled start time of this trip instance.
     When the trip_id corresponds to a non-frequency-based trip, this field
     should either be omitted or be equal to the value in the GTFS feed. When
@@ -1260,7 +1330,7 @@ class TripDescriptor(google.protobuf.message.Message):
     Format and semantics of the field is same as that of
     GTFS/frequencies.txt/start_time, e.g., 11:15:35 or 25:15:35.
     """
-    start_date: builtins.str
+    start_date: _builtins.str
     """The scheduled start date of this trip instance.
     Must be provided to disambiguate trips that are so late as to collide with
     a scheduled trip on a next day. For example, for a train that departs 8:00
@@ -1272,34 +1342,37 @@ class TripDescriptor(google.protobuf.message.Message):
     related to schedule anymore.
     In YYYYMMDD format.
     """
-    schedule_relationship: global___TripDescriptor.ScheduleRelationship.ValueType
+    schedule_relationship: Global___TripDescriptor.ScheduleRelationship.ValueType
     def __init__(
         self,
         *,
-        trip_id: builtins.str | None = ...,
-        route_id: builtins.str | None = ...,
-        direction_id: builtins.int | None = ...,
-        start_time: builtins.str | None = ...,
-        start_date: builtins.str | None = ...,
-        schedule_relationship: global___TripDescriptor.ScheduleRelationship.ValueType | None = ...,
+        trip_id: _builtins.str | None = ...,
+        route_id: _builtins.str | None = ...,
+        direction_id: _builtins.int | None = ...,
+        start_time: _builtins.str | None = ...,
+        start_date: _builtins.str | None = ...,
+        schedule_relationship: Global___TripDescriptor.ScheduleRelationship.ValueType | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal["direction_id", b"direction_id", "route_id", b"route_id", "schedule_relationship", b"schedule_relationship", "start_date", b"start_date", "start_time", b"start_time", "trip_id", b"trip_id"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["direction_id", b"direction_id", "route_id", b"route_id", "schedule_relationship", b"schedule_relationship", "start_date", b"start_date", "start_time", b"start_time", "trip_id", b"trip_id"]) -> None: ...
+    _HasFieldArgType: _TypeAlias = _typing.Literal["direction_id", b"direction_id", "route_id", b"route_id", "schedule_relationship", b"schedule_relationship", "start_date", b"start_date", "start_time", b"start_time", "trip_id", b"trip_id"]  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["direction_id", b"direction_id", "route_id", b"route_id", "schedule_relationship", b"schedule_relationship", "start_date", b"start_date", "start_time", b"start_time", "trip_id", b"trip_id"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
 
-global___TripDescriptor = TripDescriptor
+Global___TripDescriptor: _TypeAlias = TripDescriptor  # noqa: Y015
 
-@typing_extensions.final
-class VehicleDescriptor(google.protobuf.message.Message):
+@_typing.final
+class VehicleDescriptor(_message.Message):
     """Identification information for the vehicle performing the trip."""
 
-    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    DESCRIPTOR: _descriptor.Descriptor
 
     class _WheelchairAccessible:
-        ValueType = typing.NewType("ValueType", builtins.int)
-        V: typing_extensions.TypeAlias = ValueType
+        ValueType = _typing.NewType("ValueType", _builtins.int)
+        V: _TypeAlias = ValueType  # noqa: Y015
 
-    class _WheelchairAccessibleEnumTypeWrapper(google.protobuf.internal.enum_type_wrapper._EnumTypeWrapper[VehicleDescriptor._WheelchairAccessible.ValueType], builtins.type):
-        DESCRIPTOR: google.protobuf.descriptor.EnumDescriptor
+    class _WheelchairAccessibleEnumTypeWrapper(_enum_type_wrapper._EnumTypeWrapper[VehicleDescriptor._WheelchairAccessible.ValueType], _builtins.type):
+        DESCRIPTOR: _descriptor.EnumDescriptor
         NO_VALUE: VehicleDescriptor._WheelchairAccessible.ValueType  # 0
         """The trip doesn't have information about wheelchair accessibility.
         This is the **default** behavior. If the static GTFS contains a
@@ -1337,80 +1410,86 @@ class VehicleDescriptor(google.protobuf.message.Message):
     This value will overwrite the value from the GTFS.
     """
 
-    ID_FIELD_NUMBER: builtins.int
-    LABEL_FIELD_NUMBER: builtins.int
-    LICENSE_PLATE_FIELD_NUMBER: builtins.int
-    WHEELCHAIR_ACCESSIBLE_FIELD_NUMBER: builtins.int
-    id: builtins.str
+    ID_FIELD_NUMBER: _builtins.int
+    LABEL_FIELD_NUMBER: _builtins.int
+    LICENSE_PLATE_FIELD_NUMBER: _builtins.int
+    WHEELCHAIR_ACCESSIBLE_FIELD_NUMBER: _builtins.int
+    id: _builtins.str
     """Internal system identification of the vehicle. Should be unique per
     vehicle, and can be used for tracking the vehicle as it proceeds through
     the system.
     """
-    label: builtins.str
+    label: _builtins.str
     """User visible label, i.e., something that must be shown to the passenger to
     help identify the correct vehicle.
     """
-    license_plate: builtins.str
+    license_plate: _builtins.str
     """The license plate of the vehicle."""
-    wheelchair_accessible: global___VehicleDescriptor.WheelchairAccessible.ValueType
+    wheelchair_accessible: Global___VehicleDescriptor.WheelchairAccessible.ValueType
     def __init__(
         self,
         *,
-        id: builtins.str | None = ...,
-        label: builtins.str | None = ...,
-        license_plate: builtins.str | None = ...,
-        wheelchair_accessible: global___VehicleDescriptor.WheelchairAccessible.ValueType | None = ...,
+        id: _builtins.str | None = ...,
+        label: _builtins.str | None = ...,
+        license_plate: _builtins.str | None = ...,
+        wheelchair_accessible: Global___VehicleDescriptor.WheelchairAccessible.ValueType | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal["id", b"id", "label", b"label", "license_plate", b"license_plate", "wheelchair_accessible", b"wheelchair_accessible"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["id", b"id", "label", b"label", "license_plate", b"license_plate", "wheelchair_accessible", b"wheelchair_accessible"]) -> None: ...
+    _HasFieldArgType: _TypeAlias = _typing.Literal["id", b"id", "label", b"label", "license_plate", b"license_plate", "wheelchair_accessible", b"wheelchair_accessible"]  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["id", b"id", "label", b"label", "license_plate", b"license_plate", "wheelchair_accessible", b"wheelchair_accessible"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
 
-global___VehicleDescriptor = VehicleDescriptor
+Global___VehicleDescriptor: _TypeAlias = VehicleDescriptor  # noqa: Y015
 
-@typing_extensions.final
-class EntitySelector(google.protobuf.message.Message):
+@_typing.final
+class EntitySelector(_message.Message):
     """A selector for an entity in a GTFS feed."""
 
-    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    DESCRIPTOR: _descriptor.Descriptor
 
-    AGENCY_ID_FIELD_NUMBER: builtins.int
-    ROUTE_ID_FIELD_NUMBER: builtins.int
-    ROUTE_TYPE_FIELD_NUMBER: builtins.int
-    TRIP_FIELD_NUMBER: builtins.int
-    STOP_ID_FIELD_NUMBER: builtins.int
-    DIRECTION_ID_FIELD_NUMBER: builtins.int
-    agency_id: builtins.str
+    AGENCY_ID_FIELD_NUMBER: _builtins.int
+    ROUTE_ID_FIELD_NUMBER: _builtins.int
+    ROUTE_TYPE_FIELD_NUMBER: _builtins.int
+    TRIP_FIELD_NUMBER: _builtins.int
+    STOP_ID_FIELD_NUMBER: _builtins.int
+    DIRECTION_ID_FIELD_NUMBER: _builtins.int
+    agency_id: _builtins.str
     """The values of the fields should correspond to the appropriate fields in the
     GTFS feed.
     At least one specifier must be given. If several are given, then the
     matching has to apply to all the given specifiers.
     """
-    route_id: builtins.str
-    route_type: builtins.int
+    route_id: _builtins.str
+    route_type: _builtins.int
     """corresponds to route_type in GTFS."""
-    @property
-    def trip(self) -> global___TripDescriptor: ...
-    stop_id: builtins.str
-    direction_id: builtins.int
+    stop_id: _builtins.str
+    direction_id: _builtins.int
     """Corresponds to trip direction_id in GTFS trips.txt. If provided the
     route_id must also be provided.
     """
+    @_builtins.property
+    def trip(self) -> Global___TripDescriptor: ...
     def __init__(
         self,
         *,
-        agency_id: builtins.str | None = ...,
-        route_id: builtins.str | None = ...,
-        route_type: builtins.int | None = ...,
-        trip: global___TripDescriptor | None = ...,
-        stop_id: builtins.str | None = ...,
-        direction_id: builtins.int | None = ...,
+        agency_id: _builtins.str | None = ...,
+        route_id: _builtins.str | None = ...,
+        route_type: _builtins.int | None = ...,
+        trip: Global___TripDescriptor | None = ...,
+        stop_id: _builtins.str | None = ...,
+        direction_id: _builtins.int | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal["agency_id", b"agency_id", "direction_id", b"direction_id", "route_id", b"route_id", "route_type", b"route_type", "stop_id", b"stop_id", "trip", b"trip"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["agency_id", b"agency_id", "direction_id", b"direction_id", "route_id", b"route_id", "route_type", b"route_type", "stop_id", b"stop_id", "trip", b"trip"]) -> None: ...
+    _HasFieldArgType: _TypeAlias = _typing.Literal["agency_id", b"agency_id", "direction_id", b"direction_id", "route_id", b"route_id", "route_type", b"route_type", "stop_id", b"stop_id", "trip", b"trip"]  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["agency_id", b"agency_id", "direction_id", b"direction_id", "route_id", b"route_id", "route_type", b"route_type", "stop_id", b"stop_id", "trip", b"trip"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
 
-global___EntitySelector = EntitySelector
+Global___EntitySelector: _TypeAlias = EntitySelector  # noqa: Y015
 
-@typing_extensions.final
-class TranslatedString(google.protobuf.message.Message):
+@_typing.final
+class TranslatedString(_message.Message):
     """An internationalized message containing per-language versions of a snippet of
     text or a URL.
     One of the strings from a message will be picked up. The resolution proceeds
@@ -1423,17 +1502,17 @@ class TranslatedString(google.protobuf.message.Message):
        picked.
     """
 
-    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    DESCRIPTOR: _descriptor.Descriptor
 
-    @typing_extensions.final
-    class Translation(google.protobuf.message.Message):
-        DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    @_typing.final
+    class Translation(_message.Message):
+        DESCRIPTOR: _descriptor.Descriptor
 
-        TEXT_FIELD_NUMBER: builtins.int
-        LANGUAGE_FIELD_NUMBER: builtins.int
-        text: builtins.str
+        TEXT_FIELD_NUMBER: _builtins.int
+        LANGUAGE_FIELD_NUMBER: _builtins.int
+        text: _builtins.str
         """A UTF-8 string containing the message."""
-        language: builtins.str
+        language: _builtins.str
         """BCP-47 language code. Can be omitted if the language is unknown or if
         no i18n is done at all for the feed. At most one translation is
         allowed to have an unspecified language tag.
@@ -1441,27 +1520,35 @@ class TranslatedString(google.protobuf.message.Message):
         def __init__(
             self,
             *,
-            text: builtins.str | None = ...,
-            language: builtins.str | None = ...,
+            text: _builtins.str | None = ...,
+            language: _builtins.str | None = ...,
         ) -> None: ...
-        def HasField(self, field_name: typing_extensions.Literal["language", b"language", "text", b"text"]) -> builtins.bool: ...
-        def ClearField(self, field_name: typing_extensions.Literal["language", b"language", "text", b"text"]) -> None: ...
-
-    TRANSLATION_FIELD_NUMBER: builtins.int
-    @property
-    def translation(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___TranslatedString.Translation]:
+        _HasFieldArgType: _TypeAlias = _typing.Literal["language", b"language", "text", b"text"]  # noqa: Y015
+        def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+        _ClearFieldArgType: _TypeAlias = _typing.Literal["language", b"language", "text", b"text"]  # noqa: Y015
+        def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+        def WhichOneof(self, oneof_group: _Never) -> None: ...
+
+    TRANSLATION_FIELD_NUMBER: _builtins.int
+    @_builtins.property
+    def translation(self) -> _containers.RepeatedCompositeFieldContainer[Global___TranslatedString.Translation]:
         """At least one translation must be provided."""
+
     def __init__(
         self,
         *,
-        translation: collections.abc.Iterable[global___TranslatedString.Translation] | None = ...,
+        translation: _abc.Iterable[Global___TranslatedString.Translation] | None = ...,
     ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal["translation", b"translation"]) -> None: ...
+    _HasFieldArgType: _TypeAlias = _Never  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["translation", b"translation"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
 
-global___TranslatedString = TranslatedString
+Global___TranslatedString: _TypeAlias = TranslatedString  # noqa: Y015
 
-@typing_extensions.final
-class TranslatedImage(google.protobuf.message.Message):
+@_typing.final
+class TranslatedImage(_message.Message):
     """An internationalized image containing per-language versions of a URL linking to an image
     along with meta information
     Only one of the images from a message will be retained by consumers. The resolution proceeds
@@ -1475,26 +1562,26 @@ class TranslatedImage(google.protobuf.message.Message):
     NOTE: This field is still experimental, and subject to change. It may be formally adopted in the future.
     """
 
-    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    DESCRIPTOR: _descriptor.Descriptor
 
-    @typing_extensions.final
-    class LocalizedImage(google.protobuf.message.Message):
-        DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    @_typing.final
+    class LocalizedImage(_message.Message):
+        DESCRIPTOR: _descriptor.Descriptor
 
-        URL_FIELD_NUMBER: builtins.int
-        MEDIA_TYPE_FIELD_NUMBER: builtins.int
-        LANGUAGE_FIELD_NUMBER: builtins.int
-        url: builtins.str
+        URL_FIELD_NUMBER: _builtins.int
+        MEDIA_TYPE_FIELD_NUMBER: _builtins.int
+        LANGUAGE_FIELD_NUMBER: _builtins.int
+        url: _builtins.str
         """String containing an URL linking to an image
         The image linked must be less than 2MB. 
         If an image changes in a significant enough way that an update is required on the consumer side, the producer must update the URL to a new one.
         The URL should be a fully qualified URL that includes http:// or https://, and any special characters in the URL must be correctly escaped. See the following http://www.w3.org/Addressing/URL/4_URI_Recommentations.html for a description of how to create fully qualified URL values.
         """
-        media_type: builtins.str
+        media_type: _builtins.str
         """IANA media type as to specify the type of image to be displayed. 
         The type must start with "image/"
         """
-        language: builtins.str
+        language: _builtins.str
         """BCP-47 language code. Can be omitted if the language is unknown or if
         no i18n is done at all for the feed. At most one translation is
         allowed to have an unspecified language tag.
@@ -1502,28 +1589,36 @@ class TranslatedImage(google.protobuf.message.Message):
         def __init__(
             self,
             *,
-            url: builtins.str | None = ...,
-            media_type: builtins.str | None = ...,
-            language: builtins.str | None = ...,
+            url: _builtins.str | None = ...,
+            media_type: _builtins.str | None = ...,
+            language: _builtins.str | None = ...,
         ) -> None: ...
-        def HasField(self, field_name: typing_extensions.Literal["language", b"language", "media_type", b"media_type", "url", b"url"]) -> builtins.bool: ...
-        def ClearField(self, field_name: typing_extensions.Literal["language", b"language", "media_type", b"media_type", "url", b"url"]) -> None: ...
-
-    LOCALIZED_IMAGE_FIELD_NUMBER: builtins.int
-    @property
-    def localized_image(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___TranslatedImage.LocalizedImage]:
+        _HasFieldArgType: _TypeAlias = _typing.Literal["language", b"language", "media_type", b"media_type", "url", b"url"]  # noqa: Y015
+        def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+        _ClearFieldArgType: _TypeAlias = _typing.Literal["language", b"language", "media_type", b"media_type", "url", b"url"]  # noqa: Y015
+        def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+        def WhichOneof(self, oneof_group: _Never) -> None: ...
+
+    LOCALIZED_IMAGE_FIELD_NUMBER: _builtins.int
+    @_builtins.property
+    def localized_image(self) -> _containers.RepeatedCompositeFieldContainer[Global___TranslatedImage.LocalizedImage]:
         """At least one localized image must be provided."""
+
     def __init__(
         self,
         *,
-        localized_image: collections.abc.Iterable[global___TranslatedImage.LocalizedImage] | None = ...,
+        localized_image: _abc.Iterable[Global___TranslatedImage.LocalizedImage] | None = ...,
     ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal["localized_image", b"localized_image"]) -> None: ...
+    _HasFieldArgType: _TypeAlias = _Never  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["localized_image", b"localized_image"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
 
-global___TranslatedImage = TranslatedImage
+Global___TranslatedImage: _TypeAlias = TranslatedImage  # noqa: Y015
 
-@typing_extensions.final
-class Shape(google.protobuf.message.Message):
+@_typing.final
+class Shape(_message.Message):
     """Describes the physical path that a vehicle takes when it's not part of the (CSV) GTFS,
     such as for a detour. Shapes belong to Trips, and consist of a sequence of shape points.
     Tracing the points in order provides the path of the vehicle.  Shapes do not need to intercept
@@ -1532,17 +1627,17 @@ class Shape(google.protobuf.message.Message):
     NOTE: This message is still experimental, and subject to change. It may be formally adopted in the future.
     """
 
-    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    DESCRIPTOR: _descriptor.Descriptor
 
-    SHAPE_ID_FIELD_NUMBER: builtins.int
-    ENCODED_POLYLINE_FIELD_NUMBER: builtins.int
-    shape_id: builtins.str
+    SHAPE_ID_FIELD_NUMBER: _builtins.int
+    ENCODED_POLYLINE_FIELD_NUMBER: _builtins.int
+    shape_id: _builtins.str
     """Identifier of the shape. Must be different than any shape_id defined in the (CSV) GTFS.
     This field is required as per reference.md, but needs to be specified here optional because "Required is Forever"
     See https://developers.google.com/protocol-buffers/docs/proto#specifying_field_rules
     NOTE: This field is still experimental, and subject to change. It may be formally adopted in the future.
     """
-    encoded_polyline: builtins.str
+    encoded_polyline: _builtins.str
     """Encoded polyline representation of the shape. This polyline must contain at least two points.
     For more information about encoded polylines, see https://developers.google.com/maps/documentation/utilities/polylinealgorithm
     This field is required as per reference.md, but needs to be specified here optional because "Required is Forever"
@@ -1552,10 +1647,13 @@ class Shape(google.protobuf.message.Message):
     def __init__(
         self,
         *,
-        shape_id: builtins.str | None = ...,
-        encoded_polyline: builtins.str | None = ...,
+        shape_id: _builtins.str | None = ...,
+        encoded_polyline: _builtins.str | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal["encoded_polyline", b"encoded_polyline", "shape_id", b"shape_id"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["encoded_polyline", b"encoded_polyline", "shape_id", b"shape_id"]) -> None: ...
+    _HasFieldArgType: _TypeAlias = _typing.Literal["encoded_polyline", b"encoded_polyline", "shape_id", b"shape_id"]  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["encoded_polyline", b"encoded_polyline", "shape_id", b"shape_id"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
 
-global___Shape = Shape
+Global___Shape: _TypeAlias = Shape  # noqa: Y015
@@ -1,10 +1,41 @@
+import collections
 import json
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Exists, Max, OuterRef, Q
 from django.utils import timezone
 import emf_bus_tracking.celery
-from django.core.files.storage import default_storage
 from celery import shared_task
 from .gtfs_rt import gtfs_realtime_pb2
+from . import feed_storage
 from . import models
+from . import gtfs_tasks
+from . import metrics
+from . import trip_matching
+from . import trip_updates
+
+POSITION_CUTOFF = timezone.timedelta(minutes=15)
+# A queued build not started after this long is taken to be lost and queued again
+QUEUE_STALE_AFTER = timezone.timedelta(minutes=1)
+
+# The contents of the feed, from which both the protobuf and JSON versions are encoded
+Feed = collections.namedtuple("Feed", ["timestamp", "alerts", "vehicle_positions", "trip_updates"])
+AlertEntity = collections.namedtuple("AlertEntity", [
+    "id", "periods", "selectors", "cause", "effect", "severity", "url", "header", "description",
+])
+VehiclePositionEntity = collections.namedtuple("VehiclePositionEntity", [
+    "id", "trip", "vehicle", "latitude", "longitude", "timestamp",
+])
+TripUpdateEntity = collections.namedtuple("TripUpdateEntity", [
+    "trip", "vehicle", "stop_time_updates", "timestamp", "delay",
+])
+StopTimeUpdate = collections.namedtuple("StopTimeUpdate", ["stop_sequence", "stop_id", "arrival", "departure"])
+
+_last_feed = {
+    "fingerprint": None,
+    "feed": None,
+    "written_at": None,
+}
 
 
 @emf_bus_tracking.celery.app.on_after_configure.connect
@@ -12,124 +43,355 @@ def setup_periodic_tasks(sender, **kwargs):
     sender.add_periodic_task(10.0, generate_gtfs_rt.s())
 
 
+# Rebuilds the feed shortly after new positions are stored, rather than waiting for the periodic build
+def request_gtfs_rt():
+    transaction.on_commit(queue_gtfs_rt)
+
+
+def queue_gtfs_rt():
+    now = timezone.now()
+    queued = models.GTFSRTState.objects.filter(
+        Q(queued_at__isnull=True) | Q(queued_at__lt=now - QUEUE_STALE_AFTER), id=1
+    ).update(queued_at=now)
+    if not queued:
+        _, queued = models.GTFSRTState.objects.get_or_create(id=1, defaults={"queued_at": now})
+
+    if queued:
+        generate_gtfs_rt.apply_async(countdown=settings.GTFS_RT_DEBOUNCE)
+
+
 @shared_task(ignore_result=True)
 def generate_gtfs_rt():
+    # Positions stored from here on aren't in this build, so they queue another
+    models.GTFSRTState.objects.filter(id=1).update(queued_at=None)
+
+    with metrics.measure("gtfs_rt") as m:
+        # Runs that find the feed unchanged don't count as refreshing it
+        m.skipped = not write_gtfs_rt()
+
+
+def write_gtfs_rt():
     now = timezone.now()
+    # Schedule fingerprints are shared with building the feed, so they're only queried once
+    fingerprints = {}
+    with metrics.measure("gtfs_rt.fingerprint"):
+        fingerprint = get_feed_fingerprint(now, fingerprints)
+
+    if _last_feed["fingerprint"] == fingerprint:
+        if now - _last_feed["written_at"] < timezone.timedelta(seconds=settings.GTFS_RT_KEEPALIVE):
+            return False
+
+        feed = _last_feed["feed"]._replace(timestamp=int(now.timestamp()))
+    else:
+        feed = build_feed(now, fingerprints)
+
+    with metrics.measure("gtfs_rt.serialize") as m:
+        output, output_json = encode_feed(feed)
+        m.rows = len(feed.alerts) + len(feed.vehicle_positions) + len(feed.trip_updates)
+        m.bytes = len(output) + len(output_json)
+
+    with metrics.measure("gtfs_rt.write") as m:
+        m.bytes = feed_storage.write_feed_file('gtfs-rt.pb', output)
+        m.bytes += feed_storage.write_feed_file('gtfs-rt.json', output_json)
+
+    _last_feed.update(
+        fingerprint=fingerprint,
+        feed=feed,
+        written_at=now,
+    )
+    return True
+
+
+def get_feed_fingerprint(now, fingerprints=None):
+    positions = get_current_positions(now).aggregate(count=Count("pk"), updated=Max("updated_at"))
+    alerts = get_active_alerts(now).aggregate(count=Count("pk"), updated=Max("updated_at"))
+    fingerprints = {} if fingerprints is None else fingerprints
+
+    return (
+        positions["count"], positions["updated"],
+        alerts["count"], alerts["updated"],
+        gtfs_tasks.get_source_fingerprint(models.Journey, fingerprints),
+        gtfs_tasks.get_source_fingerprint(models.JourneyPoint, fingerprints),
+    )
+
+
+def build_feed(now, fingerprints=None) -> Feed:
+    with metrics.measure("gtfs_rt.live_positions") as m:
+        matcher = trip_matching.get_trip_matcher(now, fingerprints)
+        live_positions = get_live_positions(now, matcher)
+        m.rows = len(live_positions)
+
+    with metrics.measure("gtfs_rt.alerts") as m:
+        alerts = get_alerts(now)
+        m.rows = len(alerts)
+    with metrics.measure("gtfs_rt.vehicle_positions") as m:
+        vehicle_positions = get_vehicle_positions(live_positions)
+        m.rows = len(vehicle_positions)
+    with metrics.measure("gtfs_rt.trip_updates") as m:
+        updates = get_trip_updates(live_positions, trip_updates.get_journey_schedules(matcher))
+        m.rows = len(updates)
+
+    return Feed(int(now.timestamp()), alerts, vehicle_positions, updates)
+
+
+def get_active_alerts(now):
+    active_periods = models.ServiceAlertPeriod.objects.filter(
+        Q(end__isnull=True) | Q(end__gt=now), service_alert=OuterRef("pk")
+    )
+    any_periods = models.ServiceAlertPeriod.objects.filter(service_alert=OuterRef("pk"))
+
+    return models.ServiceAlert.objects.filter(Exists(active_periods) | ~Exists(any_periods))
+
+
+def get_alerts(now) -> list:
+    return [
+        AlertEntity(
+            id=alert.id,
+            periods=[(p.start, p.end) for p in alert.periods.all()],
+            selectors=[(e.route_id, e.journey_id, e.stop_id) for e in alert.selectors.all()],
+            cause=alert.cause,
+            effect=alert.effect,
+            severity=alert.severity,
+            url=alert.url,
+            header=alert.header,
+            description=alert.description,
+        ) for alert in get_active_alerts(now).prefetch_related("periods", "selectors")
+    ]
+
+
+def get_live_positions(now, matcher: trip_matching.TripMatcher):
+    return [
+        (last_position, matcher.match(last_position.vehicle_id, last_position.timestamp))
+        for last_position in get_current_positions(now).select_related("vehicle")
+    ]
+
+
+# Positions whose history row has been deleted are stale, even if they're within the cutoff
+def get_current_positions(now):
+    return models.VehicleCurrentPosition.objects.filter(
+        timestamp__gt=now - POSITION_CUTOFF, position__isnull=False
+    )
+
+
+def get_vehicle_positions(live_positions) -> list:
+    return [
+        VehiclePositionEntity(
+            id=last_position.vehicle_id,
+            trip=trip,
+            vehicle=last_position.vehicle,
+            latitude=last_position.latitude,
+            longitude=last_position.longitude,
+            timestamp=int(last_position.timestamp.timestamp()),
+        ) for last_position, trip in live_positions
+    ]
 
-    output_message = gtfs_realtime_pb2.FeedMessage(
+
+def get_trip_updates(live_positions, schedules: dict) -> list:
+    scheduled_positions = [
+        (last_position, trip, schedules[trip.journey_id]) for last_position, trip in live_positions
+        if trip and trip.journey_id in schedules
+    ]
+    predictions = trip_updates.predict_delays([
+        (schedule, last_position.timestamp.timestamp(), last_position.latitude, last_position.longitude)
+        for last_position, _, schedule in scheduled_positions
+    ])
+
+    updates = []
+    for (last_position, trip, schedule), prediction in zip(scheduled_positions, predictions):
+        if not prediction:
+            continue
+
+        delay, next_stop = prediction
+        updates.append(TripUpdateEntity(
+            trip=trip,
+            vehicle=last_position.vehicle,
+            stop_time_updates=[StopTimeUpdate(
+                stop_sequence=schedule.stop_sequences[i],
+                stop_id=schedule.stop_ids[i],
+                arrival=int(schedule.arrivals[i]) + delay,
+                departure=int(schedule.departures[i]) + delay,
+            ) for i in range(next_stop, len(schedule.stop_ids))],
+            timestamp=int(last_position.timestamp.timestamp()),
+            delay=delay,
+        ))
+
+    return updates
+
+
+# Encodes the feed as protobuf and JSON in a single pass over its entities
+def encode_feed(feed: Feed):
+    entities = []
+    output_json = {
+        "header": {
+            "timestamp": feed.timestamp,
+        },
+        "alerts": [],
+        "vehicle_positions": [],
+        "trip_updates": [],
+    }
+
+    for key, items, encode in (
+            ("alerts", feed.alerts, encode_alert),
+            ("vehicle_positions", feed.vehicle_positions, encode_vehicle_position),
+            ("trip_updates", feed.trip_updates, encode_trip_update),
+    ):
+        for item in items:
+            entity, entity_json = encode(item)
+            entities.append(entity)
+            output_json[key].append(entity_json)
+
+    output = gtfs_realtime_pb2.FeedMessage(
         header=gtfs_realtime_pb2.FeedHeader(
             gtfs_realtime_version="2.0",
             incrementality=gtfs_realtime_pb2.FeedHeader.FULL_DATASET,
-            timestamp=int(now.timestamp()),
+            timestamp=feed.timestamp,
+        ),
+        entity=entities,
+    )
+    return output.SerializeToString(), json.dumps(output_json, separators=(",", ":")).encode()
+
+
+def translated_string(text):
+    return gtfs_realtime_pb2.TranslatedString(
+        translation=[gtfs_realtime_pb2.TranslatedString.Translation(text=text)]
+    ) if text else None
+
+
+CAUSES = dict(models.ServiceAlert.CAUSES)
+EFFECTS = dict(models.ServiceAlert.EFFECTS)
+SEVERITIES = dict(models.ServiceAlert.SEVERITIES)
+
+
+def encode_alert(alert: AlertEntity):
+    entity = gtfs_realtime_pb2.FeedEntity(
+        id=str(alert.id),
+        alert=gtfs_realtime_pb2.Alert(
+            active_period=[gtfs_realtime_pb2.TimeRange(
+                start=int(start.timestamp()) if start else None,
+                end=int(end.timestamp()) if end else None,
+            ) for start, end in alert.periods],
+            informed_entity=[gtfs_realtime_pb2.EntitySelector(
+                route_id=str(route_id) if route_id else None,
+                trip=gtfs_realtime_pb2.TripDescriptor(
+                    trip_id=str(journey_id)
+                ) if journey_id else None,
+                stop_id=str(stop_id) if stop_id else None,
+            ) for route_id, journey_id, stop_id in alert.selectors],
+            cause=alert.cause if alert.cause else gtfs_realtime_pb2.Alert.Cause.UNKNOWN_CAUSE,
+            effect=alert.effect if alert.effect else gtfs_realtime_pb2.Alert.Effect.UNKNOWN_EFFECT,
+            url=translated_string(alert.url),
+            header_text=translated_string(alert.header),
+            description_text=translated_string(alert.description),
+            severity_level=alert.severity if alert.severity else
+            gtfs_realtime_pb2.Alert.SeverityLevel.UNKNOWN_SEVERITY,
         )
     )
-    output_message_json = {
-        "header": {
-            "timestamp": int(now.timestamp()),
+    entity_json = {
+        "id": str(alert.id),
+        "active_period": [{
+            "start": start.isoformat() if start else None,
+            "end": end.isoformat() if end else None,
+        } for start, end in alert.periods],
+        "informed_entity": [{
+            "route_id": str(route_id) if route_id else None,
+            "trip": {
+                "trip_id": str(journey_id)
+            } if journey_id else None,
+            "stop_id": str(stop_id) if stop_id else None,
+        } for route_id, journey_id, stop_id in alert.selectors],
+        "cause": CAUSES.get(alert.cause) if alert.cause else None,
+        "effect": EFFECTS.get(alert.effect) if alert.effect else None,
+        "severity_level": SEVERITIES.get(alert.severity) if alert.severity else None,
+        "url": alert.url if alert.url else None,
+        "header_text": alert.header if alert.header else None,
+        "description_text": alert.description if alert.description else None,
+    }
+    return entity, entity_json
+
+
+def encode_trip(trip: trip_matching.ScheduledTrip):
+    return gtfs_realtime_pb2.TripDescriptor(
+        trip_id=str(trip.journey_id),
+        route_id=str(trip.route_id) if trip.route_id else None,
+        direction_id=trip.direction,
+        start_date=trip.date.strftime("%Y%m%d"),
+    ), {
+        "trip_id": str(trip.journey_id),
+        "route_id": str(trip.route_id) if trip.route_id else None,
+        "direction_id": trip.direction,
+        "start_date": trip.date.isoformat(),
+    }
+
+
+def encode_vehicle(vehicle: models.Vehicle):
+    return gtfs_realtime_pb2.VehicleDescriptor(
+        id=str(vehicle.id),
+        label=vehicle.name,
+        license_plate=vehicle.registration_plate,
+    ), {
+        "id": str(vehicle.id),
+        "label": vehicle.name,
+        "license_plate": vehicle.registration_plate,
+    }
+
+
+def encode_vehicle_position(position: VehiclePositionEntity):
+    trip, trip_json = encode_trip(position.trip) if position.trip else (None, None)
+    vehicle, vehicle_json = encode_vehicle(position.vehicle)
+    entity = gtfs_realtime_pb2.FeedEntity(
+        id=str(position.id),
+        vehicle=gtfs_realtime_pb2.VehiclePosition(
+            trip=trip,
+            vehicle=vehicle,
+            position=gtfs_realtime_pb2.Position(
+                latitude=position.latitude,
+                longitude=position.longitude,
+            ),
+            timestamp=position.timestamp,
+        )
+    )
+    entity_json = {
+        "id": str(position.id),
+        "trip": trip_json,
+        "vehicle": vehicle_json,
+        "position": {
+            "latitude": position.latitude,
+            "longitude": position.longitude,
         },
-        "alerts": [],
-        "vehicle_positions": []
+        "timestamp": position.timestamp,
     }
+    return entity, entity_json
 
-    add_alerts(output_message, output_message_json)
-    add_vehicle_positions(output_message, output_message_json)
-
-    with default_storage.open('gtfs-rt.pb', "wb") as f:
-        f.write(output_message.SerializeToString())
-    with default_storage.open('gtfs-rt.json', "w") as f:
-        json.dump(output_message_json, f)
-
-
-def add_alerts(msg: gtfs_realtime_pb2.FeedMessage, msg_json: dict):
-    for alert in models.ServiceAlert.objects.all():
-        msg.entity.append(gtfs_realtime_pb2.FeedEntity(
-            id=str(alert.id),
-            alert=gtfs_realtime_pb2.Alert(
-                active_period=map(lambda p: gtfs_realtime_pb2.TimeRange(
-                    start=int(p.start.timestamp()) if p.start else None,
-                    end=int(p.end.timestamp()) if p.end else None,
-                ), alert.periods.all()),
-                informed_entity=map(lambda e: gtfs_realtime_pb2.EntitySelector(
-                    route_id=str(e.route.id) if e.route else None,
-                    trip=gtfs_realtime_pb2.TripDescriptor(
-                        trip_id=str(e.journey.id)
-                    ) if e.journey else None,
-                    stop_id=str(e.stop.id) if e.stop else None,
-                ), alert.selectors.all()),
-                cause=alert.cause if alert.cause else gtfs_realtime_pb2.Alert.Cause.UNKNOWN_CAUSE,
-                effect=alert.effect if alert.effect else gtfs_realtime_pb2.Alert.Effect.UNKNOWN_EFFECT,
-                url=gtfs_realtime_pb2.TranslatedString(
-                    translation=[gtfs_realtime_pb2.TranslatedString.Translation(
-                        text=alert.url,
-                    )]
-                ) if alert.url else None,
-                header_text=gtfs_realtime_pb2.TranslatedString(
-                    translation=[gtfs_realtime_pb2.TranslatedString.Translation(
-                        text=alert.header,
-                    )]
-                ) if alert.header else None,
-                description_text=gtfs_realtime_pb2.TranslatedString(
-                    translation=[gtfs_realtime_pb2.TranslatedString.Translation(
-                        text=alert.description,
-                    )]
-                ) if alert.description else None,
-                severity_level=alert.severity if alert.severity else
-                gtfs_realtime_pb2.Alert.SeverityLevel.UNKNOWN_SEVERITY,
-            )
-        ))
-        msg_json["alerts"].append({
-            "id": str(alert.id),
-            "active_period": list(map(lambda p: {
-                "start": p.start.isoformat() if p.start else None,
-                "end": p.end.isoformat() if p.end else None,
-            }, alert.periods.all())),
-            "informed_entity": list(map(lambda e: {
-                "route_id": str(e.route.id) if e.route else None,
-                "trip": {
-                    "trip_id": str(e.journey.id)
-                } if e.journey else None,
-                "stop_id": str(e.stop.id) if e.stop else None,
-            }, alert.selectors.all())),
-            "cause": alert.get_cause_display() if alert.cause else None,
-            "effect": alert.get_effect_display() if alert.effect else None,
-            "severity_level": alert.get_severity_display() if alert.severity else None,
-            "url": alert.url if alert.url else None,
-            "header_text": alert.header if alert.header else None,
-            "description_text": alert.description if alert.description else None,
-        })
-
-
-def add_vehicle_positions(msg: gtfs_realtime_pb2.FeedMessage, msg_json: dict):
-    cutoff = timezone.now() - timezone.timedelta(minutes=15)
-
-    for vehicle in models.Vehicle.objects.all():
-        last_position = vehicle.positions.order_by('-timestamp').first()
-        if last_position and last_position.timestamp > cutoff:
-            msg.entity.append(gtfs_realtime_pb2.FeedEntity(
-                id=str(last_position.id),
-                vehicle=gtfs_realtime_pb2.VehiclePosition(
-                    vehicle=gtfs_realtime_pb2.VehicleDescriptor(
-                        id=str(vehicle.id),
-                        label=vehicle.name,
-                        license_plate=vehicle.registration_plate,
-                    ),
-                    position=gtfs_realtime_pb2.Position(
-                        latitude=last_position.latitude,
-                        longitude=last_position.longitude,
-                    ),
-                    timestamp=int(last_position.timestamp.timestamp()),
-                )
-            ))
-            msg_json["vehicle_positions"].append({
-                "id": str(last_position.id),
-                "vehicle": {
-                    "id": str(vehicle.id),
-                    "label": vehicle.name,
-                    "license_plate": vehicle.registration_plate,
-                },
-                "position": {
-                    "latitude": last_position.latitude,
-                    "longitude": last_position.longitude,
-                },
-                "timestamp": int(last_position.timestamp.timestamp()),
-            })
+
+def encode_trip_update(update: TripUpdateEntity):
+    trip, trip_json = encode_trip(update.trip)
+    vehicle, vehicle_json = encode_vehicle(update.vehicle)
+    entity = gtfs_realtime_pb2.FeedEntity(
+        id=str(update.trip.journey_id),
+        trip_update=gtfs_realtime_pb2.TripUpdate(
+            trip=trip,
+            vehicle=vehicle,
+            stop_time_update=[gtfs_realtime_pb2.TripUpdate.StopTimeUpdate(
+                stop_sequence=u.stop_sequence,
+                stop_id=str(u.stop_id),
+                arrival=gtfs_realtime_pb2.TripUpdate.StopTimeEvent(delay=update.delay, time=u.arrival),
+                departure=gtfs_realtime_pb2.TripUpdate.StopTimeEvent(delay=update.delay, time=u.departure),
+            ) for u in update.stop_time_updates],
+            timestamp=update.timestamp,
+            delay=update.delay,
+        )
+    )
+    entity_json = {
+        "id": str(update.trip.journey_id),
+        "trip": trip_json,
+        "vehicle": vehicle_json,
+        "stop_time_update": [{
+            "stop_sequence": u.stop_sequence,
+            "stop_id": str(u.stop_id),
+            "arrival": {"delay": update.delay, "time": u.arrival},
+            "departure": {"delay": update.delay, "time": u.departure},
+        } for u in update.stop_time_updates],
+        "timestamp": update.timestamp,
+        "delay": update.delay,
+    }
+    return entity, entity_json
@@ -1,3 +1,5 @@
+import functools
+import hashlib
 import json
 import uuid
 import zipfile
@@ -8,7 +10,38 @@ from django.utils import timezone
 from django.conf import settings
 from celery import shared_task
 from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Count, Max
+from . import feed_storage
+from . import metrics
 from . import models
+from . import shapes
+
+SCHEDULE_STALE_AFTER = timezone.timedelta(minutes=15)
+
+
+def request_gtfs_schedule():
+    transaction.on_commit(queue_gtfs_schedule)
+
+
+def queue_gtfs_schedule():
+    now = timezone.now()
+
+    with transaction.atomic():
+        state = get_schedule_state()
+        state.requested_at = now
+        queue = not state.queued_at or now - state.queued_at > SCHEDULE_STALE_AFTER
+        if queue:
+            state.queued_at = now
+        state.save()
+
+    if queue:
+        generate_gtfs_schedule.apply_async(countdown=settings.GTFS_SCHEDULE_DEBOUNCE)
+
+
+def get_schedule_state():
+    state, _ = models.GTFSScheduleState.objects.select_for_update().get_or_create(id=1)
+    return state
 
 
 @shared_task(
@@ -16,49 +49,166 @@ from . import models
     ignore_result=True
 )
 def generate_gtfs_schedule():
+    now = timezone.now()
+    debounce = timezone.timedelta(seconds=settings.GTFS_SCHEDULE_DEBOUNCE)
+
+    with transaction.atomic():
+        state = get_schedule_state()
+        if state.running_since and now - state.running_since < SCHEDULE_STALE_AFTER:
+            delay = debounce
+        elif state.requested_at and now - state.requested_at < debounce:
+            delay = debounce - (now - state.requested_at)
+        else:
+            delay = None
+            state.running_since = now
+
+        state.queued_at = now if delay is not None else None
+        state.save()
+
+    if delay is not None:
+        generate_gtfs_schedule.apply_async(countdown=delay.total_seconds())
+        return
+
+    try:
+        with metrics.measure("gtfs_schedule"):
+            build_gtfs_schedule()
+    finally:
+        with transaction.atomic():
+            state = get_schedule_state()
+            state.running_since = None
+            state.save()
+
+    generate_schedule_html.delay()
+
+
+def build_gtfs_schedule():
     now = timezone.now()
     feed_version = f"{now.date().isoformat()}-{uuid.uuid4()}"
 
     output_file = io.BytesIO()
     output_zip = zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED, strict_timestamps=False)
     output_json = {
-        "routes": []
+        "routes": build_routes_json()
     }
 
-    with output_zip.open("agency.txt", "w") as file:
-        write_agency_file(file)
-
-    with output_zip.open("stops.txt", "w") as file:
-        write_stops_file(file)
-
-    with output_zip.open("routes.txt", "w") as file:
-        write_routes_file(file, output_json)
-
-    with output_zip.open("trips.txt", "w") as file:
-        write_trips_file(file)
-
-    with output_zip.open("stop_times.txt", "w") as file:
-        write_stop_times_file(file)
-
-    with output_zip.open("calendar.txt", "w") as file:
-        write_calendar_file(file)
-
-    with output_zip.open("shapes.txt", "w") as file:
-        write_shapes_file(file)
-
-    with output_zip.open("timetables.txt", "w") as file:
-        write_timetables_file(file)
-
-    with output_zip.open("feed_info.txt", "w") as file:
-        write_feed_info_file(file, feed_version)
+    fingerprints = {}
+    for name, writer, sources in get_schedule_files(TimetableSnapshot(), feed_version):
+        output_zip.writestr(name, get_schedule_file(name, writer, sources, fingerprints))
 
     output_zip.close()
-    with default_storage.open('gtfs.zip', "wb") as f:
-        f.write(output_file.getbuffer())
-    with default_storage.open('gtfs.json', "w") as f:
-        json.dump(output_json, f)
+    with metrics.measure("gtfs_schedule.write") as m:
+        m.bytes = output_file.getbuffer().nbytes
+        with default_storage.open('gtfs.zip', "wb") as f:
+            f.write(output_file.getbuffer())
+        m.bytes += feed_storage.write_feed_file('gtfs.json', json.dumps(output_json).encode())
+
+
+# The files of the schedule feed, each with its writer and the models and settings its contents depend on
+def get_schedule_files(snapshot, feed_version: str) -> list:
+    return [
+        ("agency.txt", write_agency_file, ()),
+        ("stops.txt", write_stops_file, (models.Stop,)),
+        ("routes.txt", write_routes_file, (models.Route, "GTFS_CONFIG")),
+        ("trips.txt", functools.partial(write_trips_file, snapshot=snapshot), (
+            models.Journey, models.Route, models.Shape
+        )),
+        ("stop_times.txt", functools.partial(write_stop_times_file, snapshot=snapshot), (
+            models.Journey, models.JourneyPoint, models.Stop, models.Shape, models.ShapePoint, "SHAPE_DETAIL"
+        )),
+        ("calendar.txt", functools.partial(write_calendar_file, snapshot=snapshot), (models.Journey,)),
+        ("shapes.txt", write_shapes_file, (models.Shape, models.ShapePoint, "SHAPE_DETAIL")),
+        ("timetables.txt", write_timetables_file, (models.Route, models.Journey)),
+        ("feed_info.txt", functools.partial(write_feed_info_file, version=feed_version), ()),
+    ]
+
+
+class TimetableSnapshot:
+    @functools.cached_property
+    def journeys(self):
+        return list(models.Journey.objects.order_by("date", "code").values_list(
+            "id", "code", "route_id", "direction", "date", "public", "forms_from_id", "shape_id",
+            named=True
+        ))
+
+    @functools.cached_property
+    def public_journeys(self):
+        return [journey for journey in self.journeys if journey.public]
+
+    @functools.cached_property
+    def points(self):
+        points = {}
+        for point in models.JourneyPoint.objects.filter(journey__public=True).order_by(
+                "journey_id", "order"
+        ).values_list(
+            "journey_id", "stop_id", "arrival_time", "departure_time", "timing_point", "order",
+            "stop__latitude", "stop__longitude", named=True
+        ):
+            points.setdefault(point.journey_id, []).append(point)
+
+        return points
+
+
+class CapturedFile(io.BytesIO):
+    contents = b""
+
+    def close(self):
+        if not self.closed:
+            self.contents = self.getvalue()
+        super().close()
+
+
+def render_schedule_file(writer) -> bytes:
+    file = CapturedFile()
+    writer(file)
+    file.close()
+    return file.contents
+
+
+# A source is either a model, versioned by its row count and latest update, or the name of a setting
+def get_source_fingerprint(source, fingerprints: dict) -> str:
+    if source not in fingerprints:
+        if isinstance(source, str):
+            value = json.dumps(getattr(settings, source), sort_keys=True, default=str)
+            fingerprints[source] = f"{source}:{value}"
+        else:
+            values = source.objects.order_by().aggregate(count=Count("pk"), updated=Max("updated_at"))
+            fingerprints[source] = f"{source.__name__}:{values['count']}:{values['updated']}"
+
+    return fingerprints[source]
+
+
+def get_schedule_file(name: str, writer, sources, fingerprints: dict) -> bytes:
+    if not sources:
+        return render_schedule_file(writer)
+
+    fingerprint = hashlib.sha256(
+        "|".join(get_source_fingerprint(source, fingerprints) for source in sources).encode()
+    ).hexdigest()
+
+    cached = models.GTFSScheduleFile.objects.filter(name=name, fingerprint=fingerprint).first()
+    if cached:
+        return bytes(cached.content)
+
+    with metrics.measure(f"gtfs_schedule.{name}") as m:
+        content = render_schedule_file(writer)
+        m.rows = max(count_csv_records(content) - 1, 0)
+        m.bytes = len(content)
+    models.GTFSScheduleFile.objects.update_or_create(name=name, defaults={
+        "fingerprint": fingerprint,
+        "content": content,
+    })
+    return content
 
-    generate_schedule_html.delay()
+
+# Line breaks within quoted fields don't end a record, and quoted fields always have an even number of quotes
+def count_csv_records(content: bytes) -> int:
+    records = 0
+    quotes = 0
+    for line in content.split(b"\r\n")[:-1]:
+        quotes += line.count(b'"')
+        if quotes % 2 == 0:
+            records += 1
+    return records
 
 
 @shared_task(
@@ -147,7 +297,7 @@ def write_stops_file(file):
             })
 
 
-def write_routes_file(file, output_json: dict):
+def write_routes_file(file):
     with io.TextIOWrapper(file, encoding='utf-8', newline='') as text_file:
         csv_file = csv.DictWriter(text_file, fieldnames=[
             "route_id",
@@ -182,19 +332,22 @@ def write_routes_file(file, output_json: dict):
                 "continuous_drop_off": "",
                 "network_id": "",
             })
-            output_json["routes"].append({
-                "id": str(route.id),
-                "agency_id": settings.GTFS_CONFIG["agency"]["id"],
-                "name": route.name,
-                "desc": route.description,
-                "type": route.type,
-                "url": route.url,
-                "color": route.color,
-                "text_color": route.text_color,
-            })
 
 
-def write_trips_file(file):
+def build_routes_json():
+    return [{
+        "id": str(route.id),
+        "agency_id": settings.GTFS_CONFIG["agency"]["id"],
+        "name": route.name,
+        "desc": route.description,
+        "type": route.type,
+        "url": route.url,
+        "color": route.color,
+        "text_color": route.text_color,
+    } for route in models.Route.objects.all().order_by('order')]
+
+
+def write_trips_file(file, snapshot: TimetableSnapshot):
     with io.TextIOWrapper(file, encoding='utf-8', newline='') as text_file:
         csv_file = csv.DictWriter(text_file, fieldnames=[
             "route_id",
@@ -210,32 +363,55 @@ def write_trips_file(file):
         ])
         csv_file.writeheader()
 
-        blocks = {}
-
-        for journey in models.Journey.objects.filter(forms_from__isnull=True):
-            block_id = uuid.uuid4()
-            blocks[journey.id] = block_id
-
-        for journey in models.Journey.objects.filter(forms_from__isnull=False):
-            block_id = blocks[journey.forms_from.id]
-            blocks[journey.id] = block_id
+        blocks = resolve_blocks(snapshot.journeys)
 
-        for journey in models.Journey.objects.filter(public=True):
+        for journey in snapshot.public_journeys:
             csv_file.writerow({
-                "route_id": str(journey.route.id),
+                "route_id": str(journey.route_id) if journey.route_id else "",
                 "service_id": journey.date.isoformat(),
                 "trip_id": str(journey.id),
                 "trip_headsign": "",
                 "trip_short_name": journey.code,
                 "direction_id": str(journey.direction),
                 "block_id": str(blocks[journey.id]),
-                "shape_id": str(journey.shape.id) if journey.shape else "",
+                "shape_id": str(journey.shape_id) if journey.shape_id else "",
                 "wheelchair_accessible": "",
                 "bikes_allowed": ""
             })
 
 
-def write_stop_times_file(file):
+def resolve_blocks(journeys) -> dict:
+    forms_from = {journey.id: journey.forms_from_id for journey in journeys}
+    blocks = {}
+
+    for journey_id in forms_from:
+        path = []
+        on_path = set()
+        current = journey_id
+        while current not in blocks:
+            if current in on_path:
+                # forms_from loops back on itself, so the chain has no first journey
+                cycle = path[path.index(current):]
+                block_id = min(cycle)
+                for member in cycle:
+                    blocks[member] = block_id
+                break
+
+            path.append(current)
+            on_path.add(current)
+            previous = forms_from.get(current)
+            if previous is None or previous not in forms_from:
+                blocks[current] = current
+                break
+            current = previous
+
+        for member in path:
+            blocks.setdefault(member, blocks[current])
+
+    return blocks
+
+
+def write_stop_times_file(file, snapshot: TimetableSnapshot):
     with io.TextIOWrapper(file, encoding='utf-8', newline='') as text_file:
         csv_file = csv.DictWriter(text_file, fieldnames=[
             "trip_id",
@@ -253,8 +429,20 @@ def write_stop_times_file(file):
         ])
         csv_file.writeheader()
 
-        for journey in models.Journey.objects.filter(public=True):
-            for stop in journey.points.all():
+        shape_journeys = [
+            journey for journey in snapshot.public_journeys
+            if journey.shape_id and journey.id in snapshot.points
+        ]
+        stop_distances = dict(zip((journey.id for journey in shape_journeys), shapes.get_stop_distances([(
+            journey.shape_id,
+            [p.stop_id for p in snapshot.points[journey.id]],
+            [p.stop__latitude for p in snapshot.points[journey.id]],
+            [p.stop__longitude for p in snapshot.points[journey.id]],
+        ) for journey in shape_journeys])))
+
+        for journey in snapshot.public_journeys:
+            distances = stop_distances.get(journey.id)
+            for i, stop in enumerate(snapshot.points.get(journey.id, [])):
                 arrival_time = stop.arrival_time if stop.arrival_time else stop.departure_time
                 departure_time = stop.departure_time if stop.departure_time else stop.arrival_time
 
@@ -262,19 +450,19 @@ def write_stop_times_file(file):
                     "trip_id": str(journey.id),
                     "arrival_time": arrival_time.strftime("%H:%M:%S"),
                     "departure_time": departure_time.strftime("%H:%M:%S"),
-                    "stop_id": str(stop.stop.id),
+                    "stop_id": str(stop.stop_id),
                     "stop_sequence": str(stop.order),
                     "stop_headsign": "",
                     "pickup_type": "",
                     "drop_off_type": "",
                     "continuous_pickup": "",
                     "continuous_drop_off": "",
-                    "shape_dist_traveled": "",
-                    "timepoint": "1" if stop.journey else "0",
+                    "shape_dist_traveled": f"{distances[i]:.1f}" if distances else "",
+                    "timepoint": "1" if stop.timing_point else "0",
                 })
 
 
-def write_calendar_file(file):
+def write_calendar_file(file, snapshot: TimetableSnapshot):
     with io.TextIOWrapper(file, encoding='utf-8', newline='') as text_file:
         csv_file = csv.DictWriter(text_file, fieldnames=[
             "service_id",
@@ -291,7 +479,7 @@ def write_calendar_file(file):
         csv_file.writeheader()
 
         seen = set()
-        for journey in models.Journey.objects.filter(public=True):
+        for journey in snapshot.public_journeys:
             if journey.date in seen:
                 continue
 
@@ -321,13 +509,15 @@ def write_shapes_file(file):
         ])
         csv_file.writeheader()
 
-        for shape in models.ShapePoint.objects.all():
+        for shape in models.ShapePoint.objects.filter(
+                models.ShapePoint.detail_filter(settings.SHAPE_DETAIL["gtfs"])
+        ).order_by("shape_id", "order"):
             csv_file.writerow({
-                "shape_id": str(shape.shape.id),
+                "shape_id": str(shape.shape_id),
                 "shape_pt_lat": shape.latitude,
                 "shape_pt_lon": shape.longitude,
                 "shape_pt_sequence": str(shape.order),
-                "shape_dist_traveled": "",
+                "shape_dist_traveled": f"{shape.dist_traveled:.1f}" if shape.dist_traveled is not None else "",
             })
 
 
@@ -386,45 +576,31 @@ def write_timetables_file(file):
         ])
         csv_file.writeheader()
 
-        for route in models.Route.objects.all():
-            dates = route.journey_set.all().values('date').distinct().order_by('date')
-            for date in dates:
-                date = date["date"]
-                csv_file.writerow({
-                    "timetable_id": f"{route.id}-{date.isoformat()}-inbound",
-                    "route_id": str(route.id),
-                    "direction_id": "0",
-                    "start_date": date.strftime("%Y%m%d"),
-                    "end_date": date.strftime("%Y%m%d"),
-                    "monday": "1" if date.weekday() == 0 else "0",
-                    "tuesday": "1" if date.weekday() == 1 else "0",
-                    "wednesday": "1" if date.weekday() == 2 else "0",
-                    "thursday": "1" if date.weekday() == 3 else "0",
-                    "friday": "1" if date.weekday() == 4 else "0",
-                    "saturday": "1" if date.weekday() == 5 else "0",
-                    "sunday": "1" if date.weekday() == 6 else "0",
-                    "include_exceptions": "1",
-                    "timetable_label": f"Inbound - {date.isoformat()}",
-                    "service_notes": "",
-                    "direction_name": "Inbound",
-                    "orientation": "horizontal",
-                })
-                csv_file.writerow({
-                    "timetable_id": f"{route.id}-{date.isoformat()}-outbound",
-                    "route_id": str(route.id),
-                    "direction_id": "1",
-                    "start_date": date.strftime("%Y%m%d"),
-                    "end_date": date.strftime("%Y%m%d"),
-                    "monday": "1" if date.weekday() == 0 else "0",
-                    "tuesday": "1" if date.weekday() == 1 else "0",
-                    "wednesday": "1" if date.weekday() == 2 else "0",
-                    "thursday": "1" if date.weekday() == 3 else "0",
-                    "friday": "1" if date.weekday() == 4 else "0",
-                    "saturday": "1" if date.weekday() == 5 else "0",
-                    "sunday": "1" if date.weekday() == 6 else "0",
-                    "include_exceptions": "1",
-                    "timetable_label": f"Outbound - {date.isoformat()}",
-                    "service_notes": "",
-                    "direction_name": "Outbound",
-                    "orientation": "horizontal",
-                })
+        directions = dict(models.Journey.DIRECTIONS)
+        timetables = models.Journey.objects.filter(
+            public=True, route__isnull=False, direction__isnull=False
+        ).order_by("route__order", "route_id", "date", "direction").values_list(
+            "route_id", "direction", "date"
+        ).distinct()
+
+        for route_id, direction, date in timetables:
+            direction_name = directions[direction]
+            csv_file.writerow({
+                "timetable_id": f"{route_id}-{date.isoformat()}-{direction_name.lower()}",
+                "route_id": str(route_id),
+                "direction_id": str(direction),
+                "start_date": date.strftime("%Y%m%d"),
+                "end_date": date.strftime("%Y%m%d"),
+                "monday": "1" if date.weekday() == 0 else "0",
+                "tuesday": "1" if date.weekday() == 1 else "0",
+                "wednesday": "1" if date.weekday() == 2 else "0",
+                "thursday": "1" if date.weekday() == 3 else "0",
+                "friday": "1" if date.weekday() == 4 else "0",
+                "saturday": "1" if date.weekday() == 5 else "0",
+                "sunday": "1" if date.weekday() == 6 else "0",
+                "include_exceptions": "1",
+                "timetable_label": f"{direction_name} - {date.isoformat()}",
+                "service_notes": "",
+                "direction_name": direction_name,
+                "orientation": "horizontal",
+            })
@@ -0,0 +1,253 @@
+import datetime
+import functools
+import itertools
+import uuid
+import numpy as np
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from google.protobuf import message
+from .tracker_upload import tracker_upload_pb2
+from . import gtfs_rt_tasks
+from . import models
+from . import position_filter
+
+BATCH_SIZE = 1000
+
+# Fixed-point coordinates in uploads are in units of 10^-7 degrees
+COORDINATE_SCALE = 10_000_000
+# Range of upload timestamps, in Unix milliseconds, that can be stored (years 1 to 9999)
+MIN_TIMESTAMP = -62135596800000
+MAX_TIMESTAMP = 253402300799999
+EPOCH = datetime.datetime.fromtimestamp(0, tz=datetime.timezone.utc)
+# Running totals of upload deltas beyond this are rejected before they're summed as 64-bit integers
+SUM_LIMIT = 2 ** 62
+# Fixes further ahead of the server clock than this come from a tracker with a bad clock. Stored, they'd pin
+# the vehicle's current position and make every real fix after them look late.
+MAX_CLOCK_AHEAD = datetime.timedelta(minutes=5)
+
+
+def authenticate_tracker(key: str):
+    if not key:
+        return None
+
+    return models.TrackerKey.objects.filter(key=key, active=True).first()
+
+
+def parse_timestamp(value) -> datetime.datetime:
+    if isinstance(value, bool):
+        raise ValidationError("Invalid timestamp")
+
+    if isinstance(value, (int, float)):
+        try:
+            timestamp = datetime.datetime.fromtimestamp(value, tz=datetime.timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            raise ValidationError("Invalid timestamp")
+    elif isinstance(value, str):
+        try:
+            timestamp = parse_datetime(value)
+        except ValueError:
+            timestamp = None
+        if timestamp is None:
+            raise ValidationError("Invalid timestamp")
+        if timezone.is_naive(timestamp):
+            timestamp = timezone.make_aware(timestamp, datetime.timezone.utc)
+    else:
+        raise ValidationError("Invalid timestamp")
+
+    if timestamp > timezone.now() + MAX_CLOCK_AHEAD:
+        raise ValidationError("Timestamp is in the future")
+
+    return timestamp
+
+
+def parse_coordinate(value, limit: float) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValidationError("Invalid coordinate")
+
+    value = float(value)
+    if not -limit <= value <= limit:
+        raise ValidationError("Invalid coordinate")
+
+    return value
+
+
+# known_vehicles, if given, is a set of vehicle IDs already known to exist, updated with any found
+def parse_positions(data, tracker_key: models.TrackerKey, known_vehicles: set = None):
+    if not isinstance(data, list):
+        raise ValidationError("Positions must be a list")
+
+    fixes = []
+    for position in data:
+        if not isinstance(position, dict):
+            raise ValidationError("Invalid position")
+
+        if tracker_key.vehicle_id and "vehicle" not in position:
+            vehicle_id = tracker_key.vehicle_id
+        else:
+            try:
+                vehicle_id = uuid.UUID(str(position.get("vehicle")))
+            except ValueError:
+                raise ValidationError("Invalid vehicle ID")
+
+        fixes.append((
+            vehicle_id,
+            parse_timestamp(position.get("timestamp")),
+            parse_coordinate(position.get("latitude"), 90),
+            parse_coordinate(position.get("longitude"), 180),
+        ))
+
+    check_vehicles(set(f[0] for f in fixes), tracker_key, known_vehicles)
+    return fixes
+
+
+# Decodes a tracker-upload.proto PositionUpload into fixes without going through per-fix parsing
+def parse_upload(data: bytes, tracker_key: models.TrackerKey, known_vehicles: set = None):
+    upload = tracker_upload_pb2.PositionUpload()
+    try:
+        upload.ParseFromString(data)
+    except message.DecodeError:
+        raise ValidationError("Invalid protobuf")
+
+    # Batches are sent as they're recorded, so fixes from the future are dropped rather than failing the batch
+    latest_timestamp = (timezone.now() + MAX_CLOCK_AHEAD - EPOCH) // datetime.timedelta(milliseconds=1)
+    fixes = []
+    for track in upload.tracks:
+        if track.vehicle:
+            try:
+                vehicle_id = uuid.UUID(bytes=track.vehicle)
+            except ValueError:
+                raise ValidationError("Invalid vehicle ID")
+        elif tracker_key.vehicle_id:
+            vehicle_id = tracker_key.vehicle_id
+        else:
+            raise ValidationError("Invalid vehicle ID")
+
+        count = len(track.timestamp_deltas)
+        if len(track.latitude_deltas) != count or len(track.longitude_deltas) != count:
+            raise ValidationError("Every fix needs a timestamp and coordinates")
+        if not count:
+            continue
+
+        timestamps = cumulative_sum(track.base_timestamp, track.timestamp_deltas, "Invalid timestamp")
+        latitudes = cumulative_sum(0, track.latitude_deltas, "Invalid coordinate") / COORDINATE_SCALE
+        longitudes = cumulative_sum(0, track.longitude_deltas, "Invalid coordinate") / COORDINATE_SCALE
+        if (np.abs(latitudes) > 90).any() or (np.abs(longitudes) > 180).any():
+            raise ValidationError("Invalid coordinate")
+        if (timestamps < MIN_TIMESTAMP).any() or (timestamps > MAX_TIMESTAMP).any():
+            raise ValidationError("Invalid timestamp")
+
+        current = timestamps <= latest_timestamp
+        timestamps, latitudes, longitudes = timestamps[current], latitudes[current], longitudes[current]
+        fixes.extend(zip(
+            itertools.repeat(vehicle_id),
+            [EPOCH + datetime.timedelta(microseconds=t) for t in (timestamps * 1000).tolist()],
+            latitudes.tolist(),
+            longitudes.tolist(),
+        ))
+
+    check_vehicles(set(f[0] for f in fixes), tracker_key, known_vehicles)
+    return fixes
+
+
+# Each running total of the deltas from base. Totals are checked in floating point first, where they
+# can't wrap around, so huge deltas can't overflow back into a valid range.
+def cumulative_sum(base: int, deltas, error: str):
+    values = np.concatenate(([base], np.array(deltas, dtype=np.int64)))
+    if (np.abs(np.cumsum(values, dtype=np.float64)) > SUM_LIMIT).any():
+        raise ValidationError(error)
+    return np.cumsum(values)[1:]
+
+
+def check_vehicles(vehicle_ids: set, tracker_key: models.TrackerKey, known_vehicles: set = None):
+    if tracker_key.vehicle_id and vehicle_ids - {tracker_key.vehicle_id}:
+        raise ValidationError("This key may not report positions for other vehicles")
+
+    if known_vehicles is None:
+        known_vehicles = set()
+    unchecked = vehicle_ids - known_vehicles
+    if unchecked:
+        known_vehicles.update(models.Vehicle.objects.filter(id__in=unchecked).values_list("id", flat=True))
+    if vehicle_ids - known_vehicles:
+        raise ValidationError("Unknown vehicle")
+
+
+# Fixes are stored once per vehicle and timestamp, so replayed fixes are accepted but not stored again.
+# Jitter and outliers are accepted too, then dropped by the position filter.
+def store_positions(fixes) -> int:
+    if not fixes:
+        return 0
+
+    filtered, filter_states = position_filter.filter_fixes(fixes)
+    unique_fixes = {(f[0], f[1]): f for f in filtered}
+    with transaction.atomic():
+        # The filter carries on from these fixes only if they're stored
+        transaction.on_commit(functools.partial(position_filter.save_states, filter_states))
+        positions = models.VehiclePosition.objects.bulk_create([
+            models.VehiclePosition(
+                vehicle_id=vehicle_id,
+                timestamp=timestamp,
+                latitude=latitude,
+                longitude=longitude,
+            ) for vehicle_id, timestamp, latitude, longitude in unique_fixes.values()
+        ], batch_size=BATCH_SIZE, ignore_conflicts=True)
+        update_current_positions(positions)
+
+    return len(fixes)
+
+
+def update_current_positions(positions):
+    latest = {}
+    for position in positions:
+        current = latest.get(position.vehicle_id)
+        if not current or position.timestamp > current.timestamp:
+            latest[position.vehicle_id] = position
+
+    if not latest:
+        return
+
+    with transaction.atomic():
+        # Concurrent ingestion for the same vehicles waits here, so an older fix never replaces a newer one.
+        # Inserting positions has already taken a key share lock on their vehicles, which a plain FOR UPDATE
+        # would have to wait for, deadlocking two transactions that both inserted for the same vehicle.
+        list(models.Vehicle.objects.select_for_update(no_key=True).filter(
+            id__in=latest.keys()
+        ).order_by("id").values_list("id"))
+        existing = dict(models.VehicleCurrentPosition.objects.filter(
+            vehicle_id__in=latest.keys()
+        ).values_list("vehicle_id", "timestamp"))
+        latest = {
+            vehicle_id: position for vehicle_id, position in latest.items()
+            if vehicle_id not in existing or position.timestamp >= existing[vehicle_id]
+        }
+        if not latest:
+            return
+
+        # A replayed fix is current as first stored, not as given to the ignored insert
+        stored = {
+            (vehicle_id, timestamp): (position_id, latitude, longitude)
+            for position_id, vehicle_id, timestamp, latitude, longitude in models.VehiclePosition.objects.filter(
+                vehicle_id__in=latest.keys(), timestamp__in=[p.timestamp for p in latest.values()]
+            ).values_list("id", "vehicle_id", "timestamp", "latitude", "longitude")
+        }
+
+        current_positions = []
+        for vehicle_id, position in latest.items():
+            if (vehicle_id, position.timestamp) not in stored:
+                continue
+            position_id, latitude, longitude = stored[(vehicle_id, position.timestamp)]
+            current_positions.append(models.VehicleCurrentPosition(
+                vehicle_id=vehicle_id,
+                position_id=position_id,
+                timestamp=position.timestamp,
+                latitude=latitude,
+                longitude=longitude,
+            ))
+
+        models.VehicleCurrentPosition.objects.bulk_create(
+            current_positions, update_conflicts=True, unique_fields=["vehicle"],
+            update_fields=["position", "timestamp", "latitude", "longitude", "updated_at"],
+        )
+        if current_positions:
+            gtfs_rt_tasks.request_gtfs_rt()
@@ -0,0 +1,33 @@
+import json
+from django.core.management.base import BaseCommand
+from tracking import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic network, time building the GTFS and GTFS-RT feeds from it, then roll it back. "
+        "Only run against a database you can afford to load."
+    )
+
+    def add_arguments(self, parser):
+        for name, default in benchmark.DEFAULT_SIZES.items():
+            parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default, dest=name)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="File to write JSON results to, standard output if not given")
+
+    def handle(self, *args, **options):
+        sizes = {name: options[name] for name in benchmark.DEFAULT_SIZES}
+        results = benchmark.Benchmark(sizes, repeat=options["repeat"], seed=options["seed"]).run()
+
+        if not options["output"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        with open(options["output"], "w") as f:
+            json.dump(results, f, indent=2)
+
+        for name, stage in results["stages"].items():
+            seconds = f"{stage['median_seconds'] * 1000:10.1f} ms" if stage["median_seconds"] is not None else ""
+            memory = f"{stage['peak_memory_bytes'] / 1024 / 1024:8.1f} MiB" if stage["peak_memory_bytes"] else ""
+            self.stdout.write(f"{name:36} {seconds:>13} {stage['queries']:6} queries {memory}")
@@ -0,0 +1,23 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from tracking import shape_import
+
+
+class Command(BaseCommand):
+    help = "Import shapes from KML, GPX or GeoJSON files"
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="+")
+
+    def handle(self, *args, **options):
+        for path in options["files"]:
+            try:
+                with open(path, "rb") as file:
+                    shapes = shape_import.import_shapes(file)
+            except OSError as e:
+                raise CommandError(f"{path}: {e}")
+            except ValidationError as e:
+                raise CommandError(f"{path}: {e.message}")
+
+            for shape in shapes:
+                self.stdout.write(f"{path}: imported {shape.name} ({shape.points.count()} points)")
@@ -0,0 +1,148 @@
+import contextlib
+import logging
+import threading
+import time
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from . import models
+
+logger = logging.getLogger(__name__)
+_local = threading.local()
+# Fields added to for each run, and those holding the last successful run
+TOTAL_FIELDS = ("runs", "failures", "seconds", "queries", "rows", "bytes")
+LAST_FIELDS = ("last_seconds", "last_queries", "last_rows", "last_bytes", "last_success_at", "last_failure_at")
+
+
+class Measurement:
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        self.queries = 0
+        self.rows = None
+        self.bytes = None
+        self.failed = False
+        # Set by callers when the run turned out to have nothing to do, so it isn't counted
+        self.skipped = False
+        self.finished_at = None
+
+    def count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+# Measures the duration and database queries of a block. Callers can set rows and bytes on the
+# measurement. Measurements are kept in memory until the outermost block finishes, then stored in
+# one go so they add no queries to what they measure.
+@contextlib.contextmanager
+def measure(name: str):
+    pending = getattr(_local, "pending", None)
+    outermost = pending is None
+    if outermost:
+        pending = _local.pending = []
+
+    measurement = Measurement(name)
+    start = time.perf_counter()
+    try:
+        with connection.execute_wrapper(measurement.count_query):
+            yield measurement
+    except BaseException:
+        measurement.failed = True
+        raise
+    finally:
+        measurement.seconds = time.perf_counter() - start
+        measurement.finished_at = timezone.now()
+        pending.append(measurement)
+        if outermost:
+            _local.pending = None
+            # Nothing can be stored until a failed transaction has been rolled back
+            if not connection.needs_rollback:
+                # Failing to store metrics mustn't fail, or replace the exception of, what was measured
+                try:
+                    with transaction.atomic():
+                        record(pending)
+                except Exception:
+                    logger.exception("Failed to record stage metrics")
+
+
+def record(measurements):
+    totals = {}
+    lasts = {}
+    for m in measurements:
+        if m.skipped:
+            continue
+
+        total = totals.setdefault(m.name, dict.fromkeys(TOTAL_FIELDS, 0))
+        last = lasts.setdefault(m.name, {})
+        if m.failed:
+            total["failures"] += 1
+            last["last_failure_at"] = m.finished_at
+            continue
+
+        total["runs"] += 1
+        total["seconds"] += m.seconds
+        total["queries"] += m.queries
+        total["rows"] += m.rows or 0
+        total["bytes"] += m.bytes or 0
+        last.update(
+            last_seconds=m.seconds,
+            last_queries=m.queries,
+            last_rows=m.rows,
+            last_bytes=m.bytes,
+            last_success_at=m.finished_at,
+        )
+
+    if not totals:
+        return
+
+    models.StageMetrics.objects.bulk_create([
+        models.StageMetrics(name=name) for name in totals
+    ], ignore_conflicts=True)
+
+    # Every stage is updated in one query, adding to the stored totals
+    models.StageMetrics.objects.bulk_update([
+        models.StageMetrics(
+            name=name,
+            **{field: F(field) + value for field, value in total.items()},
+            **{field: lasts[name].get(field, F(field)) for field in LAST_FIELDS},
+        ) for name, total in totals.items()
+    ], TOTAL_FIELDS + LAST_FIELDS)
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+METRICS = (
+    ("tracker_stage_runs_total", "counter", "Successful runs of the stage", lambda m, now: m.runs),
+    ("tracker_stage_failures_total", "counter", "Failed runs of the stage", lambda m, now: m.failures),
+    ("tracker_stage_duration_seconds_total", "counter", "Time spent in successful runs", lambda m, now: m.seconds),
+    ("tracker_stage_queries_total", "counter", "Database queries made by successful runs", lambda m, now: m.queries),
+    ("tracker_stage_rows_total", "counter", "Rows or entities emitted by successful runs", lambda m, now: m.rows),
+    ("tracker_stage_bytes_total", "counter", "Bytes output by successful runs", lambda m, now: m.bytes),
+    ("tracker_stage_last_duration_seconds", "gauge", "Duration of the last successful run",
+     lambda m, now: m.last_seconds),
+    ("tracker_stage_last_queries", "gauge", "Database queries made by the last successful run",
+     lambda m, now: m.last_queries),
+    ("tracker_stage_last_rows", "gauge", "Rows or entities emitted by the last successful run",
+     lambda m, now: m.last_rows),
+    ("tracker_stage_last_bytes", "gauge", "Bytes output by the last successful run", lambda m, now: m.last_bytes),
+    ("tracker_stage_last_success_age_seconds", "gauge", "Seconds since the last successful run finished",
+     lambda m, now: (now - m.last_success_at).total_seconds() if m.last_success_at else None),
+)
+
+
+def render_prometheus(now=None) -> str:
+    now = now or timezone.now()
+    stages = list(models.StageMetrics.objects.order_by("name"))
+
+    lines = []
+    for metric, metric_type, description, value in METRICS:
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        for stage in stages:
+            v = value(stage, now)
+            if v is not None:
+                lines.append(f"{metric}{{stage=\"{escape_label(stage.name)}\"}} {v}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:16
+
+import django.db.models.deletion
+import tracking.models
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracking", "0008_servicealert_cause_servicealert_effect"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrackerKey",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+                (
+                    "key",
+                    models.CharField(
+                        default=tracking.models.generate_tracker_key,
+                        max_length=255,
+                        unique=True,
+                    ),
+                ),
+                ("active", models.BooleanField(blank=True, default=True)),
+                (
+                    "vehicle",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="If set, this key may only report positions for this vehicle",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tracker_keys",
+                        to="tracking.vehicle",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_current_positions(apps, schema_editor):
+    Vehicle = apps.get_model("tracking", "Vehicle")
+    VehiclePosition = apps.get_model("tracking", "VehiclePosition")
+    VehicleCurrentPosition = apps.get_model("tracking", "VehicleCurrentPosition")
+
+    for vehicle in Vehicle.objects.all():
+        position = VehiclePosition.objects.filter(vehicle=vehicle).order_by("-timestamp").first()
+        if position:
+            VehicleCurrentPosition.objects.create(
+                vehicle=vehicle,
+                position=position,
+                timestamp=position.timestamp,
+                latitude=position.latitude,
+                longitude=position.longitude,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracking", "0009_trackerkey"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VehicleCurrentPosition",
+            fields=[
+                (
+                    "vehicle",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="current_position",
+                        serialize=False,
+                        to="tracking.vehicle",
+                    ),
+                ),
+                ("timestamp", models.DateTimeField(db_index=True)),
+                ("latitude", models.FloatField()),
+                ("longitude", models.FloatField()),
+                (
+                    "position",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="tracking.vehicleposition",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(populate_current_positions, migrations.RunPython.noop),
+    ]
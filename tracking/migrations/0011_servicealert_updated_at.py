@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracking", "0010_vehiclecurrentposition"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="servicealert",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
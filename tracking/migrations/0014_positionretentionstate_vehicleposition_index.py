@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracking", "0013_gtfsschedulefile_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PositionRetentionState",
+            fields=[
+                (
+                    "id",
+                    models.PositiveSmallIntegerField(
+                        default=1, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("downsampled_until", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="vehicleposition",
+            index=models.Index(
+                fields=["vehicle", "timestamp"], name="tracking_ve_vehicle_34337d_idx"
+            ),
+        ),
+    ]
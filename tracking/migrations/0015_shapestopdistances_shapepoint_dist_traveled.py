@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:25
+
+import django.db.models.deletion
+import numpy as np
+import uuid
+from django.db import migrations, models
+
+# Copied from tracking.geo as it was when this migration was written, so later changes there don't
+# change what this migration does
+EARTH_RADIUS = 6371008.8
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def cumulative_distances(latitudes, longitudes):
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    distances = np.zeros(len(latitudes), dtype=np.float64)
+    if len(latitudes) > 1:
+        np.cumsum(haversine(latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:]), out=distances[1:])
+    return distances
+
+
+def populate_distances(apps, schema_editor):
+    Shape = apps.get_model("tracking", "Shape")
+    ShapePoint = apps.get_model("tracking", "ShapePoint")
+    GTFSScheduleFile = apps.get_model("tracking", "GTFSScheduleFile")
+
+    for shape in Shape.objects.all():
+        points = list(ShapePoint.objects.filter(shape=shape).order_by("order"))
+        distances = cumulative_distances([p.latitude for p in points], [p.longitude for p in points])
+        for point, distance in zip(points, distances):
+            point.dist_traveled = float(distance)
+        ShapePoint.objects.bulk_update(points, ["dist_traveled"], batch_size=1000)
+
+    # Cached shapes.txt and stop_times.txt were rendered without distances
+    GTFSScheduleFile.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracking", "0014_positionretentionstate_vehicleposition_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="shapepoint",
+            name="dist_traveled",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name="ShapeStopDistances",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                ("pattern", models.CharField(max_length=64)),
+                ("distances", models.JSONField()),
+                (
+                    "shape",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stop_distances",
+                        to="tracking.shape",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("shape", "pattern")},
+            },
+        ),
+        migrations.RunPython(populate_distances, migrations.RunPython.noop),
+    ]
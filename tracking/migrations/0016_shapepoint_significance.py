@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:26
+
+import numpy as np
+from django.db import migrations, models
+
+# Copied from tracking.geo as it was when this migration was written, so later changes there don't
+# change what this migration does
+EARTH_RADIUS = 6371008.8
+
+
+def douglas_peucker_significance(latitudes, longitudes):
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    significance = np.zeros(len(latitudes), dtype=np.float64)
+    if len(latitudes) == 0:
+        return significance
+
+    significance[0] = significance[-1] = np.inf
+    if len(latitudes) < 3:
+        return significance
+
+    # Local equirectangular projection, accurate enough over the extent of a route
+    scale = np.cos(np.radians(np.mean(latitudes)))
+    x = np.radians(longitudes) * scale * EARTH_RADIUS
+    y = np.radians(latitudes) * EARTH_RADIUS
+    stack = [(0, len(latitudes) - 1, np.inf)]
+    while stack:
+        first, last, parent = stack.pop()
+        if last - first < 2:
+            continue
+
+        px, py = x[first + 1:last], y[first + 1:last]
+        dx, dy = x[last] - x[first], y[last] - y[first]
+        length_squared = dx ** 2 + dy ** 2
+        if length_squared == 0:
+            distances = np.hypot(px - x[first], py - y[first])
+        else:
+            t = np.clip(((px - x[first]) * dx + (py - y[first]) * dy) / length_squared, 0, 1)
+            distances = np.hypot(px - (x[first] + t * dx), py - (y[first] + t * dy))
+
+        split = first + 1 + int(np.argmax(distances))
+        # A point can't outlive the point whose split exposed it
+        value = min(float(distances[split - first - 1]), parent)
+        significance[split] = value
+        stack.append((first, split, value))
+        stack.append((split, last, value))
+
+    return significance
+
+
+def populate_significance(apps, schema_editor):
+    Shape = apps.get_model("tracking", "Shape")
+    ShapePoint = apps.get_model("tracking", "ShapePoint")
+    GTFSScheduleFile = apps.get_model("tracking", "GTFSScheduleFile")
+    ShapeStopDistances = apps.get_model("tracking", "ShapeStopDistances")
+
+    for shape in Shape.objects.all():
+        points = list(ShapePoint.objects.filter(shape=shape).order_by("order"))
+        significance = douglas_peucker_significance(
+            [p.latitude for p in points], [p.longitude for p in points]
+        )
+        for point, point_significance in zip(points, significance):
+            point.significance = float(point_significance) if point_significance != float("inf") else None
+        ShapePoint.objects.bulk_update(points, ["significance"], batch_size=1000)
+
+    # Cached shapes.txt and stop distances were computed from unsimplified shapes
+    GTFSScheduleFile.objects.all().delete()
+    ShapeStopDistances.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracking", "0015_shapestopdistances_shapepoint_dist_traveled"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="shapepoint",
+            name="significance",
+            field=models.FloatField(
+                blank=True,
+                editable=False,
+                help_text="Largest simplification tolerance in metres this point survives, empty if always kept",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(populate_significance, migrations.RunPython.noop),
+    ]
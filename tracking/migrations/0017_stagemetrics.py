@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracking", "0016_shapepoint_significance"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StageMetrics",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ("runs", models.PositiveBigIntegerField(default=0)),
+                ("failures", models.PositiveBigIntegerField(default=0)),
+                ("seconds", models.FloatField(default=0)),
+                ("queries", models.PositiveBigIntegerField(default=0)),
+                ("rows", models.PositiveBigIntegerField(default=0)),
+                ("bytes", models.PositiveBigIntegerField(default=0)),
+                ("last_seconds", models.FloatField(blank=True, null=True)),
+                ("last_queries", models.PositiveIntegerField(blank=True, null=True)),
+                ("last_rows", models.PositiveBigIntegerField(blank=True, null=True)),
+                ("last_bytes", models.PositiveBigIntegerField(blank=True, null=True)),
+                ("last_success_at", models.DateTimeField(blank=True, null=True)),
+                ("last_failure_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name_plural": "stage metrics",
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:44
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def remove_duplicate_positions(apps, schema_editor):
+    VehiclePosition = apps.get_model("tracking", "VehiclePosition")
+    VehicleCurrentPosition = apps.get_model("tracking", "VehicleCurrentPosition")
+
+    current = set(VehicleCurrentPosition.objects.values_list("position_id", flat=True))
+    duplicates = list(VehiclePosition.objects.values("vehicle", "timestamp").annotate(
+        count=Count("id")
+    ).filter(count__gt=1))
+
+    for duplicate in duplicates:
+        ids = list(VehiclePosition.objects.filter(
+            vehicle=duplicate["vehicle"], timestamp=duplicate["timestamp"]
+        ).values_list("id", flat=True))
+        # Deleting a vehicle's current position would also delete the current position record
+        keep = next((i for i in ids if i in current), ids[0])
+        VehiclePosition.objects.filter(id__in=[i for i in ids if i != keep]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracking", "0017_stagemetrics"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_positions, migrations.RunPython.noop),
+    ]
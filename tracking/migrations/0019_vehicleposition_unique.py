@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:44
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracking", "0018_remove_duplicate_positions"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="vehicleposition",
+            name="tracking_ve_vehicle_34337d_idx",
+        ),
+        migrations.AlterUniqueTogether(
+            name="vehicleposition",
+            unique_together={("vehicle", "timestamp")},
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracking", "0019_vehicleposition_unique"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="vehicleposition",
+            options={"ordering": ["-timestamp"]},
+        ),
+    ]
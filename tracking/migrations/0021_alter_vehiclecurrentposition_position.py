@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracking", "0020_alter_vehicleposition_options"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="vehiclecurrentposition",
+            name="position",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="tracking.vehicleposition",
+            ),
+        ),
+    ]
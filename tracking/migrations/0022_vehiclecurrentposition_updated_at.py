@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracking", "0021_alter_vehiclecurrentposition_position"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vehiclecurrentposition",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
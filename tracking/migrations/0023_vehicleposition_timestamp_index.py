@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracking", "0022_vehiclecurrentposition_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="vehicleposition",
+            index=models.Index(
+                fields=["timestamp"], name="tracking_ve_timesta_f0fb67_idx"
+            ),
+        ),
+    ]
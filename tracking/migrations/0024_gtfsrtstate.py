@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracking", "0023_vehicleposition_timestamp_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GTFSRTState",
+            fields=[
+                (
+                    "id",
+                    models.PositiveSmallIntegerField(
+                        default=1, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("queued_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
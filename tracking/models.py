@@ -1,7 +1,9 @@
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 from colorfield.fields import ColorField
 from .gtfs_rt import gtfs_realtime_pb2
+import secrets
 import uuid
 
 
@@ -14,6 +16,7 @@ class Stop(models.Model):
     longitude = models.FloatField()
     internal = models.BooleanField(default=False, blank=True)
     url = models.URLField(blank=True, null=True, verbose_name="URL")
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         if self.code:
@@ -24,7 +27,7 @@ class Stop(models.Model):
     def save(self, *args, **kwargs):
         from . import gtfs_tasks
         super().save(*args, **kwargs)
-        gtfs_tasks.generate_gtfs_schedule.delay()
+        gtfs_tasks.request_gtfs_schedule()
 
 
 class Route(models.Model):
@@ -60,6 +63,7 @@ class Route(models.Model):
     color = ColorField(blank=True, null=True)
     text_color = ColorField(blank=True, null=True)
     order = models.PositiveIntegerField(default=0, blank=True, null=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -70,7 +74,7 @@ class Route(models.Model):
     def save(self, *args, **kwargs):
         from . import gtfs_tasks
         super().save(*args, **kwargs)
-        gtfs_tasks.generate_gtfs_schedule.delay()
+        gtfs_tasks.request_gtfs_schedule()
 
 
 class Vehicle(models.Model):
@@ -94,6 +98,50 @@ class VehiclePosition(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        unique_together = ['vehicle', 'timestamp']
+        # Retention deletes and downsamples by timestamp across all vehicles
+        indexes = [models.Index(fields=['timestamp'])]
+
+    def save(self, *args, **kwargs):
+        from . import ingest
+        super().save(*args, **kwargs)
+        ingest.update_current_positions([self])
+
+
+class VehicleCurrentPosition(models.Model):
+    vehicle = models.OneToOneField(
+        Vehicle, on_delete=models.CASCADE, primary_key=True, related_name="current_position"
+    )
+    # Null once the history row it was copied from is deleted, after which it isn't published
+    position = models.ForeignKey(
+        VehiclePosition, on_delete=models.SET_NULL, blank=True, null=True, related_name="+"
+    )
+    timestamp = models.DateTimeField(db_index=True)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    # Changes on every update, whatever the timestamp, so the GTFS-RT feed knows to rebuild
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.vehicle} - {self.timestamp}"
+
+
+def generate_tracker_key():
+    return secrets.token_urlsafe(32)
+
+
+class TrackerKey(models.Model):
+    id = models.UUIDField(primary_key=True, editable=False, unique=True, default=uuid.uuid4)
+    name = models.CharField(max_length=255)
+    key = models.CharField(max_length=255, unique=True, default=generate_tracker_key)
+    vehicle = models.ForeignKey(
+        Vehicle, on_delete=models.CASCADE, blank=True, null=True, related_name="tracker_keys",
+        help_text="If set, this key may only report positions for this vehicle"
+    )
+    active = models.BooleanField(default=True, blank=True)
+
+    def __str__(self):
+        return self.name
 
 
 class Journey(models.Model):
@@ -116,6 +164,7 @@ class Journey(models.Model):
         "Journey", on_delete=models.SET_NULL, blank=True, null=True, related_name="forms_to"
     )
     shape = models.ForeignKey("Shape", on_delete=models.SET_NULL, blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         if self.route:
@@ -130,7 +179,7 @@ class Journey(models.Model):
     def save(self, *args, **kwargs):
         from . import gtfs_tasks
         super().save(*args, **kwargs)
-        gtfs_tasks.generate_gtfs_schedule.delay()
+        gtfs_tasks.request_gtfs_schedule()
 
 
 class JourneyPoint(models.Model):
@@ -141,6 +190,7 @@ class JourneyPoint(models.Model):
     departure_time = models.TimeField(blank=True, null=True)
     timing_point = models.BooleanField(default=True, blank=True)
     order = models.PositiveIntegerField(default=0, blank=True, null=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.journey.code} - {self.stop}: arr {self.arrival_time} dep {self.departure_time}"
@@ -156,15 +206,36 @@ class JourneyPoint(models.Model):
 class Shape(models.Model):
     id = models.UUIDField(primary_key=True, editable=False, unique=True, default=uuid.uuid4)
     name = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def save(self, *args, **kwargs):
         from . import gtfs_tasks
         super().save(*args, **kwargs)
-        gtfs_tasks.generate_gtfs_schedule.delay()
+        gtfs_tasks.request_gtfs_schedule()
 
     def __str__(self):
         return self.name
 
+    def update_geometry(self):
+        from . import geo
+        points = list(self.points.order_by("order"))
+        latitudes = [p.latitude for p in points]
+        longitudes = [p.longitude for p in points]
+        distances = geo.cumulative_distances(latitudes, longitudes)
+        significance = geo.douglas_peucker_significance(latitudes, longitudes)
+        now = timezone.now()
+        for point, distance, point_significance in zip(points, distances, significance):
+            point.dist_traveled = float(distance)
+            point.significance = float(point_significance) if point_significance != float("inf") else None
+            # bulk_update doesn't apply auto_now, and cached schedule files are keyed on updated_at
+            point.updated_at = now
+
+        ShapePoint.objects.bulk_update(points, ["dist_traveled", "significance", "updated_at"], batch_size=1000)
+        self.stop_distances.all().delete()
+
+    def simplified_points(self, tolerance: float):
+        return self.points.filter(ShapePoint.detail_filter(tolerance))
+
 
 class ShapePoint(models.Model):
     id = models.UUIDField(primary_key=True, editable=False, unique=True, default=uuid.uuid4)
@@ -172,10 +243,30 @@ class ShapePoint(models.Model):
     latitude = models.FloatField()
     longitude = models.FloatField()
     order = models.PositiveIntegerField(default=0, blank=True, null=False)
+    dist_traveled = models.FloatField(blank=True, null=True, editable=False)
+    significance = models.FloatField(
+        blank=True, null=True, editable=False,
+        help_text="Largest simplification tolerance in metres this point survives, empty if always kept"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order']
 
+    @staticmethod
+    def detail_filter(tolerance: float):
+        return models.Q(significance__isnull=True) | models.Q(significance__gt=tolerance)
+
+
+class ShapeStopDistances(models.Model):
+    id = models.UUIDField(primary_key=True, editable=False, unique=True, default=uuid.uuid4)
+    shape = models.ForeignKey(Shape, on_delete=models.CASCADE, related_name="stop_distances")
+    pattern = models.CharField(max_length=64)
+    distances = models.JSONField()
+
+    class Meta:
+        unique_together = ['shape', 'pattern']
+
 
 class ServiceAlert(models.Model):
     CAUSES = (
@@ -218,6 +309,7 @@ class ServiceAlert(models.Model):
     severity = models.PositiveSmallIntegerField(choices=SEVERITIES, blank=True, null=True)
     cause = models.PositiveSmallIntegerField(choices=CAUSES, blank=True, null=True)
     effect = models.PositiveSmallIntegerField(choices=EFFECTS, blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.header
@@ -236,3 +328,49 @@ class ServiceAlertSelector(models.Model):
     route = models.ForeignKey(Route, on_delete=models.CASCADE, blank=True, null=True)
     journey = models.ForeignKey(Journey, on_delete=models.CASCADE, blank=True, null=True)
     stop = models.ForeignKey(Stop, on_delete=models.CASCADE, blank=True, null=True)
+
+
+class GTFSScheduleState(models.Model):
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1, editable=False)
+    requested_at = models.DateTimeField(blank=True, null=True)
+    queued_at = models.DateTimeField(blank=True, null=True)
+    running_since = models.DateTimeField(blank=True, null=True)
+
+
+# A GTFS-RT build queued by incoming positions, so only one waits at a time
+class GTFSRTState(models.Model):
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1, editable=False)
+    queued_at = models.DateTimeField(blank=True, null=True)
+
+
+class GTFSScheduleFile(models.Model):
+    name = models.CharField(max_length=255, primary_key=True)
+    fingerprint = models.CharField(max_length=64)
+    content = models.BinaryField()
+
+
+class StageMetrics(models.Model):
+    name = models.CharField(max_length=255, primary_key=True)
+    runs = models.PositiveBigIntegerField(default=0)
+    failures = models.PositiveBigIntegerField(default=0)
+    seconds = models.FloatField(default=0)
+    queries = models.PositiveBigIntegerField(default=0)
+    rows = models.PositiveBigIntegerField(default=0)
+    bytes = models.PositiveBigIntegerField(default=0)
+    last_seconds = models.FloatField(blank=True, null=True)
+    last_queries = models.PositiveIntegerField(blank=True, null=True)
+    last_rows = models.PositiveBigIntegerField(blank=True, null=True)
+    last_bytes = models.PositiveBigIntegerField(blank=True, null=True)
+    last_success_at = models.DateTimeField(blank=True, null=True)
+    last_failure_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name_plural = "stage metrics"
+
+    def __str__(self):
+        return self.name
+
+
+class PositionRetentionState(models.Model):
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1, editable=False)
+    downsampled_until = models.DateTimeField(blank=True, null=True)
@@ -0,0 +1,136 @@
+import copy
+import math
+import threading
+from django.conf import settings
+from .geo import EARTH_RADIUS
+
+_lock = threading.Lock()
+_vehicles = {}
+
+
+# Constant velocity Kalman filter along one axis, in metres
+class AxisFilter:
+    def __init__(self, position: float, noise: float):
+        self.position = position
+        self.velocity = 0.0
+        # Covariance of position and velocity; nothing is known about the velocity yet
+        self.pp = noise ** 2
+        self.pv = 0.0
+        self.vv = 100.0
+
+    def update(self, position: float, dt: float, noise: float, acceleration: float):
+        q = acceleration ** 2
+        self.position += self.velocity * dt
+        self.pp += 2 * self.pv * dt + self.vv * dt ** 2 + q * dt ** 4 / 4
+        self.pv += self.vv * dt + q * dt ** 3 / 2
+        self.vv += q * dt ** 2
+
+        innovation = position - self.position
+        s = self.pp + noise ** 2
+        kp = self.pp / s
+        kv = self.pv / s
+        self.position += kp * innovation
+        self.velocity += kv * innovation
+        self.vv -= kv * self.pv
+        self.pv *= 1 - kp
+        self.pp *= 1 - kp
+        return self.position
+
+
+class VehicleState:
+    def __init__(self, timestamp, latitude: float, longitude: float):
+        # Positions are worked with in metres on a plane touching the earth at the vehicle's first fix
+        self.origin = (latitude, longitude)
+        self.scale = math.cos(math.radians(latitude))
+        self.timestamp = timestamp
+        self.position = self.to_metres(latitude, longitude)
+        self.rejected = 0
+        self.stored_timestamp = None
+        self.stored_position = None
+        self.smoothing = None
+
+    def to_metres(self, latitude: float, longitude: float):
+        return (
+            math.radians(longitude - self.origin[1]) * EARTH_RADIUS * self.scale,
+            math.radians(latitude - self.origin[0]) * EARTH_RADIUS,
+        )
+
+    def to_degrees(self, x: float, y: float):
+        return (
+            self.origin[0] + math.degrees(y / EARTH_RADIUS),
+            self.origin[1] + math.degrees(x / (EARTH_RADIUS * self.scale)),
+        )
+
+
+# Drops fixes that are GPS jitter of a stationary vehicle or imply an impossible speed, and optionally
+# smooths the rest. Fixes older than the latest seen for their vehicle are history arriving late, and are
+# passed through untouched. Returns the fixes to store and the new state of each vehicle, which is only
+# kept by save_states once the fixes have been stored.
+def filter_fixes(fixes):
+    config = settings.POSITION_FILTER
+    output = []
+    states = {}
+    with _lock:
+        for vehicle_id, timestamp, latitude, longitude in sorted(fixes, key=lambda f: f[1]):
+            if vehicle_id not in states:
+                states[vehicle_id] = copy.deepcopy(_vehicles.get(vehicle_id))
+
+            state = states[vehicle_id]
+            if state and timestamp <= state.timestamp:
+                output.append((vehicle_id, timestamp, latitude, longitude))
+                continue
+            if not state:
+                state = states[vehicle_id] = VehicleState(timestamp, latitude, longitude)
+
+            fix = filter_fix(state, vehicle_id, timestamp, latitude, longitude, config)
+            if fix:
+                output.append(fix)
+
+    return output, {vehicle_id: state for vehicle_id, state in states.items() if state}
+
+
+def save_states(states: dict):
+    with _lock:
+        for vehicle_id, state in states.items():
+            # Another batch may have been stored since this one was filtered
+            current = _vehicles.get(vehicle_id)
+            if not current or state.timestamp >= current.timestamp:
+                _vehicles[vehicle_id] = state
+
+
+def filter_fix(state: VehicleState, vehicle_id, timestamp, latitude: float, longitude: float, config: dict):
+    dt = (timestamp - state.timestamp).total_seconds()
+    position = state.to_metres(latitude, longitude)
+    if dt and config["max_speed"] is not None and math.dist(position, state.position) / dt > config["max_speed"]:
+        if state.rejected < config["max_rejections"]:
+            state.rejected += 1
+            return None
+        # Rejecting this many fixes in a row means the vehicle really is somewhere else
+        state.smoothing = None
+
+    state.rejected = 0
+    state.timestamp = timestamp
+    state.position = position
+
+    if config["smoothing"]:
+        noise = config["smoothing"]["noise"]
+        acceleration = config["smoothing"]["acceleration"]
+        if not state.smoothing:
+            state.smoothing = (AxisFilter(position[0], noise), AxisFilter(position[1], noise))
+        else:
+            position = (
+                state.smoothing[0].update(position[0], dt, noise, acceleration),
+                state.smoothing[1].update(position[1], dt, noise, acceleration),
+            )
+            latitude, longitude = state.to_degrees(*position)
+
+    if (
+            state.stored_position and config["stationary_distance"]
+            and math.dist(position, state.stored_position) < config["stationary_distance"]
+            and (timestamp - state.stored_timestamp).total_seconds() < config["heartbeat"]
+    ):
+        return None
+
+    state.stored_timestamp = timestamp
+    state.stored_position = position
+    return vehicle_id, timestamp, latitude, longitude
@@ -0,0 +1,103 @@
+import datetime
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+from celery import shared_task
+from . import models
+
+BATCH_SIZE = 1000
+# Buckets of history downsampled per transaction
+BUCKETS_PER_SLICE = 60
+
+
+@shared_task(ignore_result=True)
+def prune_vehicle_positions():
+    now = timezone.now()
+    config = settings.POSITION_RETENTION
+
+    if config["max_age"] is not None:
+        delete_positions_before(now - timezone.timedelta(seconds=config["max_age"]))
+
+    downsample_positions_before(
+        now - timezone.timedelta(seconds=config["full_resolution"]),
+        config["downsample_interval"],
+        timezone.timedelta(seconds=config["late_fixes"]),
+    )
+
+
+# Current positions older than the cutoff expire along with their history
+def delete_positions_before(cutoff):
+    models.VehicleCurrentPosition.objects.filter(timestamp__lt=cutoff).delete()
+
+    while True:
+        ids = list(models.VehiclePosition.objects.filter(
+            timestamp__lt=cutoff
+        ).order_by().values_list("id", flat=True)[:BATCH_SIZE])
+        if not ids:
+            return
+
+        models.VehiclePosition.objects.filter(id__in=ids).delete()
+
+
+def get_retention_state():
+    state, _ = models.PositionRetentionState.objects.select_for_update().get_or_create(id=1)
+    return state
+
+
+def align_timestamp(timestamp, interval: int):
+    seconds = int(timestamp.timestamp()) // interval * interval
+    return datetime.datetime.fromtimestamp(seconds, tz=datetime.timezone.utc)
+
+
+# Fixes can arrive after history up to their timestamp has been downsampled, so each run goes back over
+# the last late_window of already downsampled history as well as downsampling newer history
+def downsample_positions_before(until, interval: int, late_window):
+    until = align_timestamp(until, interval)
+    slice_length = timezone.timedelta(seconds=interval * BUCKETS_PER_SLICE)
+
+    start = None
+    while True:
+        with transaction.atomic():
+            state = get_retention_state()
+            if start is None:
+                start = state.downsampled_until
+                if start is None:
+                    start = models.VehiclePosition.objects.order_by().aggregate(start=Min("timestamp"))["start"]
+                    if start is None:
+                        return
+                else:
+                    start -= late_window
+                start = align_timestamp(start, interval)
+
+            if start >= until:
+                return
+
+            end = min(start + slice_length, until)
+            downsample_positions(start, end, interval)
+
+            if not state.downsampled_until or end > state.downsampled_until:
+                state.downsampled_until = end
+                state.save()
+
+        start = end
+
+
+def downsample_positions(start, end, interval: int):
+    # Keep the last fix of each vehicle in each bucket, so a vehicle's newest fix is never removed
+    positions = models.VehiclePosition.objects.filter(
+        timestamp__gte=start, timestamp__lt=end
+    ).order_by("vehicle_id", "timestamp").values_list("id", "vehicle_id", "timestamp")
+
+    to_delete = []
+    previous_id = None
+    previous_key = None
+    for position_id, vehicle_id, timestamp in positions.iterator(chunk_size=BATCH_SIZE):
+        key = (vehicle_id, int(timestamp.timestamp()) // interval)
+        if key == previous_key:
+            to_delete.append(previous_id)
+        previous_id = position_id
+        previous_key = key
+
+    for i in range(0, len(to_delete), BATCH_SIZE):
+        models.VehiclePosition.objects.filter(id__in=to_delete[i:i + BATCH_SIZE]).delete()
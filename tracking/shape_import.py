@@ -0,0 +1,177 @@
+import json
+import xml.etree.ElementTree
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from . import geo
+from . import models
+
+BATCH_SIZE = 1000
+
+
+def local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def detect_format(file) -> str:
+    start = file.read(512).lstrip()
+    file.seek(0)
+    if isinstance(start, bytes):
+        start = start.lstrip(b"\xef\xbb\xbf").decode("utf-8", "ignore")
+    return "geojson" if start[:1] in ("{", "[") else "xml"
+
+
+# Yields (name, latitudes, longitudes) for each line in a KML or GPX file without building the whole
+# document tree. KML LineStrings (including within MultiGeometry), GPX tracks and GPX routes are read.
+def iter_xml_lines(file):
+    placemark_name = None
+    track_name = None
+    track_points = None
+    line_count = 0
+    # Open elements from the root down. Everything needed from an element is read at its end, after
+    # which it's removed from its parent so the tree never grows.
+    elements = []
+
+    try:
+        for event, element in xml.etree.ElementTree.iterparse(file, events=("start", "end")):
+            tag = local_name(element.tag)
+            if event == "start":
+                if tag in ("Placemark", "trk", "rte"):
+                    placemark_name = track_name = None
+                    line_count = 0
+                    track_points = [] if tag != "Placemark" else None
+                elements.append(element)
+                continue
+
+            elements.pop()
+            parent = local_name(elements[-1].tag) if elements else None
+            if tag == "name" and element.text:
+                # Names of points, folders and documents aren't the line's name
+                if parent == "Placemark":
+                    placemark_name = element.text.strip()
+                elif parent in ("trk", "rte"):
+                    track_name = element.text.strip()
+            elif tag == "coordinates" and parent == "LineString":
+                latitudes, longitudes = parse_kml_coordinates(element.text or "")
+                if latitudes:
+                    line_count += 1
+                    yield line_name(placemark_name, line_count), latitudes, longitudes
+            elif tag in ("trkpt", "rtept") and track_points is not None:
+                try:
+                    track_points.append((float(element.attrib["lat"]), float(element.attrib["lon"])))
+                except (KeyError, ValueError):
+                    raise ValidationError("Invalid GPX point")
+            elif tag in ("trk", "rte"):
+                if track_points:
+                    yield track_name or "Unnamed", [p[0] for p in track_points], [p[1] for p in track_points]
+                track_points = None
+
+            element.clear()
+            if elements:
+                elements[-1].remove(element)
+    except xml.etree.ElementTree.ParseError:
+        raise ValidationError("Invalid XML")
+
+
+def line_name(name, count: int) -> str:
+    name = name or "Unnamed"
+    return name if count == 1 else f"{name} ({count})"
+
+
+def parse_kml_coordinates(text: str):
+    latitudes = []
+    longitudes = []
+    for coordinate in text.split():
+        parts = coordinate.split(",")
+        if len(parts) not in (2, 3):
+            raise ValidationError("Invalid coordinate")
+        try:
+            longitudes.append(float(parts[0]))
+            latitudes.append(float(parts[1]))
+        except ValueError:
+            raise ValidationError("Invalid coordinate")
+    return latitudes, longitudes
+
+
+# GeoJSON has no streaming parser in the standard library, so the document is loaded whole. Points
+# are still written in batches, which is where the time went.
+def iter_geojson_lines(file):
+    try:
+        data = json.load(file)
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationError("Invalid JSON")
+
+    if isinstance(data, dict) and data.get("type") == "FeatureCollection":
+        features = data.get("features") or []
+    elif isinstance(data, dict) and data.get("type") == "Feature":
+        features = [data]
+    elif isinstance(data, dict):
+        features = [{"geometry": data}]
+    else:
+        raise ValidationError("Invalid GeoJSON")
+
+    for feature in features:
+        geometry = feature.get("geometry") or {}
+        name = (feature.get("properties") or {}).get("name")
+        if geometry.get("type") == "LineString":
+            lines = [geometry.get("coordinates") or []]
+        elif geometry.get("type") == "MultiLineString":
+            lines = geometry.get("coordinates") or []
+        else:
+            continue
+
+        for i, coordinates in enumerate(lines):
+            try:
+                longitudes = [float(c[0]) for c in coordinates]
+                latitudes = [float(c[1]) for c in coordinates]
+            except (TypeError, ValueError, IndexError):
+                raise ValidationError("Invalid coordinate")
+            if latitudes:
+                yield line_name(name, i + 1), latitudes, longitudes
+
+
+def iter_lines(file):
+    if detect_format(file) == "geojson":
+        return iter_geojson_lines(file)
+    return iter_xml_lines(file)
+
+
+def create_shape(name: str, latitudes, longitudes) -> models.Shape:
+    for latitude, longitude in zip(latitudes, longitudes):
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            raise ValidationError("Coordinate out of range")
+
+    significance = geo.douglas_peucker_significance(latitudes, longitudes)
+    kept = [i for i, s in enumerate(significance) if s > settings.SHAPE_DETAIL["import"]]
+    latitudes = [latitudes[i] for i in kept]
+    longitudes = [longitudes[i] for i in kept]
+    distances = geo.cumulative_distances(latitudes, longitudes)
+    significance = geo.douglas_peucker_significance(latitudes, longitudes)
+
+    shape = models.Shape.objects.create(name=name[:255])
+    for start in range(0, len(latitudes), BATCH_SIZE):
+        models.ShapePoint.objects.bulk_create([
+            models.ShapePoint(
+                shape=shape,
+                latitude=latitudes[i],
+                longitude=longitudes[i],
+                order=i,
+                dist_traveled=float(distances[i]),
+                significance=float(significance[i]) if significance[i] != float("inf") else None,
+            ) for i in range(start, min(start + BATCH_SIZE, len(latitudes)))
+        ])
+
+    return shape
+
+
+def import_shapes(file) -> list:
+    with transaction.atomic():
+        shapes = [
+            create_shape(name, latitudes, longitudes)
+            for name, latitudes, longitudes in iter_lines(file)
+            if len(latitudes) >= 2
+        ]
+        if not shapes:
+            raise ValidationError("No lines found")
+
+    return shapes
@@ -0,0 +1,121 @@
+import hashlib
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Max
+from . import geo
+from . import models
+
+_geometry_cache = {}
+
+
+class ShapeGeometry:
+    def __init__(self, version, latitudes, longitudes, distances=None):
+        self.version = version
+        self.latitudes = np.ascontiguousarray(latitudes, dtype=np.float64)
+        self.longitudes = np.ascontiguousarray(longitudes, dtype=np.float64)
+        if distances is None:
+            self.distances = geo.cumulative_distances(self.latitudes, self.longitudes)
+        else:
+            self.distances = np.ascontiguousarray(distances, dtype=np.float64)
+        self._stop_distances = {}
+
+    @property
+    def length(self) -> float:
+        return float(self.distances[-1])
+
+    def project(self, latitudes, longitudes):
+        return geo.project_onto_line(latitudes, longitudes, self.latitudes, self.longitudes, self.distances)
+
+    def project_stops(self, latitudes, longitudes):
+        return geo.project_sequence_onto_line(latitudes, longitudes, self.latitudes, self.longitudes, self.distances)
+
+    # Distances along the shape of a journey's stops, cached per stop pattern and stop locations
+    def stop_distances(self, stop_ids, latitudes, longitudes):
+        key = tuple(zip(stop_ids, latitudes, longitudes))
+        if key not in self._stop_distances:
+            self._stop_distances[key] = self.project_stops(latitudes, longitudes)
+
+        return self._stop_distances[key]
+
+
+# Geometry for snapping is simplified at the snapping tolerance, so a change to it is a new version
+def get_shape_versions(shape_ids) -> dict:
+    return {
+        shape["shape_id"]: (shape["count"], shape["updated"], settings.SHAPE_DETAIL["snapping"])
+        for shape in models.ShapePoint.objects.filter(shape_id__in=shape_ids).order_by().values(
+            "shape_id"
+        ).annotate(count=Count("pk"), updated=Max("updated_at"))
+    }
+
+
+def get_shape_geometries(shape_ids) -> dict:
+    versions = get_shape_versions(set(shape_ids))
+
+    stale = [
+        shape_id for shape_id, version in versions.items()
+        if shape_id not in _geometry_cache or _geometry_cache[shape_id].version != version
+    ]
+    if stale:
+        points = {}
+        for shape_id, latitude, longitude, dist_traveled in models.ShapePoint.objects.filter(
+                models.ShapePoint.detail_filter(settings.SHAPE_DETAIL["snapping"]), shape_id__in=stale
+        ).order_by(
+                "shape_id", "order"
+        ).values_list("shape_id", "latitude", "longitude", "dist_traveled"):
+            points.setdefault(shape_id, []).append((latitude, longitude, dist_traveled))
+
+        for shape_id, shape_points in points.items():
+            # Distances along simplified shapes stay those of the full shape, as published in shapes.txt
+            distances = [p[2] for p in shape_points]
+            shape_points = np.array([p[:2] for p in shape_points], dtype=np.float64)
+            _geometry_cache[shape_id] = ShapeGeometry(
+                versions[shape_id], shape_points[:, 0], shape_points[:, 1],
+                None if None in distances else distances,
+            )
+
+    return {
+        shape_id: _geometry_cache[shape_id] for shape_id in versions
+        if shape_id in _geometry_cache
+    }
+
+
+def stop_pattern_key(shape_version, stop_ids, latitudes, longitudes) -> str:
+    pattern = "|".join(
+        f"{stop_id}:{latitude}:{longitude}" for stop_id, latitude, longitude in zip(stop_ids, latitudes, longitudes)
+    )
+    return hashlib.sha256(f"{shape_version}|{pattern}".encode()).hexdigest()
+
+
+# Takes (shape ID, stop IDs, stop latitudes, stop longitudes) for each journey and returns the
+# distances along the shape of each journey's stops, reusing stored distances where possible
+def get_stop_distances(patterns) -> list:
+    versions = get_shape_versions(set(shape_id for shape_id, _, _, _ in patterns))
+    keys = [
+        (shape_id, stop_pattern_key(versions.get(shape_id), stop_ids, latitudes, longitudes))
+        for shape_id, stop_ids, latitudes, longitudes in patterns
+    ]
+
+    distances = {
+        (shape_id, pattern): d for shape_id, pattern, d in models.ShapeStopDistances.objects.filter(
+            shape_id__in=versions.keys(), pattern__in=set(pattern for _, pattern in keys),
+        ).values_list("shape_id", "pattern", "distances")
+    }
+
+    missing = {}
+    for key, (shape_id, _, latitudes, longitudes) in zip(keys, patterns):
+        if shape_id in versions and key not in distances:
+            missing[key] = (latitudes, longitudes)
+
+    if missing:
+        geometries = get_shape_geometries(set(shape_id for shape_id, _ in missing))
+        new_distances = []
+        for (shape_id, pattern), (latitudes, longitudes) in missing.items():
+            if shape_id not in geometries:
+                continue
+            d = [float(distance) for distance in geometries[shape_id].project_stops(latitudes, longitudes)]
+            distances[(shape_id, pattern)] = d
+            new_distances.append(models.ShapeStopDistances(shape_id=shape_id, pattern=pattern, distances=d))
+
+        models.ShapeStopDistances.objects.bulk_create(new_distances, ignore_conflicts=True)
+
+    return [distances.get(key) for key in keys]
@@ -0,0 +1,195 @@
+import asyncio
+import base64
+import contextvars
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from .gtfs_rt import gtfs_realtime_pb2
+from . import feed_storage
+
+FORMATS = ("json", "protobuf")
+
+# Each kind of entity by its list in the JSON feed and its field of FeedEntity
+ENTITY_KINDS = (
+    ("alerts", "alert"),
+    ("vehicle_positions", "vehicle"),
+    ("trip_updates", "trip_update"),
+)
+
+
+class Subscriber:
+    def __init__(self):
+        self.queue = asyncio.Queue(maxsize=settings.GTFS_RT_STREAM["queue"])
+        self.dropped = False
+
+
+# Watches the published feed for changes once per process and fans the differences out to every connected
+# client, already encoded in each format. The feed is only built by the GTFS-RT task, which stored positions
+# queue straight away, so web processes read it back from storage rather than each querying the database.
+class FeedBroadcaster:
+    def __init__(self):
+        self.subscribers = set()
+        self.listeners = 0
+        self.task = None
+        self.loop = None
+        self.ready = None
+        self.fingerprint = None
+        self.timestamp = None
+        # Encoded entities of the current feed by (kind, entity ID), as (protobuf bytes, protobuf, JSON)
+        self.entities = None
+        self.snapshot = None
+        self.sequence = 0
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        if self.task and not self.task.done() and self.loop is loop:
+            return
+
+        self.loop = loop
+        self.ready = asyncio.Event()
+        self.fingerprint = None
+        self.entities = None
+        self.snapshot = None
+        # A fresh context keeps the task from inheriting the state of the request that started it
+        self.task = loop.create_task(self.run(), context=contextvars.Context())
+
+    async def run(self):
+        while self.listeners:
+            try:
+                update = await sync_to_async(self.poll, thread_sensitive=False)()
+            except Exception:
+                update = None
+
+            if update:
+                self.apply(*update)
+                self.ready.set()
+
+            await asyncio.sleep(settings.GTFS_RT_STREAM["interval"])
+
+    def poll(self):
+        feed = feed_storage.get_feed("gtfs-rt.pb")
+        feed_json = feed_storage.get_feed("gtfs-rt.json")
+        if not feed or not feed_json:
+            return None
+
+        fingerprint = (feed.version, feed_json.version)
+        if fingerprint == self.fingerprint:
+            return None
+
+        message = gtfs_realtime_pb2.FeedMessage.FromString(feed.variants[None])
+        message_json = json.loads(feed_json.variants[None])
+        # The files are written one after the other, so wait until both are from the same run
+        if message.header.timestamp != message_json["header"]["timestamp"]:
+            return None
+
+        entities_json = {
+            (kind, entity_json["id"]): entity_json
+            for kind, _ in ENTITY_KINDS for entity_json in message_json[kind]
+        }
+        entities = {}
+        for entity in message.entity:
+            for kind, field in ENTITY_KINDS:
+                if entity.HasField(field) and (kind, entity.id) in entities_json:
+                    entities[(kind, entity.id)] = (
+                        entity.SerializeToString(), entity, entities_json[(kind, entity.id)]
+                    )
+        return fingerprint, message.header.timestamp, entities
+
+    def apply(self, fingerprint, timestamp, entities):
+        previous = self.entities or {}
+        changed = [key for key, value in entities.items() if key not in previous or previous[key][0] != value[0]]
+        deleted = [key for key in previous if key not in entities]
+
+        self.fingerprint = fingerprint
+        self.timestamp = timestamp
+        self.entities = entities
+        self.snapshot = None
+
+        # Clients only subscribe once there's a feed, and start from a snapshot of it
+        if not previous or not (changed or deleted):
+            return
+
+        self.sequence += 1
+        events = self.encode(gtfs_realtime_pb2.FeedHeader.DIFFERENTIAL, changed, deleted)
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.queue.put_nowait(events)
+            except asyncio.QueueFull:
+                # Clients that can't keep up are disconnected, and get a fresh snapshot when they reconnect
+                subscriber.dropped = True
+                self.subscribers.discard(subscriber)
+
+    def encode(self, incrementality, changed, deleted) -> dict:
+        entities = [self.entities[key][1] for key in changed] + [
+            gtfs_realtime_pb2.FeedEntity(id=entity_id, is_deleted=True) for _, entity_id in deleted
+        ]
+        output = gtfs_realtime_pb2.FeedMessage(
+            header=gtfs_realtime_pb2.FeedHeader(
+                gtfs_realtime_version="2.0",
+                incrementality=incrementality,
+                timestamp=self.timestamp,
+            ),
+            entity=entities,
+        )
+
+        output_json = {
+            "header": {
+                "timestamp": self.timestamp,
+                "incrementality": gtfs_realtime_pb2.FeedHeader.Incrementality.Name(incrementality),
+            },
+        }
+        for kind, _ in ENTITY_KINDS:
+            output_json[kind] = [self.entities[key][2] for key in changed if key[0] == kind]
+        output_json["deleted"] = {
+            kind: [entity_id for deleted_kind, entity_id in deleted if deleted_kind == kind]
+            for kind, _ in ENTITY_KINDS
+        }
+
+        event = gtfs_realtime_pb2.FeedHeader.Incrementality.Name(incrementality).lower()
+        return {
+            "json": server_sent_event(event, self.sequence, json.dumps(output_json, separators=(",", ":"))),
+            "protobuf": server_sent_event(
+                event, self.sequence, base64.b64encode(output.SerializeToString()).decode()
+            ),
+        }
+
+    def get_snapshot(self) -> dict:
+        if self.snapshot is None:
+            self.snapshot = self.encode(gtfs_realtime_pb2.FeedHeader.FULL_DATASET, list(self.entities), [])
+        return self.snapshot
+
+    # The full feed, then its differences as they happen
+    async def stream(self, output_format: str):
+        self.listeners += 1
+        subscriber = None
+        try:
+            self.start()
+            yield f"retry: {int(settings.GTFS_RT_STREAM['interval'] * 1000)}\n\n".encode()
+            while not self.ready.is_set():
+                try:
+                    await asyncio.wait_for(self.ready.wait(), settings.GTFS_RT_STREAM["keepalive"])
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+
+            subscriber = Subscriber()
+            self.subscribers.add(subscriber)
+            yield self.get_snapshot()[output_format]
+
+            while not (subscriber.dropped and subscriber.queue.empty()):
+                try:
+                    events = await asyncio.wait_for(subscriber.queue.get(), settings.GTFS_RT_STREAM["keepalive"])
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield events[output_format]
+        finally:
+            self.listeners -= 1
+            if subscriber:
+                self.subscribers.discard(subscriber)
+
+
+def server_sent_event(event: str, event_id: int, data: str) -> bytes:
+    return f"event: {event}\nid: {event_id}\ndata: {data}\n\n".encode()
+
+
+broadcaster = FeedBroadcaster()
@@ -1,2 +1,3 @@
 from . import gtfs_tasks
 from . import gtfs_rt_tasks
+from . import retention_tasks
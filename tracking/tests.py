@@ -1,3 +1,876 @@
-from django.test import TestCase
+import asyncio
+import csv
+import datetime
+import gzip
+import io
+import json
+import math
+import tempfile
+import types
+import unittest
+import uuid
+from unittest import mock
+import numpy as np
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from .tracker_upload import tracker_upload_pb2
+from . import models, feed_storage, geo, gtfs_rt_tasks, gtfs_tasks, ingest, metrics, retention_tasks, shape_import, \
+    position_filter, shapes, streaming, trip_matching, trip_updates, websocket
 
-# Create your tests here.
+
+def make_time(hour: int, minute: int = 0, second: int = 0):
+    return datetime.datetime(2026, 7, 16, hour, minute, second, tzinfo=datetime.timezone.utc)
+
+
+class RetentionTestCase(TestCase):
+    def setUp(self):
+        self.vehicle = models.Vehicle.objects.create(name="Bus", registration_plate="EMF 1")
+
+    def add_position(self, timestamp):
+        return models.VehiclePosition.objects.create(
+            vehicle=self.vehicle, timestamp=timestamp, latitude=52.04, longitude=-2.38
+        )
+
+    def test_deleting_history_expires_current_position(self):
+        self.add_position(make_time(10))
+        retention_tasks.delete_positions_before(make_time(11))
+
+        self.assertFalse(models.VehiclePosition.objects.exists())
+        self.assertFalse(models.VehicleCurrentPosition.objects.exists())
+
+    def test_deleting_older_history_keeps_current_position(self):
+        self.add_position(make_time(10))
+        latest = self.add_position(make_time(12))
+        retention_tasks.delete_positions_before(make_time(11))
+
+        self.assertEqual(models.VehicleCurrentPosition.objects.get(vehicle=self.vehicle).position, latest)
+
+    def test_current_position_without_history_is_not_published(self):
+        now = timezone.now()
+        position = self.add_position(now)
+        self.assertEqual(list(gtfs_rt_tasks.get_current_positions(now)), [self.vehicle.current_position])
+
+        position.delete()
+        current = models.VehicleCurrentPosition.objects.get(vehicle=self.vehicle)
+        self.assertIsNone(current.position)
+        self.assertFalse(gtfs_rt_tasks.get_current_positions(now).exists())
+
+    def test_late_fixes_are_downsampled(self):
+        self.add_position(make_time(10, 0, 10))
+        self.add_position(make_time(10, 0, 20))
+        late_window = datetime.timedelta(hours=1)
+        retention_tasks.downsample_positions_before(make_time(11), 60, late_window)
+        self.assertEqual(models.VehiclePosition.objects.count(), 1)
+
+        # Arriving after 10:00 to 11:00 was downsampled
+        self.add_position(make_time(10, 30, 10))
+        self.add_position(make_time(10, 30, 20))
+        retention_tasks.downsample_positions_before(make_time(11), 60, late_window)
+
+        self.assertEqual(list(models.VehiclePosition.objects.order_by("timestamp").values_list(
+            "timestamp", flat=True
+        )), [make_time(10, 0, 20), make_time(10, 30, 20)])
+
+
+class ScheduleFingerprintTestCase(TestCase):
+    def test_route_reorder_changes_fingerprint(self):
+        first = models.Route.objects.create(name="1", type=models.Route.TYPE_BUS, order=1)
+        second = models.Route.objects.create(name="2", type=models.Route.TYPE_BUS, order=2)
+        before = gtfs_tasks.get_source_fingerprint(models.Route, {})
+
+        admin.site._registry[models.Route]._update_order([[first.pk, 2], [second.pk, 1]], {})
+
+        self.assertNotEqual(gtfs_tasks.get_source_fingerprint(models.Route, {}), before)
+
+    def test_update_geometry_changes_fingerprint(self):
+        shape = models.Shape.objects.create(name="Shape")
+        for i in range(3):
+            models.ShapePoint.objects.create(shape=shape, latitude=52 + i * 0.001, longitude=-2.38, order=i)
+        before = gtfs_tasks.get_source_fingerprint(models.ShapePoint, {})
+
+        shape.update_geometry()
+
+        self.assertNotEqual(gtfs_tasks.get_source_fingerprint(models.ShapePoint, {}), before)
+
+    def test_settings_change_fingerprint(self):
+        before = gtfs_tasks.get_source_fingerprint("SHAPE_DETAIL", {})
+        with override_settings(SHAPE_DETAIL={"import": 0.5, "gtfs": 5, "snapping": 1}):
+            self.assertNotEqual(gtfs_tasks.get_source_fingerprint("SHAPE_DETAIL", {}), before)
+
+    def test_snapping_tolerance_changes_shape_version(self):
+        shape = models.Shape.objects.create(name="Shape")
+        models.ShapePoint.objects.create(shape=shape, latitude=52, longitude=-2.38, order=0)
+        before = shapes.get_shape_versions([shape.id])[shape.id]
+        with override_settings(SHAPE_DETAIL={"import": 0.5, "gtfs": 2, "snapping": 3}):
+            self.assertNotEqual(shapes.get_shape_versions([shape.id])[shape.id], before)
+
+
+@override_settings(GTFS_SCHEDULE_DEBOUNCE=60)
+class ScheduleQueueTestCase(TestCase):
+    def setUp(self):
+        for target, name in (
+            (gtfs_tasks.generate_gtfs_schedule, "apply_async"),
+            (gtfs_tasks.generate_schedule_html, "delay"),
+            (gtfs_tasks, "build_gtfs_schedule"),
+        ):
+            patcher = mock.patch.object(target, name)
+            setattr(self, name, patcher.start())
+            self.addCleanup(patcher.stop)
+
+    def test_repeated_requests_queue_one_run(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(3):
+                gtfs_tasks.request_gtfs_schedule()
+
+        self.apply_async.assert_called_once_with(countdown=60)
+
+    def test_request_during_run_queues_one_follow_up(self):
+        models.GTFSScheduleState.objects.create(requested_at=timezone.now() - datetime.timedelta(hours=1))
+        self.build_gtfs_schedule.side_effect = lambda: [gtfs_tasks.queue_gtfs_schedule() for _ in range(3)]
+
+        gtfs_tasks.generate_gtfs_schedule()
+        self.apply_async.assert_called_once_with(countdown=60)
+        state = models.GTFSScheduleState.objects.get()
+        self.assertIsNone(state.running_since)
+        self.assertIsNotNone(state.queued_at)
+
+        # The follow-up runs once the requests have settled, without queueing another
+        state.requested_at -= datetime.timedelta(minutes=2)
+        state.save()
+        self.build_gtfs_schedule.side_effect = None
+        gtfs_tasks.generate_gtfs_schedule()
+        self.assertEqual(self.build_gtfs_schedule.call_count, 2)
+        self.apply_async.assert_called_once()
+        self.assertEqual(self.delay.call_count, 2)
+
+    def test_run_waits_for_running_build(self):
+        models.GTFSScheduleState.objects.create(running_since=timezone.now())
+
+        gtfs_tasks.generate_gtfs_schedule()
+
+        self.build_gtfs_schedule.assert_not_called()
+        self.apply_async.assert_called_once_with(countdown=60)
+
+
+class TimetablesFileTestCase(TestCase):
+    def test_one_timetable_per_route_date_and_direction(self):
+        first = models.Route.objects.create(name="1", type=models.Route.TYPE_BUS, order=2)
+        second = models.Route.objects.create(name="2", type=models.Route.TYPE_BUS, order=1)
+        thursday, friday = datetime.date(2026, 7, 16), datetime.date(2026, 7, 17)
+        inbound, outbound = models.Journey.DIRECTION_INBOUND, models.Journey.DIRECTION_OUTBOUND
+        for code, route, direction, date, public in (
+            ("1", first, outbound, thursday, True),
+            ("2", second, outbound, friday, True),
+            ("3", second, outbound, friday, True),
+            ("4", second, inbound, thursday, True),
+            ("5", first, inbound, friday, False),
+            ("6", None, inbound, friday, True),
+            ("7", first, None, friday, True),
+        ):
+            models.Journey.objects.create(code=code, route=route, direction=direction, date=date, public=public)
+
+        content = gtfs_tasks.render_schedule_file(gtfs_tasks.write_timetables_file)
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+
+        self.assertEqual([
+            (row["timetable_id"], row["route_id"], row["direction_id"], row["start_date"], row["end_date"],
+             row["thursday"], row["friday"], row["timetable_label"])
+            for row in rows
+        ], [
+            (f"{second.id}-2026-07-16-inbound", str(second.id), str(inbound), "20260716", "20260716", "1", "0",
+             "Inbound - 2026-07-16"),
+            (f"{second.id}-2026-07-17-outbound", str(second.id), str(outbound), "20260717", "20260717", "0", "1",
+             "Outbound - 2026-07-17"),
+            (f"{first.id}-2026-07-16-outbound", str(first.id), str(outbound), "20260716", "20260716", "1", "0",
+             "Outbound - 2026-07-16"),
+        ])
+
+
+class BlockTestCase(TestCase):
+    def resolve(self, forms_from: dict) -> dict:
+        return gtfs_tasks.resolve_blocks([
+            types.SimpleNamespace(id=journey_id, forms_from_id=previous) for journey_id, previous in forms_from.items()
+        ])
+
+    def test_chain_takes_first_journey(self):
+        blocks = self.resolve({"c": "b", "a": None, "b": "a", "d": None})
+        self.assertEqual(blocks, {"a": "a", "b": "a", "c": "a", "d": "d"})
+
+    def test_cycle_takes_smallest_journey(self):
+        blocks = self.resolve({"b": "c", "c": "a", "a": "b", "d": "c"})
+        self.assertEqual(blocks, {"a": "a", "b": "a", "c": "a", "d": "a"})
+
+    def test_missing_journey_starts_block(self):
+        blocks = self.resolve({"b": "a", "c": "b"})
+        self.assertEqual(blocks, {"b": "b", "c": "b"})
+
+
+class TripMatchingTestCase(TestCase):
+    def setUp(self):
+        self.vehicle = models.Vehicle.objects.create(name="Bus", registration_plate="EMF 1")
+        self.stops = [
+            models.Stop.objects.create(name=f"Stop {i}", latitude=52.04, longitude=-2.38 + i * 0.01) for i in range(3)
+        ]
+
+    def add_journey(self, code: str, date, times):
+        journey = models.Journey.objects.create(code=code, date=date, vehicle=self.vehicle)
+        for i, (stop, time) in enumerate(zip(self.stops, times)):
+            models.JourneyPoint.objects.create(
+                journey=journey, stop=stop, order=i,
+                arrival_time=time if i else None, departure_time=time if i < len(times) - 1 else None,
+            )
+        return journey
+
+    def local_time(self, date, hour: int, minute: int = 0):
+        return timezone.make_aware(datetime.datetime.combine(date, datetime.time(hour, minute)))
+
+    def test_journey_past_midnight(self):
+        date = datetime.date(2026, 7, 16)
+        journey = self.add_journey("1", date, [datetime.time(23, 30), datetime.time(0, 0), datetime.time(0, 30)])
+        matcher = trip_matching.TripMatcher.for_dates([date])
+
+        trip = matcher.match(self.vehicle.id, self.local_time(date + datetime.timedelta(days=1), 0, 15))
+        self.assertEqual(trip.journey_id, journey.id)
+        self.assertEqual(trip.start, self.local_time(date, 23, 30))
+        self.assertEqual(trip.end, self.local_time(date + datetime.timedelta(days=1), 0, 30))
+
+    def test_match_within_margin(self):
+        date = datetime.date(2026, 7, 16)
+        first = self.add_journey("1", date, [datetime.time(10, 0), datetime.time(10, 15), datetime.time(10, 30)])
+        second = self.add_journey("2", date, [datetime.time(11, 0), datetime.time(11, 15), datetime.time(11, 30)])
+        matcher = trip_matching.TripMatcher.for_dates([date])
+
+        self.assertEqual(matcher.match(self.vehicle.id, self.local_time(date, 10, 20)).journey_id, first.id)
+        self.assertEqual(matcher.match(self.vehicle.id, self.local_time(date, 10, 35)).journey_id, first.id)
+        self.assertEqual(matcher.match(self.vehicle.id, self.local_time(date, 10, 55)).journey_id, second.id)
+        self.assertIsNone(matcher.match(self.vehicle.id, self.local_time(date, 10, 45)))
+        self.assertIsNone(matcher.match(self.vehicle.id, self.local_time(date, 12, 0)))
+
+
+class DelayPredictionTestCase(TestCase):
+    def setUp(self):
+        self.date = datetime.date(2026, 7, 16)
+        self.start = trip_matching.scheduled_datetime(self.date, datetime.time(10, 0)).timestamp()
+
+    # Stops 0.01 degrees of longitude apart, leaving at 10:00, 10:12 and arriving at 10:20
+    def make_schedule(self, shape_id=None):
+        return trip_updates.JourneySchedule(shape_id, [
+            (self.date, "a", 0, None, datetime.time(10, 0), 52, -2.4),
+            (self.date, "b", 1, datetime.time(10, 10), datetime.time(10, 12), 52, -2.39),
+            (self.date, "c", 2, datetime.time(10, 20), None, 52, -2.38),
+        ])
+
+    def test_interpolates_between_stops(self):
+        schedule = self.make_schedule()
+        distances = np.array([0, 1000, 2000])
+
+        # Halfway to the second stop is due at 10:05
+        self.assertEqual(schedule.predict_at_distance(self.start + 600, 500, distances), (300, 1))
+        # Halfway to the last stop is due at 10:16
+        self.assertEqual(schedule.predict_at_distance(self.start + 1080, 1500, distances), (120, 2))
+
+    def test_at_stop_uses_its_dwell_time(self):
+        schedule = self.make_schedule()
+        distances = np.array([0, 1000, 2000])
+
+        self.assertEqual(schedule.predict_at_distance(self.start + 660, 1010, distances), (0, 1))
+        self.assertEqual(schedule.predict_at_distance(self.start + 780, 1000, distances), (60, 1))
+        self.assertEqual(schedule.predict_at_distance(self.start + 540, 1000, distances), (-60, 1))
+
+    def test_before_first_stop(self):
+        schedule = self.make_schedule()
+        distances = np.array([0, 1000, 2000])
+
+        # Waiting at the first stop before departure isn't running early
+        self.assertEqual(schedule.predict_at_distance(self.start - 120, 0, distances), (0, 0))
+        self.assertEqual(schedule.predict_at_distance(self.start + 180, 0, distances), (180, 0))
+
+    def test_after_last_stop(self):
+        schedule = self.make_schedule()
+        distances = np.array([0, 1000, 2000])
+
+        self.assertEqual(schedule.predict_at_distance(self.start + 1500, 2500, distances), (300, 2))
+
+    def test_predicts_along_stops_without_shape(self):
+        schedule = self.make_schedule()
+
+        self.assertEqual(schedule.predict(self.start + 660, 52, -2.39), (0, 1))
+        self.assertIsNone(schedule.predict(self.start + 660, 52.1, -2.39))
+
+    def test_fixes_are_projected_once_per_shape(self):
+        shape_id, missing_shape_id = uuid.uuid4(), uuid.uuid4()
+        geometry = mock.Mock()
+        geometry.project.return_value = (
+            np.array([500, 1010, 1500]), None, None, np.array([10, 10, trip_updates.MAX_OFF_ROUTE + 1])
+        )
+        geometry.stop_distances.return_value = np.array([0, 1000, 2000])
+        on_shape, without_shape = self.make_schedule(shape_id), self.make_schedule(missing_shape_id)
+        fixes = [
+            (on_shape, self.start + 600, 52.1, -2.1),
+            (without_shape, self.start + 660, 52, -2.39),
+            (on_shape, self.start + 660, 52.2, -2.2),
+            (on_shape, self.start + 660, 52.3, -2.3),
+        ]
+
+        with mock.patch.object(shapes, "get_shape_geometries", return_value={shape_id: geometry}) as get_geometries:
+            predictions = trip_updates.predict_delays(fixes)
+
+        get_geometries.assert_called_once_with({shape_id, missing_shape_id})
+        geometry.project.assert_called_once_with([52.1, 52.2, 52.3], [-2.1, -2.2, -2.3])
+        self.assertEqual(predictions, [(300, 1), (0, 1), (0, 1), None])
+
+
+class ShapeGeometryTestCase(TestCase):
+    def test_moved_stop_changes_stop_distances(self):
+        geometry = shapes.ShapeGeometry(None, [52, 52], [-2.4, -2.38])
+        before = geometry.stop_distances(["a", "b"], [52, 52], [-2.4, -2.39])
+
+        after = geometry.stop_distances(["a", "b"], [52, 52], [-2.4, -2.385])
+
+        self.assertAlmostEqual(after[1] - before[1], geometry.length / 4, delta=1)
+        self.assertEqual(after[0], before[0])
+
+
+class DouglasPeuckerTestCase(TestCase):
+    # Coordinates of a point the given number of metres east and north of 52, -2.4
+    def offset(self, east: float, north: float):
+        return (
+            52 + math.degrees(north / geo.EARTH_RADIUS),
+            -2.4 + math.degrees(east / (geo.EARTH_RADIUS * math.cos(math.radians(52)))),
+        )
+
+    def significance(self, points):
+        return geo.douglas_peucker_significance(*zip(*(self.offset(*p) for p in points)))
+
+    def test_straight_line(self):
+        significance = self.significance([(0, 0), (100, 0), (200, 0), (300, 0)])
+        self.assertEqual(significance[0], math.inf)
+        self.assertEqual(significance[-1], math.inf)
+        self.assertAlmostEqual(significance[1], 0, places=3)
+        self.assertAlmostEqual(significance[2], 0, places=3)
+
+    def test_offset_point(self):
+        significance = self.significance([(0, 0), (100, 10), (200, 0)])
+        self.assertAlmostEqual(significance[1], 10, delta=0.1)
+
+    def test_point_never_outlives_parent(self):
+        # The last inner point is further from the line through its neighbours than the first inner point
+        # is from the whole line, but is only considered once the first is kept
+        significance = self.significance([(0, 0), (100, 40), (150, -39), (200, 0)])
+        self.assertAlmostEqual(significance[1], 40, delta=0.5)
+        self.assertEqual(significance[2], significance[1])
+
+    def test_simplified_points(self):
+        shape = models.Shape.objects.create(name="Shape")
+        for i, (east, north) in enumerate([(0, 0), (100, 40), (150, 30), (200, 0)]):
+            latitude, longitude = self.offset(east, north)
+            models.ShapePoint.objects.create(shape=shape, latitude=latitude, longitude=longitude, order=i)
+        shape.update_geometry()
+
+        def simplified(tolerance: float):
+            return [p.order for p in shape.simplified_points(tolerance).order_by("order")]
+
+        self.assertEqual(simplified(1), [0, 1, 2, 3])
+        self.assertEqual(simplified(30), [0, 1, 3])
+        self.assertEqual(simplified(50), [0, 3])
+
+
+class ShapeImportTestCase(TestCase):
+    def read_lines(self, document: str):
+        return list(shape_import.iter_xml_lines(io.BytesIO(document.encode())))
+
+    def test_kml_reads_only_line_strings(self):
+        lines = self.read_lines("""<?xml version="1.0" encoding="UTF-8"?>
+<kml xmlns="http://www.opengis.net/kml/2.2"><Document><name>Routes</name>
+<Placemark><name>Site</name><Polygon><outerBoundaryIs><LinearRing>
+<coordinates>-2.38,52.04 -2.37,52.04 -2.37,52.05 -2.38,52.04</coordinates>
+</LinearRing></outerBoundaryIs></Polygon></Placemark>
+<Placemark><name>Route</name><MultiGeometry>
+<Point><coordinates>-2.38,52.04</coordinates></Point>
+<LineString><coordinates>-2.38,52.04,0 -2.37,52.05,0</coordinates></LineString>
+</MultiGeometry></Placemark>
+</Document></kml>""")
+        self.assertEqual(lines, [("Route", [52.04, 52.05], [-2.38, -2.37])])
+
+    def test_gpx_track_name(self):
+        lines = self.read_lines("""<?xml version="1.0" encoding="UTF-8"?>
+<gpx xmlns="http://www.topografix.com/GPX/1/1" version="1.1"><trk><name>Route</name><trkseg>
+<trkpt lat="52.04" lon="-2.38"><name>Start</name></trkpt>
+<trkpt lat="52.05" lon="-2.37"><name>End</name></trkpt>
+</trkseg></trk></gpx>""")
+        self.assertEqual(lines, [("Route", [52.04, 52.05], [-2.38, -2.37])])
+
+
+class MetricsTestCase(TestCase):
+    def test_measurements_are_totalled(self):
+        with metrics.measure("outer"):
+            for rows in (2, 3):
+                with metrics.measure("inner") as m:
+                    m.rows = rows
+
+        stage = models.StageMetrics.objects.get(name="inner")
+        self.assertEqual((stage.runs, stage.rows, stage.last_rows), (2, 5, 3))
+        self.assertEqual(models.StageMetrics.objects.get(name="outer").runs, 1)
+
+    def test_failures_keep_last_success(self):
+        with metrics.measure("stage") as m:
+            m.rows = 1
+        with self.assertRaises(ValueError):
+            with metrics.measure("stage"):
+                raise ValueError
+
+        stage = models.StageMetrics.objects.get(name="stage")
+        self.assertEqual((stage.runs, stage.failures, stage.last_rows), (1, 1, 1))
+        self.assertIsNotNone(stage.last_failure_at)
+
+    def test_skipped_runs_are_not_recorded(self):
+        with metrics.measure("stage") as m:
+            m.skipped = True
+
+        self.assertFalse(models.StageMetrics.objects.exists())
+
+    def test_recording_errors_are_logged(self):
+        with mock.patch.object(metrics, "record", side_effect=RuntimeError):
+            with self.assertLogs(metrics.logger, "ERROR"):
+                with metrics.measure("stage") as m:
+                    m.rows = 1
+
+    def test_endpoint_requires_authentication(self):
+        self.assertEqual(self.client.get(reverse("tracking:metrics")).status_code, 401)
+
+        # Tracker keys can't read metrics
+        key = models.TrackerKey.objects.create(name="Tracker")
+        response = self.client.get(reverse("tracking:metrics"), headers={"Authorization": f"Bearer {key.key}"})
+        self.assertEqual(response.status_code, 401)
+
+        with override_settings(METRICS_TOKEN="scraper-token"):
+            for token, status in (("scraper-token", 200), ("wrong", 401), ("", 401)):
+                response = self.client.get(reverse("tracking:metrics"), headers={"Authorization": f"Bearer {token}"})
+                self.assertEqual(response.status_code, status)
+
+        self.client.force_login(User.objects.create(username="staff", is_staff=True))
+        self.assertEqual(self.client.get(reverse("tracking:metrics")).status_code, 200)
+
+
+class GTFSRTFeedTestCase(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        last_feed = mock.patch.dict(gtfs_rt_tasks._last_feed, fingerprint=None, feed=None, written_at=None)
+        last_feed.start()
+        self.addCleanup(last_feed.stop)
+
+    def add_position(self, vehicle, minutes_ago: int, latitude: float):
+        models.VehiclePosition.objects.create(
+            vehicle=vehicle, timestamp=timezone.now() - datetime.timedelta(minutes=minutes_ago),
+            latitude=latitude, longitude=-2.38,
+        )
+
+    def published_latitudes(self):
+        return {p.id: p.latitude for p in gtfs_rt_tasks._last_feed["feed"].vehicle_positions}
+
+    def test_moving_vehicle_behind_latest_fix_rebuilds_feed(self):
+        first = models.Vehicle.objects.create(name="Bus 1", registration_plate="EMF 1")
+        second = models.Vehicle.objects.create(name="Bus 2", registration_plate="EMF 2")
+        self.add_position(first, 1, 52.04)
+        self.add_position(second, 5, 52.05)
+        self.assertTrue(gtfs_rt_tasks.write_gtfs_rt())
+        self.assertFalse(gtfs_rt_tasks.write_gtfs_rt())
+
+        # Still older than the first vehicle's fix, so the latest timestamp doesn't change
+        self.add_position(second, 3, 52.06)
+        self.assertTrue(gtfs_rt_tasks.write_gtfs_rt())
+        self.assertEqual(self.published_latitudes(), {first.id: 52.04, second.id: 52.06})
+
+
+class FeedViewTestCase(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        feed_storage._feed_cache.clear()
+        self.addCleanup(feed_storage._feed_cache.clear)
+        self.content = json.dumps({"vehicle_positions": ["bus"] * 100}).encode()
+        feed_storage.write_feed_file("gtfs-rt.json", self.content)
+        self.url = f"{settings.MEDIA_URL}gtfs-rt.json"
+
+    def assertCacheHeaders(self, response):
+        self.assertEqual(response["Cache-Control"], f"public, max-age={settings.FEED_MAX_AGE['gtfs-rt.json']}")
+        self.assertIn("Accept-Encoding", [v.strip() for v in response["Vary"].split(",")])
+
+    def test_serves_feed_with_etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.content)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertNotIn("Content-Encoding", response)
+        self.assertTrue(response["ETag"])
+        self.assertCacheHeaders(response)
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertCacheHeaders(response)
+
+        response = self.client.get(self.url, headers={"If-None-Match": etag, "Accept-Encoding": "gzip"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_gzip_is_negotiated(self):
+        response = self.client.get(self.url, headers={"Accept-Encoding": "gzip, deflate"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), self.content)
+        self.assertNotEqual(response["ETag"], self.client.get(self.url)["ETag"])
+        self.assertCacheHeaders(response)
+
+        response = self.client.get(self.url, headers={"Accept-Encoding": "gzip;q=0"})
+        self.assertNotIn("Content-Encoding", response)
+
+    @unittest.skipUnless(feed_storage.brotli, "brotli isn't installed")
+    def test_brotli_is_negotiated(self):
+        response = self.client.get(self.url, headers={"Accept-Encoding": "gzip;q=0.5, br"})
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(feed_storage.brotli.decompress(response.content), self.content)
+
+    def test_missing_feed_is_not_found(self):
+        self.assertEqual(self.client.get(f"{settings.MEDIA_URL}gtfs-rt.pb").status_code, 404)
+
+
+class StreamingTestCase(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        feed_storage._feed_cache.clear()
+        self.vehicle = models.Vehicle.objects.create(name="Bus", registration_plate="EMF 1")
+
+    def publish(self, timestamp: int, latitude: float, names=("gtfs-rt.pb", "gtfs-rt.json")):
+        position = models.VehicleCurrentPosition(
+            vehicle=self.vehicle, timestamp=datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc),
+            latitude=latitude, longitude=-2.38,
+        )
+        feed = gtfs_rt_tasks.Feed(timestamp, [], gtfs_rt_tasks.get_vehicle_positions([(position, None)]), [])
+        for name, content in zip(("gtfs-rt.pb", "gtfs-rt.json"), gtfs_rt_tasks.encode_feed(feed)):
+            if name in names:
+                feed_storage.write_feed_file(name, content)
+        feed_storage._feed_cache.clear()
+
+    def test_moving_vehicle_keeps_its_entity(self):
+        broadcaster = streaming.FeedBroadcaster()
+        self.publish(1000, 52.04)
+        broadcaster.apply(*broadcaster.poll())
+        subscriber = streaming.Subscriber()
+        broadcaster.subscribers.add(subscriber)
+
+        self.publish(1010, 52.05)
+        broadcaster.apply(*broadcaster.poll())
+
+        event = subscriber.queue.get_nowait()["json"].decode()
+        data = json.loads(event.split("data: ", 1)[1])
+        self.assertEqual([e["id"] for e in data["vehicle_positions"]], [str(self.vehicle.id)])
+        self.assertEqual(data["deleted"]["vehicle_positions"], [])
+
+    def test_waits_for_both_files(self):
+        broadcaster = streaming.FeedBroadcaster()
+        self.publish(1000, 52.04)
+        broadcaster.apply(*broadcaster.poll())
+
+        self.publish(1010, 52.05, names=("gtfs-rt.pb",))
+        self.assertIsNone(broadcaster.poll())
+
+
+class WebSocketTestCase(TestCase):
+    def test_rejected_connections_are_accepted_first(self):
+        sent = []
+
+        async def receive():
+            return {"type": "websocket.connect"}
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(websocket.position_socket({"type": "websocket", "path": "/ws/"}, receive, send))
+        self.assertEqual(sent, [
+            {"type": "websocket.accept"}, {"type": "websocket.close", "code": websocket.CLOSE_NOT_FOUND},
+        ])
+
+    @override_settings(POSITION_BUFFER={"interval": 60, "size": 2})
+    def test_full_buffer_waits_for_flush(self):
+        stored = []
+
+        async def run():
+            release = asyncio.Event()
+
+            async def store(func, fixes):
+                await release.wait()
+                stored.append(fixes)
+                return len(fixes)
+
+            buffer = websocket.PositionBuffer()
+            connection = mock.AsyncMock()
+            with mock.patch.object(websocket, "run_in_thread", store):
+                await buffer.add(connection, [1, 2])
+                waiting = asyncio.create_task(buffer.add(connection, [3]))
+                for _ in range(3):
+                    await asyncio.sleep(0)
+                self.assertFalse(waiting.done())
+
+                release.set()
+                await waiting
+                self.assertEqual(buffer.pending, [(connection, [3])])
+                connection.send_json.assert_awaited_with({"stored": 2})
+
+        asyncio.run(run())
+        self.assertEqual(stored, [[1, 2]])
+
+
+class UploadTestCase(TestCase):
+    def setUp(self):
+        self.vehicle = models.Vehicle.objects.create(name="Bus", registration_plate="EMF 1")
+        self.tracker_key = models.TrackerKey.objects.create(name="Tracker", vehicle=self.vehicle)
+
+    def parse(self, base_timestamp: int, timestamp_deltas, latitude_deltas, longitude_deltas):
+        upload = tracker_upload_pb2.PositionUpload(tracks=[tracker_upload_pb2.VehicleTrack(
+            base_timestamp=base_timestamp, timestamp_deltas=timestamp_deltas,
+            latitude_deltas=latitude_deltas, longitude_deltas=longitude_deltas,
+        )])
+        return ingest.parse_upload(upload.SerializeToString(), self.tracker_key)
+
+    def test_deltas_are_summed(self):
+        fixes = self.parse(1_784_000_000_000, [0, 5000], [520_400_000, 1000], [-23_800_000, -500])
+        self.assertEqual(fixes, [
+            (self.vehicle.id, ingest.EPOCH + datetime.timedelta(milliseconds=1_784_000_000_000), 52.04, -2.38),
+            (self.vehicle.id, ingest.EPOCH + datetime.timedelta(milliseconds=1_784_000_005_000), 52.0401, -2.38005),
+        ])
+
+    def test_overflowing_timestamps_are_rejected(self):
+        # The 64-bit total wraps around back to the base timestamp
+        with self.assertRaisesMessage(ValidationError, "Invalid timestamp"):
+            self.parse(1_784_000_000_000, [2 ** 63 - 1, 2 ** 63 - 1, 2], [0, 0, 0], [0, 0, 0])
+
+    def test_overflowing_coordinates_are_rejected(self):
+        with self.assertRaisesMessage(ValidationError, "Invalid coordinate"):
+            self.parse(1_784_000_000_000, [0, 1000, 1000], [2 ** 63 - 1, 2 ** 63 - 1, 2], [0, 0, 0])
+
+    def test_future_fixes_are_dropped(self):
+        now = int(timezone.now().timestamp()) * 1000
+        fixes = self.parse(now, [0, 60_000, 3_600_000], [520_400_000, 1000, 1000], [-23_800_000, 0, 0])
+        self.assertEqual([f[1] for f in fixes], [
+            ingest.EPOCH + datetime.timedelta(milliseconds=now),
+            ingest.EPOCH + datetime.timedelta(milliseconds=now + 60_000),
+        ])
+
+    def test_future_timestamps_are_rejected(self):
+        position = {"latitude": 52.04, "longitude": -2.38}
+        now = timezone.now()
+        fixes = ingest.parse_positions([{**position, "timestamp": now.isoformat()}], self.tracker_key)
+        self.assertEqual(fixes, [(self.vehicle.id, now, 52.04, -2.38)])
+
+        with self.assertRaisesMessage(ValidationError, "Timestamp is in the future"):
+            ingest.parse_positions([{**position, "timestamp": (now + datetime.timedelta(hours=1)).isoformat()}],
+                                   self.tracker_key)
+        with self.assertRaisesMessage(ValidationError, "Timestamp is in the future"):
+            ingest.parse_positions([{**position, "timestamp": now.timestamp() + 3600}], self.tracker_key)
+
+
+@override_settings(POSITION_FILTER={
+    "stationary_distance": None, "heartbeat": 300, "max_speed": None, "max_rejections": 3, "smoothing": None,
+})
+class IngestViewTestCase(TestCase):
+    def setUp(self):
+        position_filter._vehicles.clear()
+        self.addCleanup(position_filter._vehicles.clear)
+        self.vehicle = models.Vehicle.objects.create(name="Bus", registration_plate="EMF 1")
+        self.tracker_key = models.TrackerKey.objects.create(name="Tracker", vehicle=self.vehicle)
+        self.url = reverse("tracking:ingest_positions")
+        self.now = timezone.now().replace(microsecond=0)
+
+    def post(self, body, content_type="application/json", key=None):
+        return self.client.post(self.url, body, content_type=content_type,
+                                headers={"Authorization": f"Bearer {key or self.tracker_key.key}"})
+
+    def test_requires_tracker_key(self):
+        body = json.dumps({"positions": []})
+        self.assertEqual(self.client.post(self.url, body, content_type="application/json").status_code, 401)
+        self.assertEqual(self.post(body, key="wrong").status_code, 401)
+
+        self.tracker_key.active = False
+        self.tracker_key.save()
+        self.assertEqual(self.post(body).status_code, 401)
+
+    def test_malformed_uploads_are_rejected(self):
+        for body, content_type in (
+            ("{", "application/json"),
+            ("[]", "application/json"),
+            (json.dumps({"positions": [{"timestamp": "yesterday", "latitude": 52, "longitude": -2}]}),
+             "application/json"),
+            (b"\xff\xff", "application/x-protobuf"),
+        ):
+            with self.subTest(body=body):
+                self.assertEqual(self.post(body, content_type).status_code, 400)
+        self.assertFalse(models.VehiclePosition.objects.exists())
+
+    def test_json_positions_are_stored(self):
+        earlier = self.now - datetime.timedelta(seconds=5)
+        response = self.post(json.dumps({"positions": [
+            {"timestamp": earlier.isoformat(), "latitude": 52.04, "longitude": -2.38},
+            {"timestamp": self.now.isoformat(), "latitude": 52.05, "longitude": -2.37},
+        ]}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"accepted": 2})
+
+        self.assertEqual(models.VehiclePosition.objects.filter(vehicle=self.vehicle).count(), 2)
+        current = models.VehicleCurrentPosition.objects.get(vehicle=self.vehicle)
+        self.assertEqual((current.timestamp, current.latitude, current.longitude), (self.now, 52.05, -2.37))
+
+    def test_protobuf_positions_are_stored(self):
+        base_timestamp = int(self.now.timestamp()) * 1000 - 5000
+        upload = tracker_upload_pb2.PositionUpload(tracks=[tracker_upload_pb2.VehicleTrack(
+            base_timestamp=base_timestamp, timestamp_deltas=[0, 5000],
+            latitude_deltas=[520_400_000, 100_000], longitude_deltas=[-23_800_000, 100_000],
+        )])
+        response = self.post(upload.SerializeToString(), "application/x-protobuf")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"accepted": 2})
+
+        self.assertEqual(models.VehiclePosition.objects.filter(vehicle=self.vehicle).count(), 2)
+        current = models.VehicleCurrentPosition.objects.get(vehicle=self.vehicle)
+        self.assertEqual(current.timestamp, self.now)
+        self.assertAlmostEqual(current.latitude, 52.05)
+        self.assertAlmostEqual(current.longitude, -2.37)
+
+
+@override_settings(POSITION_FILTER={
+    "stationary_distance": None, "heartbeat": 300, "max_speed": None, "max_rejections": 3, "smoothing": None,
+})
+class StorePositionsTestCase(TestCase):
+    def setUp(self):
+        position_filter._vehicles.clear()
+        self.addCleanup(position_filter._vehicles.clear)
+        self.vehicle = models.Vehicle.objects.create(name="Bus", registration_plate="EMF 1")
+
+    def test_replayed_fixes_are_stored_once(self):
+        fixes = [
+            (self.vehicle.id, make_time(10, 0, 0), 52.04, -2.38),
+            (self.vehicle.id, make_time(10, 0, 5), 52.05, -2.38),
+        ]
+        self.assertEqual(ingest.store_positions(fixes), 2)
+        self.assertEqual(ingest.store_positions(fixes + fixes), 4)
+
+        self.assertEqual(models.VehiclePosition.objects.count(), 2)
+        self.assertEqual(models.VehicleCurrentPosition.objects.get().timestamp, make_time(10, 0, 5))
+
+    def test_replay_keeps_first_stored_fix(self):
+        ingest.store_positions([(self.vehicle.id, make_time(10), 52.04, -2.38)])
+        ingest.store_positions([(self.vehicle.id, make_time(10), 52.05, -2.37)])
+
+        position = models.VehiclePosition.objects.get()
+        current = models.VehicleCurrentPosition.objects.get()
+        self.assertEqual((position.latitude, position.longitude), (52.04, -2.38))
+        self.assertEqual((current.position_id, current.latitude, current.longitude), (position.id, 52.04, -2.38))
+
+    @override_settings(GTFS_RT_DEBOUNCE=1)
+    @mock.patch.object(gtfs_rt_tasks, "write_gtfs_rt")
+    @mock.patch.object(gtfs_rt_tasks.generate_gtfs_rt, "apply_async")
+    def test_stored_positions_queue_one_feed_build(self, apply_async, write_gtfs_rt):
+        for minute in range(3):
+            with self.captureOnCommitCallbacks(execute=True):
+                ingest.store_positions([(self.vehicle.id, make_time(10, minute), 52.04, -2.38)])
+        apply_async.assert_called_once_with(countdown=1)
+
+        # Once the build starts, positions after it queue the next one
+        gtfs_rt_tasks.generate_gtfs_rt()
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest.store_positions([(self.vehicle.id, make_time(10, 5), 52.04, -2.38)])
+        self.assertEqual(apply_async.call_count, 2)
+
+        # Late fixes don't change the feed
+        gtfs_rt_tasks.generate_gtfs_rt()
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest.store_positions([(self.vehicle.id, make_time(10, 4), 52.04, -2.38)])
+        self.assertEqual(apply_async.call_count, 2)
+
+    def test_late_fix_does_not_replace_current_position(self):
+        ingest.store_positions([(self.vehicle.id, make_time(10, 5), 52.05, -2.38)])
+        ingest.store_positions([(self.vehicle.id, make_time(10, 0), 52.04, -2.38)])
+
+        self.assertEqual(models.VehiclePosition.objects.count(), 2)
+        self.assertEqual(models.VehicleCurrentPosition.objects.get().timestamp, make_time(10, 5))
+
+
+@override_settings(POSITION_FILTER={
+    "stationary_distance": 15, "heartbeat": 300, "max_speed": 40, "max_rejections": 2, "smoothing": None,
+})
+class PositionFilterTestCase(TestCase):
+    def setUp(self):
+        position_filter._vehicles.clear()
+        self.addCleanup(position_filter._vehicles.clear)
+        self.vehicle_id = uuid.uuid4()
+
+    # Filters fixes given as (seconds, metres east, metres north) of 10:00 at 52, -2.4, returning those kept
+    def filter(self, *fixes):
+        scale = geo.EARTH_RADIUS * math.cos(math.radians(52))
+        output, states = position_filter.filter_fixes([(
+            self.vehicle_id, make_time(10) + datetime.timedelta(seconds=seconds),
+            52 + math.degrees(north / geo.EARTH_RADIUS), -2.4 + math.degrees(east / scale),
+        ) for seconds, east, north in fixes])
+        position_filter.save_states(states)
+        return [(
+            (timestamp - make_time(10)).total_seconds(),
+            round(math.radians(longitude + 2.4) * scale, 3),
+            round(math.radians(latitude - 52) * geo.EARTH_RADIUS, 3),
+        ) for _, timestamp, latitude, longitude in output]
+
+    def test_stationary_jitter_is_dropped_until_heartbeat(self):
+        kept = self.filter((0, 0, 0), (10, 5, 0), (20, 0, 5), (310, 3, 3), (320, 100, 0))
+        self.assertEqual([f[0] for f in kept], [0, 310, 320])
+
+    def test_speed_spike_is_dropped(self):
+        kept = self.filter((0, 0, 0), (10, 100, 0), (20, 5000, 0), (30, 200, 0))
+        self.assertEqual([f[0] for f in kept], [0, 10, 30])
+
+    def test_repeated_jump_is_accepted(self):
+        kept = self.filter((0, 0, 0), (10, 5000, 0), (20, 5100, 0), (30, 5200, 0))
+        self.assertEqual([f[0] for f in kept], [0, 30])
+
+    def test_late_fixes_pass_through(self):
+        self.filter((60, 0, 0))
+        self.assertEqual(self.filter((0, 5000, 0)), [(0, 5000, 0)])
+
+    def test_smoothing(self):
+        with override_settings(POSITION_FILTER={
+            "stationary_distance": None, "heartbeat": 300, "max_speed": None, "max_rejections": 2,
+            "smoothing": {"noise": 10, "acceleration": 1},
+        }):
+            kept = self.filter((0, 0, 0), (10, 100, 0), (20, 200, 0), (30, 300, 8))
+
+        # An error across the direction of travel is only partly believed
+        _, east, north = kept[-1]
+        self.assertAlmostEqual(east, 300, delta=5)
+        self.assertGreater(north, 0)
+        self.assertLess(north, 8)
+
+    def test_state_is_kept_once_stored(self):
+        vehicle = models.Vehicle.objects.create(name="Bus", registration_plate="EMF 1")
+        ingest.store_positions([(vehicle.id, make_time(10), 52.04, -2.38)])
+        self.assertNotIn(vehicle.id, position_filter._vehicles)
+
+        with mock.patch.object(gtfs_rt_tasks.generate_gtfs_rt, "apply_async"), \
+                self.captureOnCommitCallbacks(execute=True):
+            ingest.store_positions([(vehicle.id, make_time(10, 1), 52.04, -2.38)])
+        self.assertEqual(position_filter._vehicles[vehicle.id].timestamp, make_time(10, 1))
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: tracker-upload.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'tracker-upload.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x14tracker-upload.proto\x12\x0b\x65mf_tracker\";\n\x0ePositionUpload\x12)\n\x06tracks\x18\x01 \x03(\x0b\x32\x19.emf_tracker.VehicleTrack\"\x84\x01\n\x0cVehicleTrack\x12\x0f\n\x07vehicle\x18\x01 \x01(\x0c\x12\x16\n\x0e\x62\x61se_timestamp\x18\x02 \x01(\x03\x12\x18\n\x10timestamp_deltas\x18\x03 \x03(\x12\x12\x17\n\x0flatitude_deltas\x18\x04 \x03(\x12\x12\x18\n\x10longitude_deltas\x18\x05 \x03(\x12\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'tracker_upload_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_POSITIONUPLOAD']._serialized_start=37
+  _globals['_POSITIONUPLOAD']._serialized_end=96
+  _globals['_VEHICLETRACK']._serialized_start=99
+  _globals['_VEHICLETRACK']._serialized_end=231
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,89 @@
+"""
+@generated by mypy-protobuf.  Do not edit manually!
+isort:skip_file
+Compact batch upload of position fixes from on-vehicle trackers, accepted as an alternative to
+JSON by the positions endpoint (Content-Type: application/x-protobuf) and as binary WebSocket
+messages.
+
+Fixes are stored column-wise and each value is the difference from the previous fix, so the
+fixes of a vehicle reporting every few seconds take a few bytes each.
+"""
+
+from collections import abc as _abc
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from google.protobuf.internal import containers as _containers
+import builtins as _builtins
+import sys
+import typing as _typing
+
+if sys.version_info >= (3, 11):
+    from typing import TypeAlias as _TypeAlias, Never as _Never
+else:
+    from typing_extensions import TypeAlias as _TypeAlias, Never as _Never
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+@_typing.final
+class PositionUpload(_message.Message):
+    DESCRIPTOR: _descriptor.Descriptor
+
+    TRACKS_FIELD_NUMBER: _builtins.int
+    @_builtins.property
+    def tracks(self) -> _containers.RepeatedCompositeFieldContainer[Global___VehicleTrack]: ...
+    def __init__(
+        self,
+        *,
+        tracks: _abc.Iterable[Global___VehicleTrack] | None = ...,
+    ) -> None: ...
+    _HasFieldArgType: _TypeAlias = _Never  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["tracks", b"tracks"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
+
+Global___PositionUpload: _TypeAlias = PositionUpload  # noqa: Y015
+
+@_typing.final
+class VehicleTrack(_message.Message):
+    """Consecutive fixes from one vehicle, oldest first. The n-th fix is made up of the n-th entry of
+    each of the delta lists, which must all be the same length.
+    """
+
+    DESCRIPTOR: _descriptor.Descriptor
+
+    VEHICLE_FIELD_NUMBER: _builtins.int
+    BASE_TIMESTAMP_FIELD_NUMBER: _builtins.int
+    TIMESTAMP_DELTAS_FIELD_NUMBER: _builtins.int
+    LATITUDE_DELTAS_FIELD_NUMBER: _builtins.int
+    LONGITUDE_DELTAS_FIELD_NUMBER: _builtins.int
+    vehicle: _builtins.bytes
+    """The vehicle's UUID as 16 bytes. May be left empty if the tracker key belongs to a vehicle."""
+    base_timestamp: _builtins.int
+    """Unix time in milliseconds that the first timestamp delta is relative to"""
+    @_builtins.property
+    def timestamp_deltas(self) -> _containers.RepeatedScalarFieldContainer[_builtins.int]:
+        """Milliseconds since the previous fix, or since base_timestamp for the first fix"""
+
+    @_builtins.property
+    def latitude_deltas(self) -> _containers.RepeatedScalarFieldContainer[_builtins.int]:
+        """Coordinates in units of 10^-7 degrees since the previous fix, or since zero for the first fix"""
+
+    @_builtins.property
+    def longitude_deltas(self) -> _containers.RepeatedScalarFieldContainer[_builtins.int]: ...
+    def __init__(
+        self,
+        *,
+        vehicle: _builtins.bytes = ...,
+        base_timestamp: _builtins.int = ...,
+        timestamp_deltas: _abc.Iterable[_builtins.int] | None = ...,
+        latitude_deltas: _abc.Iterable[_builtins.int] | None = ...,
+        longitude_deltas: _abc.Iterable[_builtins.int] | None = ...,
+    ) -> None: ...
+    _HasFieldArgType: _TypeAlias = _Never  # noqa: Y015
+    def HasField(self, field_name: _HasFieldArgType) -> _builtins.bool: ...
+    _ClearFieldArgType: _TypeAlias = _typing.Literal["base_timestamp", b"base_timestamp", "latitude_deltas", b"latitude_deltas", "longitude_deltas", b"longitude_deltas", "timestamp_deltas", b"timestamp_deltas", "vehicle", b"vehicle"]  # noqa: Y015
+    def ClearField(self, field_name: _ClearFieldArgType) -> None: ...
+    def WhichOneof(self, oneof_group: _Never) -> None: ...
+
+Global___VehicleTrack: _TypeAlias = VehicleTrack  # noqa: Y015
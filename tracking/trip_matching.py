@@ -0,0 +1,96 @@
+import bisect
+import collections
+import datetime
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from . import models
+from . import gtfs_tasks
+
+# How long before its first stop, or after its last, a journey can still be matched to its vehicle
+MATCH_MARGIN = datetime.timedelta(minutes=10)
+
+ScheduledTrip = collections.namedtuple("ScheduledTrip", [
+    "journey_id", "route_id", "direction", "date", "start", "end",
+])
+
+_matcher_cache = {
+    "key": None,
+    "matcher": None,
+}
+
+
+def get_trip_matcher(now, fingerprints=None):
+    today = timezone.localdate(now)
+    fingerprints = {} if fingerprints is None else fingerprints
+    key = (
+        today,
+        gtfs_tasks.get_source_fingerprint(models.Journey, fingerprints),
+        gtfs_tasks.get_source_fingerprint(models.JourneyPoint, fingerprints),
+    )
+
+    if _matcher_cache["key"] != key:
+        _matcher_cache["matcher"] = TripMatcher.for_dates([today - datetime.timedelta(days=1), today])
+        _matcher_cache["key"] = key
+
+    return _matcher_cache["matcher"]
+
+
+def scheduled_datetime(date: datetime.date, time: datetime.time) -> datetime.datetime:
+    return timezone.make_aware(datetime.datetime.combine(date, time))
+
+
+class TripMatcher:
+    def __init__(self, trips):
+        self.trips = {}
+        for vehicle_id, trip in trips:
+            self.trips.setdefault(vehicle_id, []).append(trip)
+
+        self.starts = {}
+        for vehicle_id, vehicle_trips in self.trips.items():
+            vehicle_trips.sort(key=lambda t: t.start)
+            self.starts[vehicle_id] = [t.start for t in vehicle_trips]
+
+    @classmethod
+    def for_dates(cls, dates):
+        # A journey runs from its first stop to its last, which aren't its earliest and latest times when
+        # it runs past midnight
+        points = models.JourneyPoint.objects.filter(journey=OuterRef("pk")).order_by("order")
+        journeys = models.Journey.objects.filter(
+            public=True, vehicle__isnull=False, date__in=dates,
+        ).annotate(
+            start=Subquery(points.values(time=Coalesce("departure_time", "arrival_time"))[:1]),
+            end=Subquery(points.reverse().values(time=Coalesce("arrival_time", "departure_time"))[:1]),
+        ).filter(start__isnull=False).order_by().values_list(
+            "id", "vehicle_id", "route_id", "direction", "date", "start", "end",
+        )
+
+        trips = []
+        for journey_id, vehicle_id, route_id, direction, date, start, end in journeys:
+            start = scheduled_datetime(date, start)
+            end = scheduled_datetime(date, end)
+            if end < start:
+                # The journey runs past midnight
+                end += datetime.timedelta(days=1)
+
+            trips.append((vehicle_id, ScheduledTrip(journey_id, route_id, direction, date, start, end)))
+
+        return cls(trips)
+
+    def match(self, vehicle_id, timestamp):
+        vehicle_trips = self.trips.get(vehicle_id)
+        if not vehicle_trips:
+            return None
+
+        i = bisect.bisect_right(self.starts[vehicle_id], timestamp) - 1
+        previous_trip = vehicle_trips[i] if i >= 0 else None
+        next_trip = vehicle_trips[i + 1] if i + 1 < len(vehicle_trips) else None
+
+        if previous_trip and timestamp <= previous_trip.end:
+            return previous_trip
+        if next_trip and next_trip.start - timestamp <= MATCH_MARGIN:
+            return next_trip
+        if previous_trip and timestamp - previous_trip.end <= MATCH_MARGIN:
+            return previous_trip
+
+        return None
@@ -0,0 +1,130 @@
+import datetime
+import numpy as np
+from . import geo
+from . import models
+from . import shapes
+from . import trip_matching
+
+# Fixes further than this many metres from a journey's shape, or its stops if it has no shape, are not used
+MAX_OFF_ROUTE = 500
+# Within this many metres of a stop a vehicle is treated as being at the stop
+AT_STOP_RADIUS = 30
+
+_schedule_cache = {
+    "matcher": None,
+    "schedules": None,
+}
+
+
+def get_journey_schedules(matcher: trip_matching.TripMatcher) -> dict:
+    if _schedule_cache["matcher"] is not matcher:
+        journey_ids = [trip.journey_id for trips in matcher.trips.values() for trip in trips]
+        _schedule_cache["schedules"] = load_journey_schedules(journey_ids)
+        _schedule_cache["matcher"] = matcher
+
+    return _schedule_cache["schedules"]
+
+
+def load_journey_schedules(journey_ids) -> dict:
+    points = {}
+    for point in models.JourneyPoint.objects.filter(journey_id__in=journey_ids).order_by(
+            "journey_id", "order"
+    ).values_list(
+        "journey_id", "journey__shape_id", "journey__date", "stop_id", "order", "arrival_time",
+        "departure_time", "stop__latitude", "stop__longitude",
+    ):
+        points.setdefault(point[0], []).append(point[1:])
+
+    return {
+        journey_id: JourneySchedule(journey_points[0][0], [p[1:] for p in journey_points])
+        for journey_id, journey_points in points.items()
+    }
+
+
+def predict_delays(fixes) -> list:
+    geometries = shapes.get_shape_geometries(set(
+        schedule.shape_id for schedule, _, _, _ in fixes if schedule.shape_id
+    ))
+
+    predictions = [None] * len(fixes)
+    by_shape = {}
+    for i, (schedule, _, _, _) in enumerate(fixes):
+        by_shape.setdefault(schedule.shape_id if schedule.shape_id in geometries else None, []).append(i)
+
+    for shape_id, indices in by_shape.items():
+        if shape_id is None:
+            for i in indices:
+                schedule, timestamp, latitude, longitude = fixes[i]
+                predictions[i] = schedule.predict(timestamp, latitude, longitude)
+            continue
+
+        geometry = geometries[shape_id]
+        along, _, _, offsets = geometry.project(
+            [fixes[i][2] for i in indices], [fixes[i][3] for i in indices]
+        )
+        for i, distance, offset in zip(indices, along, offsets):
+            schedule, timestamp, _, _ = fixes[i]
+            if offset > MAX_OFF_ROUTE:
+                continue
+            stop_distances = geometry.stop_distances(schedule.stop_ids, schedule.latitudes, schedule.longitudes)
+            predictions[i] = schedule.predict_at_distance(timestamp, distance, stop_distances)
+
+    return predictions
+
+
+class JourneySchedule:
+    def __init__(self, shape_id, points):
+        self.shape_id = shape_id
+        self.stop_ids = [p[1] for p in points]
+        self.stop_sequences = [p[2] for p in points]
+
+        arrivals = []
+        departures = []
+        day = datetime.timedelta()
+        last = None
+        for date, _, _, arrival_time, departure_time, _, _ in points:
+            arrival_time = arrival_time or departure_time
+            departure_time = departure_time or arrival_time
+            arrival = trip_matching.scheduled_datetime(date, arrival_time) + day
+            if last and arrival < last:
+                # The journey runs past midnight
+                day += datetime.timedelta(days=1)
+                arrival += datetime.timedelta(days=1)
+            departure = trip_matching.scheduled_datetime(date, departure_time) + day
+            if departure < arrival:
+                day += datetime.timedelta(days=1)
+                departure += datetime.timedelta(days=1)
+            last = departure
+            arrivals.append(arrival.timestamp())
+            departures.append(departure.timestamp())
+
+        self.arrivals = np.array(arrivals, dtype=np.float64)
+        self.departures = np.array(departures, dtype=np.float64)
+        self.latitudes = np.array([p[5] for p in points], dtype=np.float64)
+        self.longitudes = np.array([p[6] for p in points], dtype=np.float64)
+        self.distances = geo.cumulative_distances(self.latitudes, self.longitudes)
+
+    def predict(self, timestamp: float, latitude: float, longitude: float):
+        along, _, _, offset = geo.project_onto_line(
+            latitude, longitude, self.latitudes, self.longitudes, self.distances
+        )
+        if offset[0] > MAX_OFF_ROUTE:
+            return None
+        return self.predict_at_distance(timestamp, along[0])
+
+    # Returns the current delay in seconds and the index of the first stop not yet departed
+    def predict_at_distance(self, timestamp: float, distance: float, distances=None):
+        distances = self.distances if distances is None else distances
+        stop = max(int(np.searchsorted(distances, distance, side="right")) - 1, 0)
+
+        if distance - distances[stop] <= AT_STOP_RADIUS or stop + 1 >= len(distances):
+            scheduled = np.clip(timestamp, self.arrivals[stop], self.departures[stop])
+            delay = timestamp - scheduled
+            if stop == 0:
+                # Vehicles wait at the first stop rather than leaving early
+                delay = max(delay, 0)
+            return int(round(delay)), stop
+
+        fraction = (distance - distances[stop]) / (distances[stop + 1] - distances[stop])
+        scheduled = self.departures[stop] + fraction * (self.arrivals[stop + 1] - self.departures[stop])
+        return int(round(timestamp - scheduled)), stop + 1
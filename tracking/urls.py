@@ -0,0 +1,10 @@
+from django.urls import path
+from . import views
+
+app_name = "tracking"
+
+urlpatterns = [
+    path("positions/", views.ingest_positions, name="ingest_positions"),
+    path("metrics/", views.prometheus_metrics, name="metrics"),
+    path("gtfs-rt/stream/", views.stream_feed, name="stream_feed"),
+]
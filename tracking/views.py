@@ -1,3 +1,163 @@
-from django.shortcuts import render
+import hmac
+import json
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition, require_GET, require_POST, require_safe
+from . import feed_storage
+from . import ingest
+from . import metrics
+from . import streaming
 
-# Create your views here.
+# Uploads in this format are tracker-upload.proto PositionUpload messages, anything else is JSON
+UPLOAD_CONTENT_TYPE = "application/x-protobuf"
+
+
+def get_bearer_token(request):
+    auth = request.headers.get("Authorization", "")
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer":
+        return None
+
+    return token.strip()
+
+
+@csrf_exempt
+@require_POST
+def ingest_positions(request):
+    tracker_key = ingest.authenticate_tracker(get_bearer_token(request))
+    if not tracker_key:
+        return JsonResponse({"error": "Invalid tracker key"}, status=401)
+
+    if request.content_type == UPLOAD_CONTENT_TYPE:
+        try:
+            fixes = ingest.parse_upload(request.body, tracker_key)
+        except ValidationError as e:
+            return JsonResponse({"error": e.message}, status=400)
+    else:
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+        if not isinstance(data, dict):
+            return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+        try:
+            fixes = ingest.parse_positions(data.get("positions"), tracker_key)
+        except ValidationError as e:
+            return JsonResponse({"error": e.message}, status=400)
+
+    return JsonResponse({
+        "accepted": ingest.store_positions(fixes),
+    })
+
+
+def check_metrics_token(token: str) -> bool:
+    if not token or not settings.METRICS_TOKEN:
+        return False
+
+    return hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode())
+
+
+@require_GET
+def prometheus_metrics(request):
+    # Scraped with the metrics token, or viewed by staff logged in to the admin
+    if not request.user.is_staff and not check_metrics_token(get_bearer_token(request)):
+        return JsonResponse({"error": "Invalid metrics token"}, status=401)
+
+    return HttpResponse(metrics.render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+FEED_CONTENT_TYPES = {
+    ".zip": "application/zip",
+    ".json": "application/json",
+    ".pb": "application/x-protobuf",
+}
+
+
+def get_accepted_encodings(request) -> dict:
+    encodings = {}
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        encoding, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if encoding:
+            encodings[encoding.strip().lower()] = quality
+    return encodings
+
+
+def choose_feed_encoding(request, feed: feed_storage.CachedFeed):
+    accepted = get_accepted_encodings(request)
+    candidates = [
+        (accepted.get(encoding, accepted.get("*", 0)), len(content), encoding)
+        for encoding, content in feed.variants.items() if encoding
+    ]
+    candidates = [c for c in candidates if c[0] > 0]
+    if not candidates:
+        return None
+    # Prefer what the client prefers, then the smallest copy
+    return max(candidates, key=lambda c: (c[0], -c[1]))[2]
+
+
+def get_served_feed(request, name: str):
+    if not hasattr(request, "served_feed"):
+        feed = feed_storage.get_feed(name)
+        if not feed:
+            raise Http404("Feed not yet generated")
+        request.served_feed = (feed, choose_feed_encoding(request, feed))
+    return request.served_feed
+
+
+def feed_etag(request, name: str):
+    feed, encoding = get_served_feed(request, name)
+    return feed.etag(encoding)
+
+
+def feed_last_modified(request, name: str):
+    feed, _ = get_served_feed(request, name)
+    return feed.modified_at
+
+
+# Not Modified responses carry the same caching headers as the feed they revalidate
+@require_safe
+def serve_feed(request, name: str):
+    response = render_feed(request, name)
+    if response.status_code in (200, 304):
+        patch_cache_control(response, public=True, max_age=settings.FEED_MAX_AGE[name])
+        patch_vary_headers(response, ["Accept-Encoding"])
+    return response
+
+
+@condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+def render_feed(request, name: str):
+    feed, encoding = get_served_feed(request, name)
+
+    response = HttpResponse(
+        feed.variants[encoding],
+        content_type=FEED_CONTENT_TYPES.get(name[name.rindex("."):], "application/octet-stream"),
+    )
+    if encoding:
+        response["Content-Encoding"] = encoding
+    return response
+
+
+@require_GET
+async def stream_feed(request):
+    output_format = request.GET.get("format", "json")
+    if output_format not in streaming.FORMATS:
+        return JsonResponse({"error": "Unknown format"}, status=400)
+
+    response = StreamingHttpResponse(streaming.broadcaster.stream(output_format), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stops nginx holding events back in its buffer
+    response["X-Accel-Buffering"] = "no"
+    return response
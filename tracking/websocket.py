@@ -0,0 +1,222 @@
+import asyncio
+import contextvars
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, close_old_connections
+from . import ingest
+from . import models
+
+PATH = "/api/positions/ws/"
+
+# Close codes sent to trackers
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_NOT_FOUND = 4404
+
+
+def run_in_thread(func, *args):
+    def run():
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(run, thread_sensitive=False)()
+
+
+def store_buffered_positions(fixes) -> int:
+    try:
+        return ingest.store_positions(fixes)
+    except IntegrityError:
+        # A vehicle was deleted while its tracker was connected; store everyone else's fixes
+        existing = set(models.Vehicle.objects.filter(
+            id__in=set(f[0] for f in fixes)
+        ).values_list("id", flat=True))
+        return ingest.store_positions([f for f in fixes if f[0] in existing])
+
+
+# Fixes from every tracker connected to this process, written to the database together once enough
+# have arrived or the oldest has waited long enough. While the buffer is full, trackers wait to have
+# their messages read rather than it growing for as long as the database can't be written to.
+class PositionBuffer:
+    def __init__(self):
+        self.pending = []
+        self.timer = None
+        self.loop = None
+        self.lock = None
+        self.space = None
+
+    @property
+    def size(self) -> int:
+        return sum(len(f) for _, f in self.pending)
+
+    async def add(self, connection, fixes):
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop = loop
+            self.lock = asyncio.Lock()
+            self.space = asyncio.Condition()
+            self.timer = None
+
+        async with self.space:
+            await self.space.wait_for(lambda: self.size < settings.POSITION_BUFFER["size"])
+
+        self.pending.append((connection, fixes))
+        if self.size >= settings.POSITION_BUFFER["size"]:
+            self.start(0)
+        elif not self.timer or self.timer.done():
+            self.start(settings.POSITION_BUFFER["interval"])
+
+    def start(self, delay: float):
+        self.timer = self.loop.create_task(self.flush_after(delay), context=contextvars.Context())
+
+    async def flush_after(self, delay: float):
+        await asyncio.sleep(delay)
+        await self.flush()
+
+    async def flush(self):
+        async with self.lock:
+            pending, self.pending = self.pending, []
+            if not pending:
+                return
+
+            try:
+                await run_in_thread(store_buffered_positions, [fix for _, fixes in pending for fix in fixes])
+            except Exception:
+                # Kept for the next attempt, ahead of anything that arrived since
+                self.pending = pending + self.pending
+                self.start(settings.POSITION_BUFFER["interval"])
+                return
+
+        async with self.space:
+            self.space.notify_all()
+
+        stored = {}
+        for connection, fixes in pending:
+            stored[connection] = stored.get(connection, 0) + len(fixes)
+        for connection, count in stored.items():
+            await connection.send_json({"stored": count})
+
+
+buffer = PositionBuffer()
+
+
+class TrackerConnection:
+    def __init__(self, send, tracker_key: models.TrackerKey):
+        self.send = send
+        self.tracker_key = tracker_key
+        self.known_vehicles = set()
+        self.closed = False
+
+    async def send_json(self, data: dict):
+        if self.closed:
+            return
+        try:
+            await self.send({"type": "websocket.send", "text": json.dumps(data)})
+        except Exception:
+            self.closed = True
+
+    async def receive(self, text: str):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            await self.send_json({"error": "Invalid JSON"})
+            return
+
+        # Either a batch as sent to the HTTP endpoint, or a single position
+        if isinstance(data, dict) and "positions" in data:
+            positions = data["positions"]
+        else:
+            positions = [data]
+
+        await self.parse(ingest.parse_positions, positions)
+
+    async def receive_bytes(self, data: bytes):
+        await self.parse(ingest.parse_upload, data)
+
+    async def parse(self, parser, data):
+        try:
+            fixes = await run_in_thread(parser, data, self.tracker_key, self.known_vehicles)
+        except ValidationError as e:
+            await self.send_json({"error": e.message})
+            return
+
+        if fixes:
+            await buffer.add(self, fixes)
+
+
+# Closing a WebSocket before accepting it is sent to the client as a plain HTTP 403, so it's accepted
+# first for the tracker to see why
+async def reject(send, code: int):
+    await send({"type": "websocket.accept"})
+    await send({"type": "websocket.close", "code": code})
+
+
+def get_header(scope, name: bytes):
+    for key, value in scope.get("headers", []):
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+# A raw ASGI application for trackers that stream their positions. The tracker key is given once, as a
+# bearer token when connecting or as {"key": ...} in the first message, then every text message is a
+# position or a batch of positions as accepted by the HTTP endpoint, and every binary message is a
+# tracker-upload.proto PositionUpload.
+async def position_socket(scope, receive, send):
+    message = await receive()
+    if message["type"] != "websocket.connect":
+        return
+
+    if scope["path"] != PATH:
+        await reject(send, CLOSE_NOT_FOUND)
+        return
+
+    tracker_key = None
+    auth = get_header(scope, b"authorization")
+    if auth:
+        scheme, _, token = auth.partition(" ")
+        if scheme.lower() == "bearer":
+            tracker_key = await run_in_thread(ingest.authenticate_tracker, token.strip())
+        if not tracker_key:
+            await reject(send, CLOSE_UNAUTHORIZED)
+            return
+
+    await send({"type": "websocket.accept"})
+    connection = TrackerConnection(send, tracker_key)
+    if tracker_key:
+        await connection.send_json({"authenticated": True})
+
+    try:
+        while True:
+            message = await receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message["type"] != "websocket.receive":
+                continue
+
+            text = message.get("text")
+            if text is None and connection.tracker_key:
+                await connection.receive_bytes(message.get("bytes") or b"")
+                continue
+            if text is None:
+                text = (message.get("bytes") or b"").decode("utf-8", "replace")
+
+            if not connection.tracker_key:
+                try:
+                    key = json.loads(text).get("key")
+                except (ValueError, AttributeError):
+                    key = None
+                connection.tracker_key = await run_in_thread(
+                    ingest.authenticate_tracker, key if isinstance(key, str) else None
+                )
+                if not connection.tracker_key:
+                    await send({"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+                    return
+                await connection.send_json({"authenticated": True})
+                continue
+
+            await connection.receive(text)
+    finally:
+        connection.closed = True